@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import List
+
+from src.datastructures.bounded_splay_tree import BoundedSplayTree
+from src.datastructures.keys import IPV4_FIRST_KEY, key_to_ip
+from src.datastructures.splay_tree import SplayTree
+
+
+def _stream(count: int, hosts: int, skew: float, rng: random.Random) -> List[str]:
+    # Trafik gateway: host ke-r aktif dengan peluang ~ 1/r^skew (Zipf)
+    addresses = [key_to_ip(IPV4_FIRST_KEY | key) for key in rng.sample(range(1 << 32), hosts)]
+    weights = [1 / (rank + 1) ** skew for rank in range(hosts)]
+    return rng.choices(addresses, weights, k=count)
+
+
+def _replay(tree: SplayTree, stream: List[str]) -> float:
+    # Pola cache: cari dulu, insert jika belum ada
+    start = time.perf_counter()
+    search, insert = tree.search, tree.insert
+    for ip_address in stream:
+        if search(ip_address) is None:
+            insert(ip_address, "PKT-0")
+    return len(stream) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark BoundedSplayTree sebagai cache host aktif")
+    parser.add_argument("--count", type=int, default=500_000, help="Jumlah paket di stream")
+    parser.add_argument("--hosts", type=int, default=200_000, help="Jumlah host berbeda")
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--ttl", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    stream = _stream(args.count, args.hosts, args.skew, random.Random(args.seed))
+    print(f"{args.count} paket dari {args.hosts} host (Zipf {args.skew}), operasi/detik")
+    print(f"{'kapasitas':>10} {'ops/s':>12} {'hit ratio':>10} {'eviksi':>10} {'kedaluwarsa':>12} {'isi':>9}")
+
+    baseline = SplayTree()
+    rate = _replay(baseline, stream)
+    print(f"{'tanpa batas':>10} {rate:>12,.0f} {'-':>10} {'-':>10} {'-':>12} {baseline.size:>9,}")
+    for capacity in (1_000, 10_000, 100_000):
+        tree = BoundedSplayTree(max_entries=capacity, ttl=args.ttl)
+        rate = _replay(tree, stream)
+        print(
+            f"{capacity:>10,} {rate:>12,.0f} {tree.hit_ratio:>10.1%} "
+            f"{tree.evictions:>10,} {tree.expirations:>12,} {tree.size:>9,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import argparse
+import random
+import threading
+import time
+from typing import List
+
+from src.datastructures.concurrent_splay_tree import ConcurrentSplayTree, LockPolicy
+from src.datastructures.keys import IPV4_FIRST_KEY, IPV4_LAST_KEY, key_to_ip
+from src.datastructures.splay_tree import SplayTree
+
+
+def _worker(
+    tree: ConcurrentSplayTree,
+    probes: List[str],
+    write_every: int,
+    barrier: threading.Barrier,
+) -> None:
+    barrier.wait()
+    for index, ip_address in enumerate(probes):
+        if write_every and index % write_every == 0:
+            tree.insert(ip_address, "PKT-W")
+        else:
+            tree.search(ip_address)
+
+
+def _throughput(
+    items: List[tuple],
+    probes: List[str],
+    policy: LockPolicy,
+    threads: int,
+    write_every: int,
+) -> float:
+    tree = ConcurrentSplayTree(SplayTree.from_iterable(items), policy)
+    # Total operasi tetap; dibagi rata ke setiap thread
+    chunk = len(probes) // threads
+    barrier = threading.Barrier(threads + 1)
+    workers = [
+        threading.Thread(
+            target=_worker,
+            args=(tree, probes[index * chunk:(index + 1) * chunk], write_every, barrier),
+        )
+        for index in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    return chunk * threads / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark ConcurrentSplayTree multi-thread")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--operations", type=int, default=200_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument(
+        "--write-every",
+        type=int,
+        default=20,
+        help="Setiap operasi ke-N adalah insert (0 = hanya search)",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = rng.sample(range(IPV4_FIRST_KEY, IPV4_LAST_KEY + 1), args.count)
+    items = [(key_to_ip(key), f"PKT-{index}") for index, key in enumerate(keys)]
+    # Distribusi miring: 80% operasi mengenai 1% IP, seperti beban lookup nyata
+    hot = [ip_address for ip_address, _ in items[: max(1, args.count // 100)]]
+    probes = [
+        rng.choice(hot) if rng.random() < 0.8 else items[rng.randrange(args.count)][0]
+        for _ in range(args.operations)
+    ]
+
+    print(f"{args.count} device, {args.operations} operasi, insert setiap {args.write_every}")
+    print(f"{'policy':<12} " + " ".join(f"{f'{n} thread':>12}" for n in args.threads))
+    for policy in LockPolicy:
+        rates = [
+            _throughput(items, probes, policy, threads, args.write_every)
+            for threads in args.threads
+        ]
+        print(f"{policy.value:<12} " + " ".join(f"{rate:>12,.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src.datastructures.keys import IPV4_FIRST_KEY, IPV4_LAST_KEY, key_to_ip
+from src.datastructures.splay_tree import SplayTree
+from src.pipeline.formats import write_rows
+from src.pipeline.transfer import export_devices, import_devices
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark import/export CSV dan JSONL")
+    parser.add_argument("--count", type=int, default=500_000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = rng.sample(range(IPV4_FIRST_KEY, IPV4_LAST_KEY + 1), args.count)
+    rows = [(f"Device-{index}", key_to_ip(key), f"PKT-{index}") for index, key in enumerate(keys)]
+
+    print(f"{'format':<7} {'file':>9} {'import kosong':>15} {'import ke tree':>15} {'export':>12}")
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in ("csv", "jsonl"):
+            path = os.path.join(directory, f"devices.{fmt}")
+            write_rows(path, [rows])
+            size = os.path.getsize(path) / (1 << 20)
+
+            tree = SplayTree()
+            report = import_devices(path, tree, chunk_size=args.chunk_size)
+            empty_rate = report.rows_per_second
+
+            # Tree yang sudah berisi separuh device: jalur rebuild gabungan
+            half = SplayTree.from_iterable((ip_address, packet) for _, ip_address, packet in rows[::2])
+            report = import_devices(path, half, chunk_size=args.chunk_size)
+            merge_rate = report.rows_per_second
+
+            start = time.perf_counter()
+            export_devices(os.path.join(directory, f"export.{fmt}"), tree.iter_inorder())
+            export_rate = tree.size / (time.perf_counter() - start)
+            print(
+                f"{fmt:<7} {size:>7.1f}MB {empty_rate:>10,.0f}/det {merge_rate:>10,.0f}/det "
+                f"{export_rate:>8,.0f}/det"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+
+from src.datastructures.keys import IPV4_FIRST_KEY, key_to_ip
+from src.datastructures.splay_tree import IndexPolicy, SplayTree
+from src.datastructures.top_down_splay_tree import TopDownSplayTree
+
+POLICIES: Tuple[Tuple[str, Optional[IndexPolicy]], ...] = (
+    ("tanpa index", None),
+    ("always", IndexPolicy.ALWAYS),
+    ("sampled", IndexPolicy.SAMPLED),
+    ("never", IndexPolicy.NEVER),
+)
+
+
+def _probes(items: List[Tuple[str, str]], count: int, skewed: bool, rng: random.Random) -> List[str]:
+    if not skewed:
+        return [items[rng.randrange(len(items))][0] for _ in range(count)]
+    # 90% pencarian jatuh ke 1% device (hot set), sisanya acak
+    hot = [item[0] for item in rng.sample(items, max(1, len(items) // 100))]
+    return [
+        rng.choice(hot) if rng.random() < 0.9 else items[rng.randrange(len(items))][0]
+        for _ in range(count)
+    ]
+
+
+def _rate(function: Callable[[], object], count: int, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def _index_bytes(items: List[Tuple[str, str]]) -> float:
+    # Selisih memori tree dengan dan tanpa index, per device
+    tree = SplayTree.from_iterable(items)
+    tracemalloc.start()
+    tree.enable_index(IndexPolicy.SAMPLED)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / len(items)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark hash index di depan splay tree")
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--searches", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = rng.sample(range(1 << 32), args.count)
+    items = [(key_to_ip(IPV4_FIRST_KEY | key), f"PKT-{index}") for index, key in enumerate(keys)]
+    workloads = {
+        "acak": _probes(items, args.searches, False, rng),
+        "skewed 90/1": _probes(items, args.searches, True, rng),
+    }
+    misses = [key_to_ip(IPV4_FIRST_KEY | key) for key in rng.sample(range(1 << 32), args.searches)]
+    fresh = [key_to_ip(IPV4_FIRST_KEY | key) for key in rng.sample(range(1 << 32), args.searches // 10)]
+
+    print(f"{args.count} device, {args.searches} pencarian (operasi/detik)")
+    print(f"Memori index: {_index_bytes(items):.0f} byte/device")
+    header = " ".join(f"{title:>12}" for title in [*workloads, "miss", "insert+del"])
+    print(f"{'engine':<16} {'index':<12} {header}")
+
+    for engine in (SplayTree, TopDownSplayTree):
+        for title, policy in POLICIES:
+            tree = engine.from_iterable(items)
+            if policy is not None:
+                tree.enable_index(policy)
+
+            def churn(tree: SplayTree = tree) -> None:
+                for ip in fresh:
+                    tree.insert(ip, "PKT-0")
+                for ip in fresh:
+                    tree.delete(ip)
+
+            rates = [_rate(lambda: list(map(tree.search, probes)), args.searches) for probes in workloads.values()]
+            rates.append(_rate(lambda: list(map(tree.search, misses)), args.searches))
+            rates.append(_rate(churn, 2 * len(fresh)))
+            print(f"{engine.__name__:<16} {title:<12} " + " ".join(f"{rate:>12,.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
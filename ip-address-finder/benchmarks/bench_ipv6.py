@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Callable, List, Tuple
+
+from src.datastructures.array_splay_tree import ArraySplayTree
+from src.datastructures.keys import IPV4_FIRST_KEY, key_to_ip
+from src.datastructures.splay_tree import SplayTree
+from src.net.address import parse_ip
+from src.net.ipv4 import parse_ipv4
+from src.persistence.snapshot import SnapshotReader, save_snapshot, tree_rows
+
+# Porsi IPv6 per beban kerja
+WORKLOADS: Tuple[Tuple[str, float], ...] = (("IPv4", 0.0), ("campuran 50/50", 0.5), ("IPv6", 1.0))
+
+
+def _keys(count: int, ipv6_share: float, rng: random.Random) -> List[int]:
+    # IPv6 acak di 2000::/3 (global unicast), IPv4 acak di seluruh ruang 32-bit
+    keys = set()
+    while len(keys) < count:
+        if rng.random() < ipv6_share:
+            keys.add((0x2 << 125) | rng.getrandbits(125))
+        else:
+            keys.add(IPV4_FIRST_KEY | rng.getrandbits(32))
+    return list(keys)
+
+
+def _rate(function: Callable[[], object], count: int, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark lookup IPv4, IPv6 dan campuran di satu tabel")
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--searches", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{args.count} device, {args.searches} pencarian (operasi/detik)")
+    print(f"{'beban':<16} {'parse':>12} {'format':>12} {'SplayTree':>12} {'ArraySplay':>12} {'snapshot':>12}")
+
+    # Pembanding: parser IPv4 murni tanpa key 128-bit
+    ipv4_texts = [key_to_ip(IPV4_FIRST_KEY | rng.getrandbits(32)) for _ in range(args.searches)]
+    print(f"{'parse_ipv4':<16} {_rate(lambda: list(map(parse_ipv4, ipv4_texts)), args.searches):>12,.0f}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for title, ipv6_share in WORKLOADS:
+            keys = _keys(args.count, ipv6_share, rng)
+            items = [(key_to_ip(key), f"PKT-{index}") for index, key in enumerate(keys)]
+            probes = [items[rng.randrange(args.count)][0] for _ in range(args.searches)]
+            probe_keys = list(map(parse_ip, probes))
+
+            tree = SplayTree.from_iterable(items)
+            array_tree = ArraySplayTree.from_iterable(items)
+            path = os.path.join(directory, f"{ipv6_share}.ipsnap")
+            save_snapshot(path, tree_rows(tree))
+            with SnapshotReader(path) as snapshot:
+                rates = [
+                    _rate(lambda: list(map(parse_ip, probes)), args.searches),
+                    _rate(lambda: list(map(key_to_ip, probe_keys)), args.searches),
+                    _rate(lambda: list(map(tree.search, probes)), args.searches),
+                    _rate(lambda: list(map(array_tree.search, probes)), args.searches),
+                    _rate(lambda: list(map(snapshot.search, probes)), args.searches),
+                ]
+            print(f"{title:<16} " + " ".join(f"{rate:>12,.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+from typing import Callable, List, Tuple
+
+from src.datastructures.keys import IPV4_FIRST_KEY, key_to_ip
+from src.datastructures.splay_tree import SplayTree
+from src.datastructures.top_down_splay_tree import TopDownSplayTree
+
+
+def _probes(items: List[Tuple[str, str]], count: int, skew: float, rng: random.Random) -> List[str]:
+    # skew 0 = acak merata; makin besar makin terpusat ke sedikit device (Zipf)
+    if not skew:
+        return [items[rng.randrange(len(items))][0] for _ in range(count)]
+    weights = [1 / (rank + 1) ** skew for rank in range(len(items))]
+    return [ip_address for ip_address, _ in rng.choices(items, weights, k=count)]
+
+
+def _rate(function: Callable[[], object], count: int, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Biaya instrumentasi dan profil splay per pola akses")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--searches", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = rng.sample(range(1 << 32), args.count)
+    items = [(key_to_ip(IPV4_FIRST_KEY | key), f"PKT-{index}") for index, key in enumerate(keys)]
+    print(f"{args.count} device, {args.searches} pencarian; tree seimbang ~{math.log2(args.count) + 1:.1f} node per search")
+    print(
+        f"{'engine':<16} {'pola':<10} {'tanpa':>10} {'metrics':>10} {'dimatikan':>10} "
+        f"{'kedalaman':>10} {'langkah/search':>15} {'p99 (us)':>9}"
+    )
+
+    for title, skew in (("acak", 0.0), ("Zipf 0.8", 0.8), ("Zipf 1.2", 1.2)):
+        probes = _probes(items, args.searches, skew, rng)
+        for engine in (SplayTree, TopDownSplayTree):
+            # Baseline: method kelas langsung, tanpa pembungkus apa pun
+            plain = engine.from_iterable(items)
+            plain_search = engine.search.__get__(plain)
+            assert not hasattr(plain_search, "__wrapped__")
+            plain_rate = _rate(lambda: list(map(plain_search, probes)), args.searches)
+
+            measured = engine.from_iterable(items)
+            metrics = measured.enable_metrics()
+            measured_rate = _rate(lambda: list(map(measured.search, probes)), args.searches, 1)
+            report = measured.stats()
+
+            # Setelah disable_metrics tree harus kembali secepat tanpa instrumentasi
+            measured.disable_metrics()
+            assert not hasattr(measured.search, "__wrapped__")
+            disabled_rate = _rate(lambda: list(map(measured.search, probes)), args.searches)
+
+            steps = (metrics.zig + metrics.zig_zig + metrics.zig_zag) / args.searches
+            print(
+                f"{engine.__name__:<16} {title:<10} {plain_rate:>10,.0f} {measured_rate:>10,.0f} "
+                f"{disabled_rate:>10,.0f} {report['mean_depth']:>10.1f} {steps:>15.1f} "
+                f"{report['latency']['search']['p99_us']:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import argparse
+import ipaddress
+import random
+import time
+from typing import Callable, List
+
+from src.net.ipv4 import HAVE_NUMPY, format_ipv4, parse_ipv4, parse_ipv4_batch
+
+
+def _split_int(ip_address: str) -> int:
+    # Cara lama: split lalu int() per oktet
+    key = 0
+    for part in ip_address.split("."):
+        key = (key << 8) | int(part)
+    return key
+
+
+def _rate(function: Callable[[], object], count: int, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark parser IPv4 dibanding modul ipaddress")
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = [rng.getrandbits(32) for _ in range(args.count)]
+    canonical: List[str] = [format_ipv4(key) for key in keys]
+    # Nol di depan: ditolak inet_pton, lewat scanner Python
+    padded = [".".join(part.zfill(3) for part in ip_address.split(".")) for ip_address in canonical]
+    buffer = "\n".join(canonical).encode("ascii")
+    count = args.count
+
+    print(f"{count} IP, NumPy {'terpasang' if HAVE_NUMPY else 'tidak terpasang'}")
+    rows = [
+        ("ipaddress.IPv4Address", lambda: [int(ipaddress.IPv4Address(ip)) for ip in canonical]),
+        ("split + int()", lambda: [_split_int(ip) for ip in canonical]),
+        ("parse_ipv4 (kanonik)", lambda: [parse_ipv4(ip) for ip in canonical]),
+        ("parse_ipv4 (nol di depan)", lambda: [parse_ipv4(ip) for ip in padded]),
+        ("batch list", lambda: parse_ipv4_batch(canonical, use_numpy=False)),
+        ("batch list nol di depan", lambda: parse_ipv4_batch(padded, use_numpy=False)),
+        ("batch buffer", lambda: parse_ipv4_batch(buffer, use_numpy=False)),
+    ]
+    if HAVE_NUMPY:
+        rows += [
+            ("batch list nol di depan (NumPy)", lambda: parse_ipv4_batch(padded, use_numpy=True)),
+            ("batch buffer (NumPy)", lambda: parse_ipv4_batch(buffer, use_numpy=True)),
+        ]
+    formatters = [
+        ("str(ipaddress.IPv4Address)", lambda: [str(ipaddress.IPv4Address(key)) for key in keys]),
+        ("format_ipv4", lambda: [format_ipv4(key) for key in keys]),
+    ]
+    for title, group in (("parser", rows), ("format", formatters)):
+        # Baris pertama tiap kelompok (modul ipaddress) menjadi pembanding
+        baseline = _rate(group[0][1], count)
+        print(f"{title:<34} {'IP/detik':>14} {'vs ipaddress':>13}")
+        for name, function in group:
+            rate = baseline if function is group[0][1] else _rate(function, count)
+            print(f"{name:<34} {rate:>14,.0f} {rate / baseline:>12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+from src.datastructures.array_splay_tree import ArraySplayTree
+from src.datastructures.keys import IPV4_FIRST_KEY, IPV4_LAST_KEY, key_to_ip
+from src.datastructures.records import DeviceRecord
+from src.datastructures.splay_tree import SplayTree
+from src.datastructures.top_down_splay_tree import TopDownSplayTree
+
+
+@dataclass
+class DataclassNode:
+    # Replika Node lama (dataclass biasa dengan __dict__) sebagai pembanding
+
+    ip_address: str
+    record: Optional[DeviceRecord] = None
+    left: Optional[DataclassNode] = field(default=None, repr=False)
+    right: Optional[DataclassNode] = field(default=None, repr=False)
+    parent: Optional[DataclassNode] = field(default=None, repr=False)
+    key: Optional[int] = field(default=None, repr=False)
+    size: int = field(default=1, repr=False)
+
+    @property
+    def data_packet(self) -> Optional[str]:
+        return self.record.data_packet if self.record is not None else None
+
+
+class DataclassSplayTree(SplayTree):
+    node_class = DataclassNode  # type: ignore[assignment]
+
+    def _load_sorted(self, keys, records) -> None:
+        # Node lama menyimpan string IP di setiap instance
+        super()._load_sorted(keys, records)
+        for node in self.iter_inorder():
+            node.ip_address = key_to_ip(node.key)
+
+
+def _measure_memory(build: Callable[[], object]) -> tuple[object, int]:
+    tracemalloc.start()
+    tree = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tree, current
+
+
+def _bench_searches(tree, probes: List[str]) -> float:
+    start = time.perf_counter()
+    for ip_address in probes:
+        tree.search(ip_address)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark storage node SplayTree")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--searches", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = rng.sample(range(IPV4_FIRST_KEY, IPV4_LAST_KEY + 1), args.count)
+    items = [(key_to_ip(key), f"PKT-{index}") for index, key in enumerate(keys)]
+    probes = [items[rng.randrange(args.count)][0] for _ in range(args.searches)]
+
+    engines = (
+        ("dataclass Node", DataclassSplayTree),
+        ("__slots__ Node", SplayTree),
+        ("top-down", TopDownSplayTree),
+        ("struct-of-arrays", ArraySplayTree),
+    )
+
+    print(f"{args.count} device, {args.searches} pencarian acak")
+    print(f"{'engine':<18} {'memori':>12} {'byte/device':>12} {'search/detik':>14}")
+    for label, tree_class in engines:
+        tree, used = _measure_memory(lambda: tree_class.from_iterable(items))
+        elapsed = _bench_searches(tree, probes)
+        print(
+            f"{label:<18} {used / 1_048_576:>10.1f}MB {used / args.count:>12.1f}"
+            f" {args.searches / elapsed:>14,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.config.settings import DEFAULT_DEVICE_PREFIX, DEFAULT_PACKET_PREFIX
+from src.datastructures.bulk import paused_gc
+from src.datastructures.keys import IPV4_FIRST_KEY, IPV4_LAST_KEY, key_to_ip
+from src.datastructures.records import build_records
+from src.datastructures.splay_tree import SplayTree
+
+
+class LegacyNode:
+    # Layout sebelum DeviceRecord: slot `record` berisi string packet langsung,
+    # sama dengan slot data_packet lama; nama ada di dict terpisah ip -> nama
+    __slots__ = ("record", "left", "right", "key", "size", "parent")
+
+
+class LegacySplayTree(SplayTree):
+    node_class = LegacyNode  # type: ignore[assignment]
+
+
+def _texts(keys: List[int], seed: int, unique_names: bool) -> Tuple[List[Optional[str]], List[Optional[str]]]:
+    # Sama seperti device dari GUI: packet PKT-<4 digit>, nama default Device-<oktet terakhir>
+    rng = random.Random(seed)
+    packets = [f"{DEFAULT_PACKET_PREFIX}{rng.randint(1000, 9999)}" for _ in keys]
+    if unique_names:
+        names = [f"{DEFAULT_DEVICE_PREFIX}{index + 1}" for index in range(len(keys))]
+    else:
+        names = [f"{DEFAULT_DEVICE_PREFIX}{key & 0xFF}" for key in keys]
+    return packets, names  # type: ignore[return-value]
+
+
+def build_legacy(keys: List[int], seed: int, unique_names: bool) -> Tuple[SplayTree, Dict[str, str]]:
+    # String dibuat di dalam pengukuran supaya ikut terhitung sebagai milik struktur
+    packets, names = _texts(keys, seed, unique_names)
+    with paused_gc():
+        tree = LegacySplayTree()
+        tree._load_sorted(keys, packets)  # type: ignore[arg-type]
+        device_names = {key_to_ip(key): name for key, name in zip(keys, names) if name is not None}
+    return tree, device_names
+
+
+def build_records_tree(keys: List[int], seed: int, unique_names: bool) -> SplayTree:
+    packets, names = _texts(keys, seed, unique_names)
+    with paused_gc():
+        tree = SplayTree()
+        tree._load_sorted(keys, build_records(packets, names))
+    return tree
+
+
+def _measure(build: Callable[[], object]) -> Tuple[object, int, float]:
+    # Memori diukur di build pertama (cache int record ikut terhitung); waktu
+    # diukur terpisah karena tracemalloc memperlambat setiap alokasi
+    tracemalloc.start()
+    built = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+    return built, current, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark record device vs node + dict nama terpisah")
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--searches", type=int, default=200_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--unique-names", action="store_true", help="Nama Device-<nomor urut>, semuanya berbeda")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = sorted(rng.sample(range(IPV4_FIRST_KEY, IPV4_LAST_KEY + 1), args.count))
+    probes = [key_to_ip(keys[rng.randrange(args.count)]) for _ in range(args.searches)]
+
+    print(f"{args.count} device, {args.searches} pencarian (packet + nama)")
+    print(f"{'layout':<22} {'byte/device':>12} {'build':>9} {'lookup/detik':>14}")
+
+    (tree, names), used, built = _measure(lambda: build_legacy(keys, args.seed, args.unique_names))  # type: ignore[misc]
+    start = time.perf_counter()
+    for ip_address in probes:
+        node = tree.search(ip_address)
+        # Dua lookup: tree untuk packet, dict untuk nama
+        result = (node.record, names.get(ip_address))
+    rate = args.searches / (time.perf_counter() - start)
+    print(f"{'node + dict nama':<22} {used / args.count:>12.1f} {built:>8.2f}s {rate:>14,.0f}")
+    del tree, names
+
+    tree, used, built = _measure(lambda: build_records_tree(keys, args.seed, args.unique_names))  # type: ignore[assignment]
+    start = time.perf_counter()
+    for ip_address in probes:
+        node = tree.search(ip_address)
+        result = (node.data_packet, node.name)
+    rate = args.searches / (time.perf_counter() - start)
+    print(f"{'DeviceRecord':<22} {used / args.count:>12.1f} {built:>8.2f}s {rate:>14,.0f}")
+    del result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from typing import Callable, List, Optional, Tuple
+
+from src.datastructures.array_splay_tree import NIL, ArraySplayTree
+from src.datastructures.keys import IPV4_FIRST_KEY, IPV4_LAST_KEY, key_to_ip
+from src.datastructures.nodes import Node
+from src.datastructures.splay_tree import SplayTree
+
+# Pola arah anak dari root ke daun: "L" = selalu kiri (zig-zig),
+# "LR" = selang-seling kiri/kanan (zig-zag)
+PATTERNS = {"zig-zig": "L", "zig-zag": "LR"}
+
+
+def _path_keys(depth: int, pattern: str) -> List[int]:
+    # Key dipilih supaya path dengan arah tertentu tetap BST yang valid
+    low, high = IPV4_FIRST_KEY, IPV4_LAST_KEY + 1
+    keys: List[int] = []
+    for level in range(depth):
+        direction = pattern[level % len(pattern)]
+        if direction == "L":
+            key = high - 1
+            high = key
+        else:
+            key = low
+            low = key + 1
+        keys.append(key)
+    return keys
+
+
+def build_linked_path(keys: List[int]) -> Tuple[SplayTree, Node]:
+    tree = SplayTree()
+    parent: Optional[Node] = None
+    for depth, key in enumerate(keys):
+        node = Node(key_to_ip(key), None, key=key)
+        node.size = len(keys) - depth
+        node.parent = parent
+        if parent is None:
+            tree.root = node
+        elif key < parent.key:
+            parent.left = node
+        else:
+            parent.right = node
+        parent = node
+    tree.size = len(keys)
+    assert parent is not None
+    return tree, parent
+
+
+def build_array_path(keys: List[int]) -> Tuple[ArraySplayTree, int]:
+    tree = ArraySplayTree()
+    parent = NIL
+    for key in keys:
+        node_id = tree._allocate(key, None)
+        tree._parent[node_id] = parent
+        if parent == NIL:
+            tree.root = node_id
+        elif key < tree._key(parent):
+            tree._left[parent] = node_id
+        else:
+            tree._right[parent] = node_id
+        parent = node_id
+    tree.size = len(keys)
+    return tree, parent
+
+
+def _rate(build: Callable[[], Tuple[object, object]], depth: int, rounds: int) -> float:
+    # Splay dari daun path sedalam `depth` melakukan tepat depth-1 rotasi
+    elapsed = 0.0
+    for _ in range(rounds):
+        tree, leaf = build()
+        start = time.perf_counter()
+        tree._splay(leaf)
+        elapsed += time.perf_counter() - start
+    return (depth - 1) * rounds / elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmark rotasi splay pada tree miring")
+    parser.add_argument("--depth", type=int, default=50_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--min-rate",
+        type=float,
+        default=0.0,
+        help="Gagal (exit 1) jika rotasi/detik ada yang di bawah nilai ini",
+    )
+    args = parser.parse_args()
+
+    engines = (
+        ("SplayTree", build_linked_path),
+        ("ArraySplayTree", build_array_path),
+    )
+
+    print(f"Path sedalam {args.depth}, {args.rounds} ronde")
+    print(f"{'engine':<16} {'pola':<9} {'rotasi/detik':>14}")
+    failed = False
+    for label, builder in engines:
+        for pattern_name, pattern in PATTERNS.items():
+            keys = _path_keys(args.depth, pattern)
+            rate = _rate(lambda: builder(keys), args.depth, args.rounds)
+            failed = failed or rate < args.min_rate
+            print(f"{label:<16} {pattern_name:<9} {rate:>14,.0f}")
+
+    if failed:
+        print(f"GAGAL: ada engine di bawah {args.min_rate:,.0f} rotasi/detik", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import List
+
+from src.config.settings import SERVICE_RANGE_LIMIT
+from src.datastructures.keys import IPV4_FIRST_KEY, IPV4_LAST_KEY, key_to_ip
+from src.datastructures.splay_tree import SplayTree
+from src.service.commands import TreeService
+from src.service.server import start_server
+
+
+async def _run_client(host: str, port: int, probes: List[str], window: int) -> float:
+    # Kirim `window` request sekaligus sebelum membaca jawabannya (pipelining)
+    reader, writer = await asyncio.open_connection(host, port)
+    start = time.perf_counter()
+    for first in range(0, len(probes), window):
+        batch = probes[first:first + window]
+        writer.write(
+            "".join(
+                json.dumps({"id": first + index, "op": "search", "ip": ip_address}) + "\n"
+                for index, ip_address in enumerate(batch)
+            ).encode()
+        )
+        for index in range(len(batch)):
+            response = json.loads(await reader.readline())
+            assert response["ok"] and response["id"] == first + index, response
+    elapsed = time.perf_counter() - start
+    writer.close()
+    await writer.wait_closed()
+    return elapsed
+
+
+async def _bench(args: argparse.Namespace) -> float:
+    rng = random.Random(args.seed)
+    keys = rng.sample(range(IPV4_FIRST_KEY, IPV4_LAST_KEY + 1), args.count)
+    items = [(key_to_ip(key), f"PKT-{index}") for index, key in enumerate(keys)]
+    probes = [items[rng.randrange(args.count)][0] for _ in range(args.searches)]
+
+    service = TreeService(SplayTree.from_iterable(items), SERVICE_RANGE_LIMIT)
+    server = await start_server(service, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        elapsed = await _run_client("127.0.0.1", port, probes, args.window)
+    return args.searches / elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark service lookup lewat localhost")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--searches", type=int, default=100_000)
+    parser.add_argument("--window", type=int, default=256, help="Request per batch pipelining")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--min-rate",
+        type=float,
+        default=0.0,
+        help="Gagal (exit 1) jika lookup/detik di bawah nilai ini",
+    )
+    args = parser.parse_args()
+
+    rate = asyncio.run(_bench(args))
+    print(f"{args.count} device, {args.searches} search, window {args.window}")
+    print(f"lookup/detik: {rate:,.0f}")
+    if rate < args.min_rate:
+        print(f"GAGAL: di bawah {args.min_rate:,.0f} lookup/detik", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+from typing import List
+
+from src.datastructures.keys import IPV4_FIRST_KEY, IPV4_LAST_KEY, key_to_ip
+from src.datastructures.sharded_splay_tree import ShardedSplayTree
+from src.datastructures.splay_tree import SplayTree
+
+
+def _rate(search_many, probes: List[str], batch: int) -> float:
+    start = time.perf_counter()
+    for first in range(0, len(probes), batch):
+        search_many(probes[first:first + batch])
+    return len(probes) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark lookup ShardedSplayTree multi-proses")
+    parser.add_argument("--count", type=int, default=200_000)
+    parser.add_argument("--searches", type=int, default=400_000)
+    parser.add_argument("--batch", type=int, default=4096, help="IP per panggilan search_many")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = rng.sample(range(IPV4_FIRST_KEY, IPV4_LAST_KEY + 1), args.count)
+    items = [(key_to_ip(key), f"PKT-{index}") for index, key in enumerate(keys)]
+    probes = [items[rng.randrange(args.count)][0] for _ in range(args.searches)]
+
+    print(f"{args.count} device, {args.searches} search, batch {args.batch}, {os.cpu_count()} CPU")
+    print(f"{'engine':<22} {'search/detik':>14}")
+    tree = SplayTree.from_iterable(items)
+    print(f"{'SplayTree (1 proses)':<22} {_rate(tree.search_many, probes, args.batch):>14,.0f}")
+    for shards in sorted(set(args.shards)):
+        with ShardedSplayTree(shards, items) as sharded:
+            rate = _rate(sharded.search_many, probes, args.batch)
+        print(f"{f'{shards} shard':<22} {rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src.datastructures.keys import IPV4_FIRST_KEY, IPV4_LAST_KEY
+from src.datastructures.splay_tree import SplayTree
+from src.persistence.snapshot import SnapshotReader, save_snapshot
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark simpan/muat snapshot")
+    parser.add_argument("--count", type=int, default=2_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = sorted(rng.sample(range(IPV4_FIRST_KEY, IPV4_LAST_KEY + 1), args.count))
+    rows = [
+        (key, f"PKT-{index}", f"Device-{index}" if index % 10 == 0 else None, 0) for index, key in enumerate(keys)
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "devices.ipsnap")
+        start = time.perf_counter()
+        save_snapshot(path, rows)
+        saved = time.perf_counter() - start
+        print(f"{args.count} device, {os.path.getsize(path) / args.count:.1f} byte/device")
+        print(f"simpan              {saved:>8.3f} s")
+
+        start = time.perf_counter()
+        snapshot = SnapshotReader(path)
+        print(f"buka (mmap)         {time.perf_counter() - start:>8.3f} s")
+
+        start = time.perf_counter()
+        probe = snapshot.record(args.count // 2).ip_address
+        snapshot.search(probe)
+        print(f"lookup pertama      {time.perf_counter() - start:>8.3f} s")
+
+        start = time.perf_counter()
+        tree = SplayTree()
+        snapshot.load_into(tree)
+        print(f"bulk build tree     {time.perf_counter() - start:>8.3f} s")
+        snapshot.close()
+
+
+if __name__ == "__main__":
+    main()
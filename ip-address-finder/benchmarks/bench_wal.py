@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src.datastructures.keys import IPV4_FIRST_KEY, IPV4_LAST_KEY, key_to_ip
+from src.datastructures.splay_tree import SplayTree
+from src.persistence.wal import DurableStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark update dengan write-ahead log")
+    parser.add_argument("--count", type=int, default=100_000, help="Jumlah device awal")
+    parser.add_argument("--updates", type=int, default=50_000)
+    parser.add_argument("--group-sizes", type=int, nargs="+", default=[1, 64, 512])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keys = rng.sample(range(IPV4_FIRST_KEY, IPV4_LAST_KEY + 1), args.count)
+    items = [(key_to_ip(key), f"PKT-{index}") for index, key in enumerate(keys)]
+    updates = [(items[rng.randrange(args.count)][0], f"PKT-U{index}") for index in range(args.updates)]
+
+    print(f"{args.count} device, {args.updates} update (insert ulang packet)")
+    print(f"{'group commit':<14} {'update/detik':>14} {'recovery':>10}")
+    for group_size in args.group_sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            store = DurableStore(os.path.join(directory, "devices.ipsnap"), group_size=group_size)
+            tree = SplayTree.from_iterable(items)
+            store.compact(tree)
+            store.attach(tree)
+            start = time.perf_counter()
+            for ip_address, packet in updates:
+                tree.insert(ip_address, packet)
+            store.commit()
+            rate = args.updates / (time.perf_counter() - start)
+            store.close()
+
+            start = time.perf_counter()
+            recovered = DurableStore(store.snapshot_path)
+            recovered.recover(SplayTree())
+            recovery = time.perf_counter() - start
+            recovered.close()
+        print(f"{group_size:<14} {rate:>14,.0f} {recovery:>9.2f}s")
+
+
+if __name__ == "__main__":
+    main()
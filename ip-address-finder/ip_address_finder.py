@@ -1,17 +1,182 @@
 from __future__ import annotations
 
-import tkinter as tk
+import argparse
+import asyncio
+import dataclasses
+import os
+from typing import Dict, List, Optional
 
-from src.factories.tree_factory import DefaultTreeFactory
-from src.gui.app import IPAddressFinderGUI
+from src.config.settings import SERVICE_HOST, SERVICE_PORT, SERVICE_RANGE_LIMIT
+from src.datastructures.splay_tree import IndexPolicy
+from src.factories.tree_factory import (
+    BoundedTreeFactory,
+    DefaultTreeFactory,
+    InstrumentedTreeFactory,
+    TopDownTreeFactory,
+    TreeFactory,
+)
+from src.pipeline.formats import FORMATS
 
+FACTORIES: Dict[str, TreeFactory] = {
+    "bottom-up": DefaultTreeFactory(),
+    "top-down": TopDownTreeFactory(),
+}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="IP Address Finder berbasis Splay Tree")
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Jalankan service lookup tanpa GUI (TCP, JSON per baris)",
+    )
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--engine", choices=sorted(FACTORIES), default="bottom-up")
+    parser.add_argument(
+        "--index",
+        choices=[policy.value for policy in IndexPolicy],
+        help="Pasang hash index untuk lookup exact-match O(1); nilai menentukan apakah hit tetap di-splay",
+    )
+    parser.add_argument(
+        "--max-entries",
+        type=int,
+        metavar="N",
+        help="Jadikan tree cache berkapasitas N device; device yang paling lama tidak diakses dibuang",
+    )
+    parser.add_argument(
+        "--ttl",
+        type=float,
+        metavar="SECONDS",
+        help="Umur maksimum device sejak insert terakhir (butuh --max-entries)",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Hitung perbandingan, langkah splay, kedalaman search dan latensi (status bar GUI, perintah stats)",
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="PATH",
+        help="File snapshot yang dimuat saat start; perubahan dicatat di PATH.wal",
+    )
+    parser.add_argument(
+        "--import",
+        dest="import_path",
+        metavar="FILE",
+        help="Import device dari CSV/JSONL (kolom name, ip, packet) lalu keluar; disimpan ke --snapshot",
+    )
+    parser.add_argument(
+        "--export",
+        dest="export_path",
+        metavar="FILE",
+        help="Export device dari --snapshot ke CSV/JSONL lalu keluar",
+    )
+    parser.add_argument("--format", choices=FORMATS, help="Format file import/export (default: dari ekstensi)")
+    args = parser.parse_args(argv)
+    if args.export_path and not args.snapshot:
+        parser.error("--export butuh --snapshot sebagai sumber device")
+    if args.import_path and not args.snapshot:
+        # Tanpa snapshot hasil import hanya ada di memori lalu hilang saat keluar
+        parser.error("--import butuh --snapshot sebagai tujuan device")
+    if args.ttl is not None and args.max_entries is None:
+        parser.error("--ttl butuh --max-entries")
+    if args.max_entries is not None:
+        if args.engine != "bottom-up":
+            parser.error("--max-entries hanya tersedia untuk --engine bottom-up")
+        if args.max_entries < 1 or (args.ttl is not None and args.ttl <= 0):
+            parser.error("--max-entries minimal 1 dan --ttl harus lebih dari 0")
+    return args
+
+
+def run_service(factory: TreeFactory, host: str, port: int, snapshot_path: Optional[str]) -> None:
+    from src.persistence.snapshot import SnapshotReader
+    from src.persistence.wal import DurableStore
+    from src.service.commands import TreeService
+    from src.service.server import serve_forever
+
+    store = DurableStore(snapshot_path) if snapshot_path is not None else None
+    service = TreeService(factory.create_tree(), SERVICE_RANGE_LIMIT, None, snapshot_path, store)
+    if store is not None:
+        if os.path.exists(store.snapshot_path) and not store.wal.has_records:
+            # Tanpa log yang perlu di-replay, baca langsung dari snapshot dulu
+            service.snapshot = SnapshotReader(store.snapshot_path)
+        else:
+            store.recover(service.tree)
+    try:
+        asyncio.run(serve_forever(service, host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if store is not None:
+            store.close()
+
+
+def run_transfer(factory: TreeFactory, args: argparse.Namespace) -> None:
+    from src.persistence.snapshot import SnapshotReader
+    from src.persistence.wal import DurableStore, has_log_records, restore
+    from src.pipeline.transfer import export_devices, import_devices
+
+    # Hanya import yang menulis; export membaca snapshot dan log apa adanya
+    store = DurableStore(args.snapshot) if args.import_path else None
+    try:
+        if args.import_path:
+            assert store is not None
+            tree = factory.create_tree()
+            store.recover(tree)
+            report = import_devices(args.import_path, tree, args.format, store=store)
+            print(f"Import {args.import_path}: {report.summary()}")
+            for line, message in report.errors:
+                print(f"  baris {line}: {message}")
+            if report.rejected > len(report.errors):
+                print(f"  ... dan {report.rejected - len(report.errors)} error lainnya")
+            print(f"{tree.size} device disimpan ke {store.snapshot_path}")
+        if args.export_path:
+            assert args.snapshot is not None
+            if os.path.exists(args.snapshot) and not has_log_records(args.snapshot):
+                # Export langsung dari file snapshot tanpa membangun tree
+                with SnapshotReader(args.snapshot) as snapshot:
+                    count = export_devices(args.export_path, snapshot.records(), args.format)
+            else:
+                tree = factory.create_tree()
+                restore(args.snapshot, tree)
+                count = export_devices(args.export_path, tree.iter_inorder(), args.format)
+            print(f"{count} device diexport ke {args.export_path}")
+    finally:
+        if store is not None:
+            store.close()
+
+
+def run_gui(factory: TreeFactory, snapshot_path: Optional[str]) -> None:
+    # tkinter hanya di-import untuk mode GUI, jadi --serve jalan tanpa display
+    import tkinter as tk
+
+    from src.gui.app import IPAddressFinderGUI
 
-def main() -> None:
     root = tk.Tk()
-    factory = DefaultTreeFactory()
-    IPAddressFinderGUI(root, factory)
+    IPAddressFinderGUI(root, factory, snapshot_path)
     root.mainloop()
 
 
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    factory = FACTORIES[args.engine]
+    if args.max_entries is not None:
+        factory = BoundedTreeFactory(args.max_entries, args.ttl)
+    if args.index:
+        factory = dataclasses.replace(factory, index_policy=IndexPolicy(args.index))  # type: ignore[type-var]
+    if args.metrics:
+        factory = InstrumentedTreeFactory(factory)
+    if args.import_path or args.export_path:
+        try:
+            run_transfer(factory, args)
+        except (OSError, ValueError) as exc:
+            raise SystemExit(f"Error: {exc}")
+    elif args.serve:
+        run_service(factory, args.host, args.port, args.snapshot)
+    else:
+        run_gui(factory, args.snapshot)
+
+
 if __name__ == "__main__":
     main()
@@ -18,6 +18,8 @@ class GuiStyle:
     button_generate: str = "#f39c12"
     button_show_all: str = "#9b59b6"
     button_clear: str = "#95a5a6"
+    button_snapshot: str = "#16a085"
+    button_transfer: str = "#2980b9"
 
 
 GUI_STYLE = GuiStyle()
@@ -26,3 +28,14 @@ RANDOM_DEVICE_COUNT: int = 11
 DEFAULT_BASE_IP: str = "192.168.1."
 DEFAULT_PACKET_PREFIX: str = "PKT-"
 DEFAULT_DEVICE_PREFIX: str = "Device-"
+VIRTUAL_ROW_HEIGHT: int = 20
+REFRESH_DEBOUNCE_MS: int = 50
+WORKER_POLL_MS: int = 20
+SNAPSHOT_EXTENSION: str = ".ipsnap"
+IMPORT_CHUNK_SIZE: int = 50_000
+IMPORT_MAX_ERRORS: int = 100
+
+SERVICE_HOST: str = "127.0.0.1"
+SERVICE_PORT: int = 8765
+SERVICE_RANGE_LIMIT: int = 1000
+SERVICE_MAX_LINE_BYTES: int = 1 << 20
@@ -0,0 +1,375 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .bulk import NIL, balanced_links, sorted_unique_items
+from .keys import ip_to_key, key_to_ip, subnet_bounds
+from .nodes import Node
+from .splay_tree import SplayPolicy
+from .structure import iter_structure
+
+_LOW_MASK = (1 << 64) - 1
+
+
+@dataclass
+class ArraySplayTree:
+    """
+    Splay tree dengan penyimpanan struct-of-arrays.
+
+    Setiap node hanyalah sebuah id (index). Pointer left, right, parent dan key
+    disimpan di array integer paralel, sehingga tidak ada objek Python per node
+    selain string data packet. Key 128-bit dipecah menjadi dua word 64-bit
+    (high, low); untuk IPv4 word high selalu 0, jadi perbandingan praktis
+    hanya satu word. Node yang dikembalikan oleh search() adalah salinan
+    (snapshot); perubahan padanya tidak memengaruhi tree.
+
+    Engine ini adalah eksperimen layout memori untuk benchmark, bukan
+    pengganti SplayTree: yang tersedia hanya insert, search, search_many,
+    delete, update packet/IP, range, in_subnet dan traversal. Tidak ada
+    nama device, ukuran subtree (rank/select/page), journal, hash index
+    maupun metrics, jadi engine ini sengaja tidak punya TreeFactory.
+    """
+
+    root: int = NIL
+    size: int = 0
+    search_count: int = 0
+    _highs: array = field(default_factory=lambda: array("Q"), init=False, repr=False)
+    _lows: array = field(default_factory=lambda: array("Q"), init=False, repr=False)
+    _left: array = field(default_factory=lambda: array("q"), init=False, repr=False)
+    _right: array = field(default_factory=lambda: array("q"), init=False, repr=False)
+    _parent: array = field(default_factory=lambda: array("q"), init=False, repr=False)
+    _packets: List[Optional[str]] = field(default_factory=list, init=False, repr=False)
+    _free: List[int] = field(default_factory=list, init=False, repr=False)
+
+
+    def _allocate(self, key: int, data_packet: Optional[str]) -> int:
+        if self._free:
+            node_id = self._free.pop()
+            self._highs[node_id] = key >> 64
+            self._lows[node_id] = key & _LOW_MASK
+            self._left[node_id] = NIL
+            self._right[node_id] = NIL
+            self._parent[node_id] = NIL
+            self._packets[node_id] = data_packet
+            return node_id
+        self._highs.append(key >> 64)
+        self._lows.append(key & _LOW_MASK)
+        self._left.append(NIL)
+        self._right.append(NIL)
+        self._parent.append(NIL)
+        self._packets.append(data_packet)
+        return len(self._lows) - 1
+
+    def _release(self, node_id: int) -> None:
+        self._packets[node_id] = None
+        self._free.append(node_id)
+
+    def _rotate(self, x: int) -> None:
+        # Naikkan x satu level di atas parent-nya (zig kiri atau kanan)
+        left, right, parent = self._left, self._right, self._parent
+        p = parent[x]
+        g = parent[p]
+        if left[p] == x:
+            b = right[x]
+            left[p] = b
+            right[x] = p
+        else:
+            b = left[x]
+            right[p] = b
+            left[x] = p
+        if b != NIL:
+            parent[b] = p
+        parent[p] = x
+        parent[x] = g
+        if g == NIL:
+            self.root = x
+        elif left[g] == p:
+            left[g] = x
+        else:
+            right[g] = x
+
+    def _splay(self, x: int) -> None:
+        left, parent = self._left, self._parent
+        while parent[x] != NIL:
+            p = parent[x]
+            g = parent[p]
+            if g == NIL:
+                # ZIG
+                self._rotate(x)
+            elif (left[g] == p) == (left[p] == x):
+                # ZIG-ZIG / ZAG-ZAG
+                self._rotate(p)
+                self._rotate(x)
+            else:
+                # ZIG-ZAG / ZAG-ZIG
+                self._rotate(x)
+                self._rotate(x)
+
+
+    def _key(self, node_id: int) -> int:
+        return (self._highs[node_id] << 64) | self._lows[node_id]
+
+    def insert(self, ip_address: str, data_packet: Optional[str] = None) -> bool:
+        key = ip_to_key(ip_address)
+        high, low = key >> 64, key & _LOW_MASK
+        highs, lows, left, right = self._highs, self._lows, self._left, self._right
+        parent = NIL
+        is_left = False
+        current = self.root
+        while current != NIL:
+            parent = current
+            current_high = highs[current]
+            if high == current_high:
+                current_low = lows[current]
+                if low == current_low:
+                    self._packets[current] = data_packet
+                    self._splay(current)
+                    return False
+                is_left = low < current_low
+            else:
+                is_left = high < current_high
+            current = left[current] if is_left else right[current]
+
+        node_id = self._allocate(key, data_packet)
+        self._parent[node_id] = parent
+        if parent == NIL:
+            self.root = node_id
+        elif is_left:
+            left[parent] = node_id
+        else:
+            right[parent] = node_id
+
+        self._splay(node_id)
+        self.size += 1
+        return True
+
+    def _find_id(self, key: int) -> int:
+        high, low = key >> 64, key & _LOW_MASK
+        highs, lows, left, right = self._highs, self._lows, self._left, self._right
+        current = self.root
+        while current != NIL:
+            current_high = highs[current]
+            if high == current_high:
+                current_low = lows[current]
+                if low < current_low:
+                    current = left[current]
+                elif low > current_low:
+                    current = right[current]
+                else:
+                    return current
+            elif high < current_high:
+                current = left[current]
+            else:
+                current = right[current]
+        return NIL
+
+    def _snapshot(self, node_id: int) -> Node:
+        key = self._key(node_id)
+        return Node(key_to_ip(key), self._packets[node_id], key=key)
+
+    def _find_node(self, ip_address: str) -> Optional[Node]:
+        try:
+            node_id = self._find_id(ip_to_key(ip_address))
+        except ValueError:
+            return None
+        return None if node_id == NIL else self._snapshot(node_id)
+
+    def search(self, ip_address: str) -> Optional[Node]:
+        self.search_count += 1
+        try:
+            node_id = self._find_id(ip_to_key(ip_address))
+        except ValueError:
+            return None
+        if node_id == NIL:
+            return None
+        self._splay(node_id)
+        return self._snapshot(node_id)
+
+    def search_many(
+        self,
+        ip_addresses: Iterable[str],
+        policy: SplayPolicy = SplayPolicy.EACH,
+    ) -> List[Optional[Node]]:
+        # Sama seperti SplayTree.search_many, dicari satu per satu
+        found: Dict[int, int] = {}
+        probes: List[int] = []
+        for ip_address in ip_addresses:
+            try:
+                key = ip_to_key(ip_address)
+            except ValueError:
+                probes.append(NIL)
+                continue
+            node_id = found.get(key)
+            if node_id is None:
+                node_id = found[key] = self._find_id(key)
+            probes.append(node_id)
+        self.search_count += len(probes)
+
+        hits = [node_id for node_id in probes if node_id != NIL]
+        if policy is SplayPolicy.EACH:
+            for node_id in hits:
+                self._splay(node_id)
+        elif policy is SplayPolicy.HOTTEST and hits:
+            self._splay(Counter(hits).most_common(1)[0][0])
+        return [None if node_id == NIL else self._snapshot(node_id) for node_id in probes]
+
+    def range(self, low_ip: str, high_ip: str, splay: bool = True) -> Iterator[Node]:
+        # Node batas bawah di-splay dulu, lalu jalan in-order dari sana
+        low, high = ip_to_key(low_ip), ip_to_key(high_ip)
+        if splay:
+            self._splay_near(low)
+        return self._iter_key_range(low, high)
+
+    def in_subnet(self, cidr: str, splay: bool = True) -> Iterator[Node]:
+        low, high = subnet_bounds(cidr)
+        if splay:
+            self._splay_near(low)
+        return self._iter_key_range(low, high)
+
+    def _splay_near(self, key: int) -> None:
+        last = NIL
+        current = self.root
+        while current != NIL:
+            last = current
+            current_key = self._key(current)
+            if key < current_key:
+                current = self._left[current]
+            elif key > current_key:
+                current = self._right[current]
+            else:
+                break
+        if last != NIL:
+            self._splay(last)
+
+    def _iter_key_range(self, low: int, high: int) -> Iterator[Node]:
+        # Stack hanya berisi node >= low; subtree kiri yang < low dilewati
+        left, right = self._left, self._right
+        stack: List[int] = []
+        current = self.root
+        while stack or current != NIL:
+            while current != NIL:
+                if self._key(current) < low:
+                    current = right[current]
+                else:
+                    stack.append(current)
+                    current = left[current]
+            if not stack:
+                return
+            node_id = stack.pop()
+            if self._key(node_id) > high:
+                return
+            yield self._snapshot(node_id)
+            current = right[node_id]
+
+    def delete(self, ip_address: str) -> bool:
+        self.search_count += 1
+        try:
+            node_id = self._find_id(ip_to_key(ip_address))
+        except ValueError:
+            return False
+        if node_id == NIL:
+            return False
+
+        # Node dibawa ke root, lalu subtree kiri dan kanan digabung
+        self._splay(node_id)
+        left, right, parent = self._left, self._right, self._parent
+        left_root = left[node_id]
+        right_root = right[node_id]
+        if left_root == NIL:
+            self.root = right_root
+            if right_root != NIL:
+                parent[right_root] = NIL
+        else:
+            parent[left_root] = NIL
+            self.root = left_root
+            maximum = left_root
+            while right[maximum] != NIL:
+                maximum = right[maximum]
+            self._splay(maximum)
+            right[maximum] = right_root
+            if right_root != NIL:
+                parent[right_root] = maximum
+
+        self._release(node_id)
+        self.size -= 1
+        return True
+
+    def update(
+        self,
+        old_ip_address: str,
+        new_ip_address: str | None = None,
+        new_data_packet: str | None = None
+    ) -> tuple[bool, str | None, str | None]:
+        try:
+            node_id = self._find_id(ip_to_key(old_ip_address))
+        except ValueError:
+            return (False, None, None)
+        if node_id == NIL:
+            return (False, None, None)
+
+        old_packet = self._packets[node_id]
+        if new_ip_address is None or ip_to_key(new_ip_address) == self._key(node_id):
+            if new_data_packet is not None:
+                self._packets[node_id] = new_data_packet
+            self._splay(node_id)
+            return (True, None, old_packet)
+
+        packet_to_use = new_data_packet if new_data_packet is not None else old_packet
+        self.delete(old_ip_address)
+        self.insert(new_ip_address, packet_to_use)
+        return (True, old_ip_address, old_packet)
+
+    def inorder_traversal(self) -> List[Node]:
+        return list(self.iter_inorder())
+
+    def iter_inorder(self) -> Iterator[Node]:
+        # Successor dicari lewat array parent, memori tambahan O(1)
+        left, right, parent = self._left, self._right, self._parent
+        node_id = self.root
+        if node_id == NIL:
+            return
+        while left[node_id] != NIL:
+            node_id = left[node_id]
+        while node_id != NIL:
+            yield self._snapshot(node_id)
+            if right[node_id] != NIL:
+                node_id = right[node_id]
+                while left[node_id] != NIL:
+                    node_id = left[node_id]
+            else:
+                child = node_id
+                node_id = parent[node_id]
+                while node_id != NIL and child == right[node_id]:
+                    child = node_id
+                    node_id = parent[node_id]
+
+    def get_tree_structure(self) -> str:
+        return "".join(self.iter_tree_structure())
+
+    def iter_tree_structure(self) -> Iterator[str]:
+        root = None if self.root == NIL else self.root
+        return iter_structure(root, self._structure_children, self._format_structure_node)
+
+    def _structure_children(self, node_id: int) -> List[int]:
+        return [child for child in (self._left[node_id], self._right[node_id]) if child != NIL]
+
+    def _format_structure_node(self, node_id: int) -> str:
+        return f"{key_to_ip(self._key(node_id))} (Packet: {self._packets[node_id]})\n"
+
+
+    @classmethod
+    def from_iterable(cls, items: Iterable[tuple[str, str | None]]) -> "ArraySplayTree":
+        # Id node = posisi di urutan terurut, jadi array link hasil
+        # balanced_links bisa dipakai langsung tanpa disalin per node
+        tree = cls()
+        keys, packets = sorted_unique_items(items)
+        root, tree._left, tree._right, tree._parent, _ = balanced_links(len(keys))
+        tree._highs = array("Q", [key >> 64 for key in keys])
+        tree._lows = array("Q", [key & _LOW_MASK for key in keys])
+        tree._packets = packets
+        tree.root = root
+        tree.size = len(keys)
+        return tree
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import heapq
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any, Callable, ClassVar, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from .keys import ip_to_key
+from .metrics import measured
+from .nodes import Node
+from .records import DeviceRecord
+from .splay_tree import SplayPolicy, SplayTree
+
+NEVER_EXPIRES: float = float("inf")
+
+
+class CacheNode(Node):
+
+    # accessed: stempel akses terakhir (0 = sudah lepas dari tree),
+    # expires: waktu clock saat entri kedaluwarsa
+    __slots__ = ("accessed", "expires")
+
+    @classmethod
+    def from_record(cls, key: int, record: DeviceRecord) -> CacheNode:
+        node = super().from_record(key, record)
+        node.accessed = 0  # type: ignore[attr-defined]
+        node.expires = NEVER_EXPIRES  # type: ignore[attr-defined]
+        return node  # type: ignore[return-value]
+
+
+@dataclass
+class BoundedSplayTree(SplayTree):
+    """
+    SplayTree berkapasitas tetap untuk cache "host yang baru aktif".
+
+    Setiap search yang ketemu, insert dan update memberi node stempel akses
+    baru dan mendorongnya ke min-heap LRU. Heap tidak pernah diperbaiki di
+    tempat: entri lama dikenali dari stempel yang tidak cocok lalu dibuang
+    saat muncul di puncak, dan heap dibangun ulang jika entri basinya lebih
+    banyak dari isi tree. Jadi insert dan eviksi tetap O(log n) amortized.
+
+    TTL dihitung dari insert terakhir (search tidak memperpanjangnya).
+    Entri kedaluwarsa dibuang saat dicari, dan sebelum eviksi LRU setiap
+    kali tree penuh.
+    """
+
+    max_entries: int = 10_000
+    # TTL default dalam detik untuk setiap insert; None = tidak pernah kedaluwarsa
+    ttl: Optional[float] = None
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False, compare=False)
+    hits: int = field(default=0, init=False)
+    misses: int = field(default=0, init=False)
+    evictions: int = field(default=0, init=False)
+    expirations: int = field(default=0, init=False)
+    _sequence: Iterator[int] = field(default_factory=lambda: count(1), init=False, repr=False, compare=False)
+    _lru: List[Tuple[int, CacheNode]] = field(default_factory=list, init=False, repr=False, compare=False)
+    _expiry: List[Tuple[float, int, CacheNode]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _eviction_paused: bool = field(default=False, init=False, repr=False, compare=False)
+
+    node_class: ClassVar[Type[Node]] = CacheNode
+
+    def __post_init__(self) -> None:
+        if self.max_entries < 1:
+            raise ValueError(f"max_entries harus minimal 1: {self.max_entries}")
+        if self.ttl is not None and self.ttl <= 0:
+            raise ValueError(f"ttl harus lebih dari 0 detik: {self.ttl}")
+        super().__post_init__()
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats.update(
+            max_entries=self.max_entries,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            expirations=self.expirations,
+        )
+        return stats
+
+    def _touch(self, node: CacheNode) -> None:
+        stamp = next(self._sequence)
+        node.accessed = stamp
+        heapq.heappush(self._lru, (stamp, node))
+        if len(self._lru) > 2 * self.size + 64:
+            # Stempel node yang masih hidup unik, jadi node tidak pernah dibandingkan
+            self._lru = [(cached.accessed, cached) for cached in self.iter_inorder()]  # type: ignore[attr-defined]
+            heapq.heapify(self._lru)
+
+    def _set_expiry(self, node: CacheNode, ttl: Optional[float]) -> None:
+        if ttl is None:
+            node.expires = NEVER_EXPIRES
+            return
+        node.expires = self.clock() + ttl
+        heapq.heappush(self._expiry, (node.expires, next(self._sequence), node))
+        if len(self._expiry) > 2 * self.size + 64:
+            self._expiry = [
+                (cached.expires, next(self._sequence), cached)
+                for cached in self.iter_inorder()
+                if cached.expires != NEVER_EXPIRES  # type: ignore[attr-defined]
+            ]
+            heapq.heapify(self._expiry)
+
+    def _is_expired(self, node: CacheNode) -> bool:
+        # clock hanya dipanggil jika ada entri dengan TTL
+        return bool(self._expiry) and node.expires <= self.clock()
+
+    def _unlink(self, node: Node) -> None:
+        super()._unlink(node)
+        node.accessed = 0  # type: ignore[attr-defined]
+
+    def _check_hit(self, node: Optional[CacheNode], peeked: Optional[bool] = None) -> Optional[CacheNode]:
+        """
+        Hitung hit/miss untuk node hasil search; entri kedaluwarsa dibuang.
+
+        Args:
+            peeked: Hasil peek yang sudah dikembalikan ke pemanggil (lihat
+                record_searches); None = hit/miss ditentukan dari node sekarang
+        """
+        if node is not None and not node.accessed:
+            node = None
+        if node is not None and self._is_expired(node):
+            self._unlink(node)
+            self.expirations += 1
+            node = None
+        hit = node is not None if peeked is None else peeked
+        if not hit:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if node is not None:
+            self._touch(node)
+        return node
+
+    @measured("search")
+    def search(self, ip_address: str) -> Optional[Node]:
+        return self._check_hit(super().search(ip_address))  # type: ignore[arg-type]
+
+    def _live(self, node: Optional[CacheNode]) -> Optional[CacheNode]:
+        # Versi baca-saja _check_hit: entri kedaluwarsa disembunyikan, tidak dibuang
+        return None if node is None or self._is_expired(node) else node
+
+    def peek(self, ip_address: str) -> Optional[Node]:
+        return self._live(super().peek(ip_address))  # type: ignore[arg-type]
+
+    def peek_key(self, key: int) -> Optional[Node]:
+        return self._live(super().peek_key(key))  # type: ignore[arg-type]
+
+    def peek_many(self, ip_addresses: Iterable[str]) -> List[Optional[Node]]:
+        return [self._live(node) for node in super().peek_many(ip_addresses)]  # type: ignore[arg-type]
+
+    def record_searches(
+        self,
+        ip_addresses: Iterable[str],
+        splay: bool = True,
+        hits: Optional[Sequence[bool]] = None,
+    ) -> None:
+        # Hit/miss, stempel LRU dan pembuangan entri kedaluwarsa ikut dicatat;
+        # dengan `hits`, hit/miss mengikuti hasil peek walau entri sudah berubah
+        ip_addresses = list(ip_addresses)
+        peeked: Iterable[Optional[bool]] = hits if hits is not None else [None] * len(ip_addresses)
+        for ip_address, hit in zip(ip_addresses, peeked):
+            key = self._lookup_key(ip_address)
+            node = None if key is None else self._walk_key(key)
+            self._check_hit(node, hit)  # type: ignore[arg-type]
+        super().record_searches(ip_addresses, splay, hits)
+
+    @measured("search_many")
+    def search_many(
+        self,
+        ip_addresses: Iterable[str],
+        policy: SplayPolicy = SplayPolicy.EACH,
+    ) -> List[Optional[Node]]:
+        return [self._check_hit(node) for node in super().search_many(ip_addresses, policy)]  # type: ignore[arg-type]
+
+    def insert(
+        self,
+        ip_address: str,
+        data_packet: Optional[str] = None,
+        name: Optional[str] = None,
+        ttl: Optional[float] = None,
+    ) -> bool:
+        """
+        Args:
+            ttl: TTL entri ini dalam detik, menggantikan `self.ttl`
+        """
+        return self.insert_record(ip_to_key(ip_address), DeviceRecord(name, data_packet), ttl)
+
+    @measured("insert_record")
+    def insert_record(self, key: int, record: DeviceRecord, ttl: Optional[float] = None) -> bool:
+        inserted = super().insert_record(key, record)
+        # Node yang baru diinsert atau diganti sudah di-splay ke root
+        node: CacheNode = self.root  # type: ignore[assignment]
+        self._touch(node)
+        self._set_expiry(node, self.ttl if ttl is None else ttl)
+        if self.size > self.max_entries and not self._eviction_paused:
+            self._evict()
+        return inserted
+
+    def _find_unexpired(self, ip_address: str) -> Optional[CacheNode]:
+        # Cari node tanpa hit/miss; entri kedaluwarsa dibuang dan dianggap tidak ada
+        node: Optional[CacheNode] = self._find_node(ip_address)  # type: ignore[assignment]
+        if node is not None and self._is_expired(node):
+            self._unlink(node)
+            self.expirations += 1
+            return None
+        return node
+
+    @measured("delete")
+    def delete(self, ip_address: str) -> bool:
+        # Sama seperti SplayTree.delete, dihitung di search_count tetapi tidak sebagai hit/miss
+        self.search_count += 1
+        node = self._find_unexpired(ip_address)
+        if node is None:
+            return False
+        self._splay(node)
+        self._unlink(node)
+        return True
+
+    @measured("update")
+    def update(
+        self,
+        old_ip_address: str,
+        new_ip_address: str | None = None,
+        new_data_packet: str | None = None,
+        new_name: str | None = None,
+    ) -> tuple[bool, str | None, str | None]:
+        if self._find_unexpired(old_ip_address) is None:
+            return False, None, None
+        # TTL hanya diatur ulang jika IP berubah (lewat insert_record)
+        result = super().update(old_ip_address, new_ip_address, new_data_packet, new_name)
+        if result[0] and result[1] is None:
+            self._touch(self.root)  # type: ignore[arg-type]
+        return result
+
+    @contextmanager
+    def paused_eviction(self) -> Iterator[None]:
+        """
+        Tahan eviksi selama replay write-ahead log.
+
+        Eviksi sebelumnya sudah tercatat di log sebagai delete, sedangkan
+        urutan LRU (yang ikut diubah search) tidak; tanpa jeda ini replay
+        bisa membuang device yang berbeda. Sisa kelebihan dibuang di akhir.
+        """
+        self._eviction_paused = True
+        try:
+            yield
+        finally:
+            self._eviction_paused = False
+            if self.size > self.max_entries:
+                self._evict()
+
+    def purge_expired(self) -> int:
+        # Buang semua entri yang sudah kedaluwarsa, O(k log n)
+        expiry = self._expiry
+        now = self.clock()
+        purged = 0
+        while expiry and expiry[0][0] <= now:
+            expires, _, node = heapq.heappop(expiry)
+            if node.accessed and node.expires == expires:
+                self._splay(node)
+                self._unlink(node)
+                purged += 1
+        self.expirations += purged
+        return purged
+
+    def _evict(self) -> None:
+        if self._expiry:
+            self.purge_expired()
+        lru = self._lru
+        while self.size > self.max_entries:
+            stamp, node = heapq.heappop(lru)
+            if node.accessed == stamp:
+                # Splay dulu: korban LRU biasanya node terdalam, dan _unlink
+                # menghitung ulang ukuran subtree dari posisinya ke atas
+                self._splay(node)
+                self._unlink(node)
+                self.evictions += 1
+
+    def _load_sorted(self, keys: Sequence[int], records: Sequence[DeviceRecord]) -> None:
+        # Bulk build: semua node dianggap baru diakses (urutan IP) dengan TTL default
+        super()._load_sorted(keys, records)
+        self._lru = []
+        self._expiry = []
+        for node in self.iter_inorder():
+            self._touch(node)  # type: ignore[arg-type]
+            self._set_expiry(node, self.ttl)  # type: ignore[arg-type]
+        if self.size > self.max_entries:
+            self._evict()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import gc
+import operator
+from array import array
+from contextlib import contextmanager
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .keys import ip_to_key
+
+NIL: int = -1
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    # Jutaan objek baru tanpa siklus memicu koleksi GC berulang tanpa hasil
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def sorted_unique_items(
+    items: Iterable[tuple[str, str | None]]
+) -> Tuple[List[int], List[Optional[str]]]:
+    """
+    Parse dan urutkan item (ip, packet) menjadi key unik yang terurut.
+
+    Jika IP yang sama muncul lebih dari sekali, packet terakhir yang dipakai
+    (sama seperti insert berulang). Input yang sudah terurut tidak di-sort
+    ulang, cukup satu kali scan linear.
+    """
+    keys: List[int] = []
+    packets: List[Optional[str]] = []
+    for ip_address, packet in items:
+        keys.append(ip_to_key(ip_address))
+        packets.append(packet)
+    return sorted_unique_keys(keys, packets)
+
+
+def sorted_unique_keys(
+    keys: Sequence[int], packets: Sequence[Optional[str]]
+) -> Tuple[List[int], List[Optional[str]]]:
+    # Sama seperti sorted_unique_items, untuk key yang sudah di-parse
+    in_order = all(map(operator.le, keys, islice(keys, 1, None)))
+    if in_order:
+        # Fast path: cukup buang duplikat yang bersebelahan
+        if len(keys) == len(set(keys)):
+            return list(keys), list(packets)
+        unique_keys: List[int] = []
+        unique_packets: List[Optional[str]] = []
+        for key, packet in zip(keys, packets):
+            if unique_keys and unique_keys[-1] == key:
+                unique_packets[-1] = packet
+            else:
+                unique_keys.append(key)
+                unique_packets.append(packet)
+        return unique_keys, unique_packets
+
+    latest: Dict[int, Optional[str]] = dict(zip(keys, packets))
+    sorted_keys = sorted(latest)
+    return sorted_keys, [latest[key] for key in sorted_keys]
+
+
+def balanced_links(count: int) -> Tuple[int, array, array, array, array]:
+    """
+    Hitung bentuk BST seimbang untuk `count` item terurut dalam O(n).
+
+    Returns:
+        tuple: (root, left, right, parent, sizes) berupa index item (NIL jika
+        kosong) dan ukuran subtree setiap item
+    """
+    left = array("q", [NIL]) * count
+    right = array("q", [NIL]) * count
+    parent = array("q", [NIL]) * count
+    sizes = array("q", [0]) * count
+    if count == 0:
+        return NIL, left, right, parent, sizes
+
+    root = (count - 1) // 2
+    sizes[root] = count
+    # Stack berisi rentang [low, high] yang tengahnya belum dipasang ke `owner`
+    stack: List[Tuple[int, int, int, bool]] = []
+    if root > 0:
+        stack.append((0, root - 1, root, True))
+    if root < count - 1:
+        stack.append((root + 1, count - 1, root, False))
+    while stack:
+        low, high, owner, is_left = stack.pop()
+        middle = (low + high) // 2
+        parent[middle] = owner
+        sizes[middle] = high - low + 1
+        if is_left:
+            left[owner] = middle
+        else:
+            right[owner] = middle
+        if low < middle:
+            stack.append((low, middle - 1, middle, True))
+        if middle < high:
+            stack.append((middle + 1, high, middle, False))
+    return root, left, right, parent, sizes
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .nodes import Node
+from .splay_tree import SplayTree
+
+
+class LockPolicy(Enum):
+    # Cara ConcurrentSplayTree melindungi tree dari banyak thread
+    GLOBAL = "global"
+    READ_WRITE = "read-write"
+    BUFFERED = "buffered"
+
+
+class ReadWriteLock:
+    """
+    Lock banyak-pembaca / satu-penulis yang mendahulukan penulis.
+
+    Pembaca baru menunggu selama ada penulis yang antre, supaya insert dan
+    delete tidak kelaparan saat beban didominasi search.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writers_waiting = 0
+        self._writing = False
+
+    def acquire_read(self) -> None:
+        with self._condition:
+            while self._writing or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._condition:
+            self._readers -= 1
+            if not self._readers:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+
+    def release_write(self) -> None:
+        with self._condition:
+            self._writing = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+@dataclass
+class ConcurrentSplayTree:
+    """
+    Pembungkus SplayTree yang aman dipakai bersama oleh banyak thread.
+
+    Policy:
+        GLOBAL: satu lock untuk semua operasi, perilaku sama persis dengan
+            SplayTree (setiap search hit di-splay).
+        READ_WRITE: search dan query hanya membaca tree tanpa splay
+            (tree.peek), di bawah read lock sehingga pembaca tidak saling
+            menunggu; operasi yang mengubah tree memakai write lock.
+        BUFFERED: seperti READ_WRITE, tetapi hit juga di-splay saat search
+            yang tertunda dicatat, jadi tree tetap beradaptasi ke IP yang
+            sering dicari.
+
+    Dengan READ_WRITE dan BUFFERED, IP yang dicari dikumpulkan di buffer
+    (beserta apakah peek menemukannya) lalu dicatat ke tree lewat
+    tree.record_searches oleh satu thread penulis setiap `splay_batch`
+    search. Pembaca tidak menyentuh counter apa pun: metrics dan pembukuan
+    per search milik subclass (hit/miss dan LRU BoundedSplayTree) berjalan
+    di sana, di bawah write lock.
+
+    Node yang dikembalikan tetap milik tree; jangan diubah dan jangan
+    dipegang lama saat thread lain sedang menulis.
+    """
+
+    tree: SplayTree = field(default_factory=SplayTree)
+    policy: LockPolicy = LockPolicy.READ_WRITE
+    splay_batch: int = 64
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _rw_lock: ReadWriteLock = field(default_factory=ReadWriteLock, init=False, repr=False)
+    _flush_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    # (IP, apakah peek menemukan node) untuk setiap search yang belum dicatat
+    _pending_searches: Deque[Tuple[str, bool]] = field(default_factory=deque, init=False, repr=False)
+
+    @contextmanager
+    def _reading(self) -> Iterator[None]:
+        if self.policy is LockPolicy.GLOBAL:
+            with self._lock:
+                yield
+        else:
+            with self._rw_lock.read_locked():
+                yield
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        if self.policy is LockPolicy.GLOBAL:
+            with self._lock:
+                yield
+        else:
+            with self._rw_lock.write_locked():
+                yield
+
+    @property
+    def size(self) -> int:
+        return self.tree.size
+
+    @property
+    def search_count(self) -> int:
+        with self._reading():
+            return self.tree.search_count + len(self._pending_searches)
+
+    def stats(self) -> Dict[str, Any]:
+        # Dengan READ_WRITE/BUFFERED, search tidak lewat tree.search sehingga
+        # tidak masuk latensi; kedalaman dan splay-nya dihitung saat dicatat
+        with self._reading():
+            stats = self.tree.stats()
+            stats["search_count"] = self.tree.search_count + len(self._pending_searches)
+        return stats
+
+
+    def insert(self, ip_address: str, data_packet: Optional[str] = None, name: Optional[str] = None) -> bool:
+        with self._writing():
+            return self.tree.insert(ip_address, data_packet, name)
+
+    def delete(self, ip_address: str) -> bool:
+        with self._writing():
+            return self.tree.delete(ip_address)
+
+    def update(
+        self,
+        old_ip_address: str,
+        new_ip_address: str | None = None,
+        new_data_packet: str | None = None,
+        new_name: str | None = None,
+    ) -> tuple[bool, str | None, str | None]:
+        with self._writing():
+            return self.tree.update(old_ip_address, new_ip_address, new_data_packet, new_name)
+
+    def search(self, ip_address: str) -> Optional[Node]:
+        if self.policy is LockPolicy.GLOBAL:
+            with self._lock:
+                return self.tree.search(ip_address)
+
+        with self._rw_lock.read_locked():
+            node = self.tree.peek(ip_address)
+        self._record_searches([ip_address], [node])
+        return node
+
+    def search_many(self, ip_addresses: List[str]) -> List[Optional[Node]]:
+        if self.policy is LockPolicy.GLOBAL:
+            with self._lock:
+                return self.tree.search_many(ip_addresses)
+
+        with self._rw_lock.read_locked():
+            # Pencarian yang sama dengan SplayTree.search_many, tanpa splay dan counter
+            results = self.tree.peek_many(ip_addresses)
+        self._record_searches(ip_addresses, results)
+        return results
+
+    def _record_searches(self, ip_addresses: List[str], results: List[Optional[Node]]) -> None:
+        # deque.extend aman dipanggil dari banyak thread tanpa lock
+        self._pending_searches.extend(zip(ip_addresses, [node is not None for node in results]))
+        if len(self._pending_searches) >= self.splay_batch:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Catat search yang tertunda ke tree (counter, pembukuan subclass dan,
+        untuk BUFFERED, splay-nya).
+
+        Hanya satu thread yang melakukan flush; thread lain yang kebetulan
+        memicu flush bersamaan langsung kembali tanpa menunggu.
+        """
+        if self.policy is LockPolicy.GLOBAL or not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            with self._rw_lock.write_locked():
+                pending = self._pending_searches
+                drained: List[Tuple[str, bool]] = []
+                while pending:
+                    drained.append(pending.popleft())
+                self.tree.record_searches(
+                    [ip_address for ip_address, _ in drained],
+                    splay=self.policy is LockPolicy.BUFFERED,
+                    hits=[hit for _, hit in drained],
+                )
+        finally:
+            self._flush_lock.release()
+
+    def range(self, low_ip: str, high_ip: str) -> List[Node]:
+        # Hasil langsung dijadikan list supaya tidak ada iterator yang hidup di luar lock
+        splay = self.policy is LockPolicy.GLOBAL
+        with self._reading():
+            return list(self.tree.range(low_ip, high_ip, splay))
+
+    def in_subnet(self, cidr: str) -> List[Node]:
+        splay = self.policy is LockPolicy.GLOBAL
+        with self._reading():
+            return list(self.tree.in_subnet(cidr, splay))
+
+    def count_range(self, low_ip: str, high_ip: str) -> int:
+        splay = self.policy is LockPolicy.GLOBAL
+        with self._reading():
+            return self.tree.count_range(low_ip, high_ip, splay)
+
+    def count_subnet(self, cidr: str) -> int:
+        splay = self.policy is LockPolicy.GLOBAL
+        with self._reading():
+            return self.tree.count_subnet(cidr, splay)
+
+    def page(self, offset: int, limit: int) -> List[Node]:
+        with self._reading():
+            return self.tree.page(offset, limit, splay=False)
+
+    def inorder_traversal(self) -> List[Node]:
+        with self._reading():
+            return self.tree.inorder_traversal()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from ..net.address import IPV4_MAPPED, KEY_BITS, MAX_KEY, format_ip, is_ipv4_key, parse_ip
+from ..net.ipv4 import format_ipv4
+
+IPV4_BITS: int = 32
+# Rentang key (inklusif) untuk semua IPv4, mis. untuk membuat IP acak
+IPV4_FIRST_KEY: int = IPV4_MAPPED
+IPV4_LAST_KEY: int = IPV4_MAPPED | ((1 << IPV4_BITS) - 1)
+# Panjang prefix CIDR IPv4 di ruang key 128-bit: /8 IPv4 = /104 key
+IPV4_PREFIX_OFFSET: int = KEY_BITS - IPV4_BITS
+
+
+# Parse dan format IP ada di src/net; nama lama tetap dipakai di seluruh tree
+ip_to_key = parse_ip
+key_to_ip = format_ip
+
+
+def normalize_ip(ip_address: str) -> str:
+    return key_to_ip(ip_to_key(ip_address))
+
+
+def prefix_mask(prefix_length: int) -> int:
+    return (MAX_KEY << (KEY_BITS - prefix_length)) & MAX_KEY
+
+
+def parse_cidr(cidr: str) -> tuple[int, int]:
+    """
+    Returns:
+        tuple: (key network, panjang prefix di ruang key 128-bit). Prefix
+        CIDR IPv4 digeser IPV4_PREFIX_OFFSET, mis. 10.0.0.0/8 -> /104.
+    """
+    network, separator, length_text = cidr.partition("/")
+    if not separator:
+        raise ValueError(f"Format CIDR salah (butuh '/panjang'): {cidr!r}")
+    family_bits = KEY_BITS if ":" in network else IPV4_BITS
+    if not (length_text.isascii() and length_text.isdigit()) or int(length_text) > family_bits:
+        raise ValueError(f"Panjang prefix harus 0-{family_bits}: {cidr!r}")
+    prefix_length = int(length_text) + KEY_BITS - family_bits
+    key = ip_to_key(network)
+    if key & ~prefix_mask(prefix_length):
+        raise ValueError(f"Bit host pada CIDR harus nol: {cidr!r}")
+    return key, prefix_length
+
+
+def format_cidr(key: int, prefix_length: int) -> str:
+    if prefix_length >= IPV4_PREFIX_OFFSET and is_ipv4_key(key):
+        return f"{format_ipv4(key & ~IPV4_MAPPED)}/{prefix_length - IPV4_PREFIX_OFFSET}"
+    if is_ipv4_key(key):
+        # Prefix IPv6 yang lebih lebar dari blok IPv4-mapped, mis. ::ffff:0:0/80
+        return f"::ffff:{format_ipv4(key & ~IPV4_MAPPED)}/{prefix_length}"
+    return f"{key_to_ip(key)}/{prefix_length}"
+
+
+def subnet_bounds(cidr: str) -> tuple[int, int]:
+    # Key pertama dan terakhir (inklusif) di dalam subnet
+    network, prefix_length = parse_cidr(cidr)
+    return network, network | (~prefix_mask(prefix_length) & MAX_KEY)
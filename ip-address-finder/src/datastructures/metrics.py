@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, List, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Bucket latensi ke-i berisi operasi dengan durasi < 2**i mikrodetik;
+# bucket terakhir menampung semua yang lebih lama (>= ~0.5 detik)
+LATENCY_BUCKETS: int = 20
+
+
+@dataclass
+class LatencyStats:
+
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * LATENCY_BUCKETS)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+        self.buckets[min(int(seconds * 1e6).bit_length(), LATENCY_BUCKETS - 1)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        # Batas atas bucket (detik) yang memuat persentil tersebut
+        target = fraction * self.count
+        seen = 0
+        for index, amount in enumerate(self.buckets):
+            seen += amount
+            if amount and seen >= target:
+                return min((1 << index) / 1e6, self.maximum)
+        return self.maximum
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count * 1e6 if self.count else 0.0,
+            "p50_us": self.percentile(0.5) * 1e6,
+            "p99_us": self.percentile(0.99) * 1e6,
+            "max_us": self.maximum * 1e6,
+        }
+
+
+@dataclass
+class TreeMetrics:
+    """
+    Counter instrumentasi sebuah splay tree (lihat SplayTree.enable_metrics).
+
+    Semua counter diisi langsung di jalur yang sedang dijalankan tree,
+    jadi tidak ada penelusuran tambahan yang ikut masuk latensi.
+
+    comparisons: jumlah node yang dilewati saat mencari key (search, insert,
+        delete dan update); hit hash index tidak menambah. peek tidak
+        dihitung: search lewat peek dihitung saat dicatat record_searches.
+    zig / zig_zig / zig_zag: langkah splay. TopDownSplayTree tidak punya
+        langkah zig-zag tersendiri: rotasi dihitung zig-zig, link tanpa
+        rotasi dihitung zig, jadi zig-zag top-down muncul sebagai dua zig.
+    depth_histogram: kedalaman -> jumlah search (termasuk pencarian di dalam
+        delete), dengan kedalaman = jumlah node yang dilewati (1 = di root).
+    latencies: nama operasi -> LatencyStats; operasi di dalam operasi lain
+        (mis. search di dalam delete) tidak dihitung terpisah.
+    """
+
+    comparisons: int = 0
+    zig: int = 0
+    zig_zig: int = 0
+    zig_zag: int = 0
+    depth_histogram: Counter = field(default_factory=Counter)
+    latencies: Dict[str, LatencyStats] = field(default_factory=dict)
+    # True selama operasi terluar sedang diukur
+    busy: bool = field(default=False, repr=False)
+
+    def record_search(self, depth: int) -> None:
+        self.comparisons += depth
+        self.depth_histogram[depth] += 1
+
+    def record_latency(self, operation: str, seconds: float) -> None:
+        stats = self.latencies.get(operation)
+        if stats is None:
+            stats = self.latencies[operation] = LatencyStats()
+        stats.add(seconds)
+
+    def reset(self) -> None:
+        self.comparisons = self.zig = self.zig_zig = self.zig_zag = 0
+        self.depth_histogram.clear()
+        self.latencies.clear()
+
+    @property
+    def mean_depth(self) -> float:
+        searches = sum(self.depth_histogram.values())
+        if not searches:
+            return 0.0
+        return sum(depth * amount for depth, amount in self.depth_histogram.items()) / searches
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "comparisons": self.comparisons,
+            "rotations": {"zig": self.zig, "zig_zig": self.zig_zig, "zig_zag": self.zig_zag},
+            "mean_depth": self.mean_depth,
+            "depth_histogram": dict(sorted(self.depth_histogram.items())),
+            "latency": {operation: stats.as_dict() for operation, stats in sorted(self.latencies.items())},
+        }
+
+
+def measured(operation: str) -> Callable[[F], F]:
+    """
+    Tandai method tree yang latensinya dicatat saat metrics aktif.
+
+    Method tidak dibungkus di kelas: pembungkus pengukur baru dipasang per
+    instance oleh instrument() (lewat enable_metrics), jadi tree tanpa
+    metrics memanggil method aslinya tanpa frame tambahan.
+    """
+
+    def decorate(method: F) -> F:
+        method.measured_operation = operation  # type: ignore[attr-defined]
+        return method
+
+    return decorate
+
+
+def _measured_operations(cls: type) -> Dict[str, str]:
+    # Nama method -> nama operasi, termasuk method bertanda di kelas induk
+    operations: Dict[str, str] = {}
+    for klass in reversed(cls.__mro__):
+        for name, value in vars(klass).items():
+            operation = getattr(value, "measured_operation", None)
+            if operation is not None:
+                operations[name] = operation
+    return operations
+
+
+def _timed(tree: Any, method: Callable[..., Any], operation: str) -> Callable[..., Any]:
+    @wraps(method)
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        # Hanya operasi terluar yang diukur, jadi search di dalam delete
+        # tidak tercatat dua kali
+        metrics = tree.metrics
+        if metrics is None or metrics.busy:
+            return method(*args, **kwargs)
+        metrics.busy = True
+        start = perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            metrics.busy = False
+            metrics.record_latency(operation, perf_counter() - start)
+
+    return timed
+
+
+def instrument(tree: Any) -> None:
+    # Pasang pembungkus pengukur di instance untuk setiap method bertanda
+    for name, operation in _measured_operations(type(tree)).items():
+        setattr(tree, name, _timed(tree, getattr(type(tree), name).__get__(tree), operation))
+
+
+def uninstrument(tree: Any) -> None:
+    for name in _measured_operations(type(tree)):
+        tree.__dict__.pop(name, None)
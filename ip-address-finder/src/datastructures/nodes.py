@@ -1,18 +1,103 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
 from typing import Optional
 
+from .keys import ip_to_key, key_to_ip
+from .records import DeviceRecord, expand_text
 
-@dataclass
-class Node:
 
-    ip_address: str
-    data_packet: str | None = None
-    left: Optional[Node] = field(default=None, repr=False)
-    right: Optional[Node] = field(default=None, repr=False)
-    parent: Optional[Node] = field(default=None, repr=False)
+class BaseNode:
+
+    # __slots__ menghilangkan __dict__ per instance, penting saat jumlah device jutaan.
+    # String IP tidak disimpan; ip_address diturunkan dari key saat dibaca.
+    # Nama, packet dan waktu update ada di satu DeviceRecord milik node.
+    __slots__ = ("record", "left", "right", "key", "size")
+
+    def __init__(
+        self,
+        ip_address: str,
+        data_packet: str | None = None,
+        left: Optional[BaseNode] = None,
+        right: Optional[BaseNode] = None,
+        key: Optional[int] = None,
+        name: str | None = None,
+        record: Optional[DeviceRecord] = None,
+    ) -> None:
+        self.record: DeviceRecord = DeviceRecord(name, data_packet) if record is None else record
+        self.left = left
+        self.right = right
+        # Key integer dipakai untuk semua perbandingan di tree
+        self.key: int = ip_to_key(ip_address) if key is None else key
+        # Jumlah node di subtree ini (termasuk dirinya), dijaga oleh tree
+        self.size = 1 + (left.size if left is not None else 0) + (right.size if right is not None else 0)
+
+    @classmethod
+    def from_record(cls, key: int, record: DeviceRecord) -> BaseNode:
+        # Node daun baru tanpa parse IP, dipakai insert_record dan replay log
+        node = cls.__new__(cls)
+        node.record = record
+        node.key = key
+        node.left = node.right = None
+        node.size = 1
+        return node
+
+    @property
+    def ip_address(self) -> str:
+        return key_to_ip(self.key)
+
+    @property
+    def data_packet(self) -> Optional[str]:
+        # Langsung dari slot record, tanpa melewati property DeviceRecord
+        return expand_text(self.record._packet)
+
+    @data_packet.setter
+    def data_packet(self, value: Optional[str]) -> None:
+        self.record.data_packet = value
+
+    @property
+    def name(self) -> Optional[str]:
+        return expand_text(self.record._name)
+
+    @name.setter
+    def name(self, value: Optional[str]) -> None:
+        self.record.name = value
+
+    @property
+    def updated_at(self) -> int:
+        return self.record.updated_at
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(ip_address={self.ip_address!r}, "
+            f"data_packet={self.data_packet!r}, name={self.name!r})"
+        )
 
     def __str__(self) -> str:
         packet = self.data_packet or "-"
         return f"IP: {self.ip_address}, Packet: {packet}"
+
+
+class Node(BaseNode):
+
+    # Pointer parent hanya dibutuhkan oleh splay bottom-up
+    __slots__ = ("parent",)
+
+    def __init__(
+        self,
+        ip_address: str,
+        data_packet: str | None = None,
+        left: Optional[Node] = None,
+        right: Optional[Node] = None,
+        parent: Optional[Node] = None,
+        key: Optional[int] = None,
+        name: str | None = None,
+        record: Optional[DeviceRecord] = None,
+    ) -> None:
+        super().__init__(ip_address, data_packet, left, right, key, name, record)
+        self.parent = parent
+
+    @classmethod
+    def from_record(cls, key: int, record: DeviceRecord) -> Node:
+        node = super().from_record(key, record)
+        node.parent = None
+        return node  # type: ignore[return-value]
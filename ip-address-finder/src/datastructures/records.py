@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import deque
+from itertools import islice, repeat
+from operator import itemgetter
+from typing import Dict, List, Optional, Sequence, Union
+
+# Teks berbentuk <prefix><angka> (mis. "PKT-1234", "Device-7") disimpan sebagai
+# satu int: (angka << 8) | id prefix. Prefix dicatat sekali di tabel global,
+# jadi setiap device hanya menyimpan int kecil, bukan string utuh.
+_PREFIX_BITS = 8
+_PREFIX_MASK = (1 << _PREFIX_BITS) - 1
+# Angka maksimal 9 digit supaya hasilnya tetap int kecil (< 2**38)
+_MAX_SUFFIX_DIGITS = 9
+_DIGITS = "0123456789"
+
+# Tabel ini sengaja satu per proses, bukan per tree: record berpindah antar
+# tree (shard, snapshot, import) dan code-nya harus tetap bisa di-expand.
+# Semua perubahan lewat _table_lock. Pembacaan tanpa lock aman karena tabel
+# hanya bertambah: prefix masuk _prefixes sebelum id-nya terlihat di
+# _prefix_ids, dan id tidak pernah dipakai ulang.
+_prefixes: List[str] = []
+_prefix_ids: Dict[str, int] = {}
+_table_lock = threading.Lock()
+# Int hasil peringkasan yang sering berulang (mis. PKT-1000..9999) dipakai
+# bersama lewat cache ini; ukurannya dibatasi supaya teks unik tidak membengkakkan memori
+_CODE_CACHE_LIMIT = 1 << 16
+_codes: Dict[int, int] = {}
+
+CompactText = Union[str, int, None]
+
+
+def _register_prefix(prefix: str) -> Optional[int]:
+    with _table_lock:
+        prefix_id = _prefix_ids.get(prefix)
+        if prefix_id is None and len(_prefixes) <= _PREFIX_MASK:
+            prefix_id = len(_prefixes)
+            _prefixes.append(prefix)
+            _prefix_ids[prefix] = prefix_id
+        return prefix_id
+
+
+def compact_text(text: Optional[str]) -> CompactText:
+    """
+    Bentuk ringkas sebuah nama/packet untuk disimpan di DeviceRecord.
+
+    Angka dengan nol di depan (mis. "PKT-007") tidak diringkas supaya teks
+    aslinya tetap utuh. Teks lain di-intern, sehingga nama yang sama
+    (mis. "Router") hanya disimpan sekali.
+    """
+    if text is None:
+        return None
+    prefix = text.rstrip(_DIGITS)
+    digits = len(text) - len(prefix)
+    if 0 < digits <= _MAX_SUFFIX_DIGITS and (digits == 1 or text[len(prefix)] != "0"):
+        prefix_id = _prefix_ids.get(prefix)
+        if prefix_id is None:
+            prefix_id = _register_prefix(prefix)
+        if prefix_id is not None:
+            code = (int(text[len(prefix):]) << _PREFIX_BITS) | prefix_id
+            cached = _codes.get(code)
+            if cached is not None:
+                return cached
+            if len(_codes) < _CODE_CACHE_LIMIT:
+                with _table_lock:
+                    if len(_codes) < _CODE_CACHE_LIMIT:
+                        return _codes.setdefault(code, code)
+            return code
+    return sys.intern(text)
+
+
+def expand_text(value: CompactText) -> Optional[str]:
+    if type(value) is int:
+        return _prefixes[value & _PREFIX_MASK] + str(value >> _PREFIX_BITS)  # type: ignore[operator]
+    return value  # type: ignore[return-value]
+
+
+def now() -> int:
+    return int(time.time())
+
+
+class DeviceRecord:
+    """
+    Data satu device: nama, data packet dan waktu perubahan terakhir.
+
+    Dipegang langsung oleh node tree, jadi satu pencarian sudah memberi
+    semua data device tanpa lookup kedua.
+    """
+
+    __slots__ = ("_name", "_packet", "updated_at")
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        data_packet: Optional[str] = None,
+        updated_at: Optional[int] = None,
+    ) -> None:
+        self._name = compact_text(name)
+        self._packet = compact_text(data_packet)
+        # Detik epoch
+        self.updated_at: int = now() if updated_at is None else updated_at
+
+    @property
+    def name(self) -> Optional[str]:
+        return expand_text(self._name)
+
+    @name.setter
+    def name(self, value: Optional[str]) -> None:
+        self._name = compact_text(value)
+
+    @property
+    def data_packet(self) -> Optional[str]:
+        return expand_text(self._packet)
+
+    @data_packet.setter
+    def data_packet(self, value: Optional[str]) -> None:
+        self._packet = compact_text(value)
+
+    def touch(self) -> None:
+        self.updated_at = now()
+
+    def replaced(self, name: Optional[str] = None, data_packet: Optional[str] = None) -> "DeviceRecord":
+        # Salinan dengan field yang diubah (None = tetap) dan waktu update baru;
+        # record lama tidak disentuh sehingga aman dicatat dulu ke journal
+        record = DeviceRecord.__new__(DeviceRecord)
+        record._name = self._name if name is None else compact_text(name)
+        record._packet = self._packet if data_packet is None else compact_text(data_packet)
+        record.updated_at = now()
+        return record
+
+    def __reduce__(self) -> tuple:
+        # Tabel prefix berbeda di tiap proses, jadi pickle memakai teks utuh
+        return (DeviceRecord, (self.name, self.data_packet, self.updated_at))
+
+    def __repr__(self) -> str:
+        return f"DeviceRecord(name={self.name!r}, data_packet={self.data_packet!r}, updated_at={self.updated_at})"
+
+
+def _compact_uniform(texts: List[str]) -> Optional[List[int]]:
+    # Jalur cepat untuk kolom yang semuanya <prefix yang sama><angka>:
+    # pengecekan dan konversi dikerjakan map/join di C, bukan per teks
+    if not texts:
+        return []
+    prefix = texts[0].rstrip(_DIGITS)
+    # Kolom dicek seluruhnya dulu; prefix baru hanya didaftarkan jika kolom
+    # memang seragam, supaya tabel prefix (maks. 256) tidak terisi sampah
+    if not all(map(str.startswith, texts, repeat(prefix))):
+        return None
+    suffixes = list(map(itemgetter(slice(len(prefix), None)), texts))
+    joined = "".join(suffixes)
+    if not (joined.isascii() and joined.isdigit()):
+        return None
+    lengths = list(map(len, suffixes))
+    if min(lengths) < 1 or max(lengths) > _MAX_SUFFIX_DIGITS:
+        return None
+    # Nol di depan (mis. "PKT-007") tidak boleh diringkas, kecuali angka "0" saja
+    if sum(map(str.startswith, suffixes, repeat("0"))) > suffixes.count("0"):
+        return None
+    prefix_id = _prefix_ids.get(prefix)
+    if prefix_id is None:
+        prefix_id = _register_prefix(prefix)
+        if prefix_id is None:
+            return None
+    codes = [(number << _PREFIX_BITS) | prefix_id for number in map(int, suffixes)]
+    if len(_codes) < _CODE_CACHE_LIMIT:
+        with _table_lock:
+            room = _CODE_CACHE_LIMIT - len(_codes)
+            if room > 0:
+                # Nilai unik pertama masuk cache selama masih ada tempat
+                distinct = list(islice(dict.fromkeys(codes), room))
+                deque(map(_codes.setdefault, distinct, distinct), maxlen=0)
+    return list(map(_codes.get, codes, codes))
+
+
+def compact_column(texts: Sequence[Optional[str]]) -> List[CompactText]:
+    # Sama dengan compact_text untuk setiap teks, dioptimalkan untuk kolom besar
+    present = [text for text in texts if text is not None]
+    codes = _compact_uniform(present)
+    if codes is None:
+        return list(map(compact_text, texts))
+    if len(present) == len(texts):
+        return codes  # type: ignore[return-value]
+    remaining = iter(codes)
+    return [None if text is None else next(remaining) for text in texts]
+
+
+_set_name = DeviceRecord._name.__set__  # type: ignore[attr-defined]
+_set_packet = DeviceRecord._packet.__set__  # type: ignore[attr-defined]
+_set_updated = DeviceRecord.updated_at.__set__  # type: ignore[attr-defined]
+
+
+def build_records(
+    packets: Sequence[Optional[str]],
+    names: Optional[Sequence[Optional[str]]] = None,
+    updated: Optional[Sequence[int]] = None,
+) -> List[DeviceRecord]:
+    """
+    Buat banyak record sekaligus untuk bulk build.
+
+    Record dibuat lewat __new__ dan slot diisi per kolom lewat descriptor
+    slot, tanpa __init__ per record.
+    """
+    count = len(packets)
+    records = list(map(DeviceRecord.__new__, repeat(DeviceRecord, count)))
+    # deque(maxlen=0) menjalankan map sampai habis tanpa menyimpan hasilnya
+    deque(map(_set_packet, records, compact_column(packets)), maxlen=0)
+    deque(map(_set_name, records, compact_column(names) if names is not None else repeat(None)), maxlen=0)
+    if updated is None:
+        # Tanpa kolom waktu: satu objek int dipakai bersama oleh semua record di batch ini
+        deque(map(_set_updated, records, repeat(now())), maxlen=0)
+    else:
+        # Waktu yang sama (mis. satu batch import) cukup disimpan sebagai satu objek int
+        shared: Dict[int, int] = {}
+        deque(map(_set_updated, records, map(shared.setdefault, updated, updated)), maxlen=0)
+    return records
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .keys import KEY_BITS, format_cidr, ip_to_key, parse_cidr, prefix_mask
+
+
+@dataclass(frozen=True)
+class Route:
+
+    network: int
+    # Panjang prefix di ruang key 128-bit; cidr menampilkan panjang asli IPv4
+    prefix_length: int
+    data_packet: str | None = None
+
+    @property
+    def cidr(self) -> str:
+        return format_cidr(self.network, self.prefix_length)
+
+    def __str__(self) -> str:
+        packet = self.data_packet or "-"
+        return f"Route: {self.cidr}, Packet: {packet}"
+
+
+class _TrieNode:
+
+    # Node trie biner terkompresi: satu node bisa melompati banyak bit
+    __slots__ = ("prefix", "length", "mask", "route", "zero", "one")
+
+    def __init__(self, prefix: int, length: int, route: Optional[Route] = None) -> None:
+        self.prefix = prefix
+        self.length = length
+        self.mask = prefix_mask(length)
+        self.route = route
+        self.zero: Optional[_TrieNode] = None
+        self.one: Optional[_TrieNode] = None
+
+    def child(self, bit: int) -> Optional[_TrieNode]:
+        return self.one if bit else self.zero
+
+    def set_child(self, bit: int, node: Optional[_TrieNode]) -> None:
+        if bit:
+            self.one = node
+        else:
+            self.zero = node
+
+
+def _bit_at(key: int, position: int) -> int:
+    # Bit ke-`position` dihitung dari MSB (posisi 0)
+    return (key >> (KEY_BITS - 1 - position)) & 1
+
+
+def _common_length(a: int, b: int, limit: int) -> int:
+    difference = (a ^ b) >> (KEY_BITS - limit) if limit else 0
+    if difference == 0:
+        return limit
+    return limit - difference.bit_length()
+
+
+@dataclass
+class RoutingTable:
+    """
+    Tabel routing CIDR dengan longest-prefix match.
+
+    Disimpan sebagai trie biner dengan path compression, sehingga biaya
+    lookup dibatasi panjang prefix, bukan jumlah route. IPv4 dan IPv6 berbagi
+    trie yang sama; prefix IPv4 berada di bawah ::ffff:0:0/96.
+    """
+
+    size: int = 0
+    lookup_count: int = 0
+    _root: _TrieNode = field(default_factory=lambda: _TrieNode(0, 0), init=False, repr=False)
+
+
+    def insert(self, cidr: str, data_packet: str | None = None) -> bool:
+        network, prefix_length = parse_cidr(cidr)
+        route = Route(network, prefix_length, data_packet)
+        node = self._root
+        while True:
+            if node.length == prefix_length:
+                is_new = node.route is None
+                node.route = route
+                self.size += is_new
+                return is_new
+
+            bit = _bit_at(network, node.length)
+            child = node.child(bit)
+            if child is None:
+                node.set_child(bit, _TrieNode(network, prefix_length, route))
+                self.size += 1
+                return True
+
+            common = _common_length(child.prefix, network, min(child.length, prefix_length))
+            if common == child.length:
+                node = child
+                continue
+
+            # Prefix baru bercabang di tengah edge: sisipkan node di titik cabang
+            branch = _TrieNode(network & prefix_mask(common), common)
+            branch.set_child(_bit_at(child.prefix, common), child)
+            node.set_child(bit, branch)
+            if common == prefix_length:
+                branch.route = route
+            else:
+                branch.set_child(_bit_at(network, common), _TrieNode(network, prefix_length, route))
+            self.size += 1
+            return True
+
+    def lookup(self, ip_address: str) -> Optional[Route]:
+        self.lookup_count += 1
+        try:
+            key = ip_to_key(ip_address)
+        except ValueError:
+            return None
+        node = self._root
+        best = node.route
+        while node.length < KEY_BITS:
+            node = node.one if (key >> (KEY_BITS - 1 - node.length)) & 1 else node.zero
+            if node is None or key & node.mask != node.prefix:
+                break
+            if node.route is not None:
+                best = node.route
+        return best
+
+    def get(self, cidr: str) -> Optional[Route]:
+        network, prefix_length = parse_cidr(cidr)
+        path = self._exact_path(network, prefix_length)
+        return path[-1][0].route if path else None
+
+    def delete(self, cidr: str) -> bool:
+        network, prefix_length = parse_cidr(cidr)
+        path = self._exact_path(network, prefix_length)
+        if not path or path[-1][0].route is None:
+            return False
+
+        node, bit = path[-1]
+        node.route = None
+        self.size -= 1
+        if len(path) > 1:
+            parent = path[-2][0]
+            # Bersihkan node yang tidak lagi punya route atau percabangan
+            if node.zero is None and node.one is None:
+                parent.set_child(bit, None)
+                node = parent
+                bit = path[-2][1]
+                parent = path[-3][0] if len(path) > 2 else None
+            if parent is not None and node.route is None:
+                children = [child for child in (node.zero, node.one) if child is not None]
+                if len(children) == 1:
+                    parent.set_child(bit, children[0])
+        return True
+
+    def _exact_path(self, network: int, prefix_length: int) -> List[Tuple[_TrieNode, int]]:
+        # Path dari root ke node prefix persis, berisi (node, bit dari parent)
+        node = self._root
+        path: List[Tuple[_TrieNode, int]] = [(node, 0)]
+        while node.length < prefix_length:
+            bit = _bit_at(network, node.length)
+            child = node.child(bit)
+            if child is None or child.length > prefix_length or network & child.mask != child.prefix:
+                return []
+            node = child
+            path.append((node, bit))
+        if node.length != prefix_length:
+            return []
+        return path
+
+    def iter_routes(self) -> Iterator[Route]:
+        # Preorder trie = urut berdasarkan network, prefix pendek lebih dulu
+        stack: List[_TrieNode] = [self._root]
+        while stack:
+            node = stack.pop()
+            if node.route is not None:
+                yield node.route
+            if node.one is not None:
+                stack.append(node.one)
+            if node.zero is not None:
+                stack.append(node.zero)
+
+    def routes(self) -> List[Route]:
+        return list(self.iter_routes())
+
+
+    @classmethod
+    def from_iterable(cls, items: Iterable[tuple[str, str | None]]) -> "RoutingTable":
+        table = cls()
+        for cidr, packet in items:
+            table.insert(cidr, packet)
+        return table
@@ -0,0 +1,386 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .bulk import sorted_unique_items
+from .keys import IPV4_FIRST_KEY, IPV4_LAST_KEY, KEY_BITS, MAX_KEY, ip_to_key, key_to_ip, subnet_bounds
+from .nodes import Node
+from .records import DeviceRecord
+from .splay_tree import SplayPolicy, SplayTree
+
+# Shard ditentukan oleh bucket prefix 16 bit yang naik searah urutan key:
+#   0                  : IPv6 di bawah blok IPv4-mapped (::, ::1, ...)
+#   1 .. 65536         : IPv4, per dua oktet pertama
+#   65537 .. 131072    : IPv6 lainnya, per 16 bit teratas (2001:, fe80:, ...)
+PREFIX_BITS: int = 16
+IPV4_PREFIX_SHIFT: int = 16
+IPV6_PREFIX_SHIFT: int = KEY_BITS - PREFIX_BITS
+IPV4_FIRST_PREFIX: int = 1
+IPV6_FIRST_PREFIX: int = IPV4_FIRST_PREFIX + (1 << PREFIX_BITS)
+PREFIX_COUNT: int = IPV6_FIRST_PREFIX + (1 << PREFIX_BITS)
+# Shard maksimal: index shard disimpan di tabel uint16
+MAX_SHARDS: int = 1 << 16
+
+Operation = Tuple[str, tuple]
+NodeItem = Tuple[int, DeviceRecord]
+
+
+def prefix_of(key: int) -> int:
+    # Bucket prefix sebuah key; key yang lebih besar tidak pernah di bucket yang lebih kecil
+    if key < IPV4_FIRST_KEY:
+        return 0
+    if key <= IPV4_LAST_KEY:
+        return IPV4_FIRST_PREFIX + ((key >> IPV4_PREFIX_SHIFT) & 0xFFFF)
+    return IPV6_FIRST_PREFIX + (key >> IPV6_PREFIX_SHIFT)
+
+
+def _items(nodes: Iterable[Node]) -> List[NodeItem]:
+    # Hasil dikirim sebagai tuple (key, record): jauh lebih murah di-pickle daripada Node
+    return [(node.key, node.record) for node in nodes]
+
+
+def _search(tree: SplayTree, ip_address: str) -> Optional[NodeItem]:
+    node = tree.search(ip_address)
+    return None if node is None else (node.key, node.record)
+
+
+def _search_many(tree: SplayTree, ip_addresses: List[str], policy: SplayPolicy) -> List[Optional[NodeItem]]:
+    return [
+        None if node is None else (node.key, node.record)
+        for node in tree.search_many(ip_addresses, policy)
+    ]
+
+
+def _pop(tree: SplayTree, ip_address: str) -> Optional[DeviceRecord]:
+    node = tree.peek(ip_address)
+    if node is None:
+        return None
+    record = node.record
+    tree.delete(ip_address)
+    return record
+
+
+def _range(tree: SplayTree, low_ip: str, high_ip: str) -> List[NodeItem]:
+    return _items(tree.range(low_ip, high_ip))
+
+
+_OPERATIONS: Dict[str, Callable[..., Any]] = {
+    "insert": SplayTree.insert,
+    "insert_record": SplayTree.insert_record,
+    "search": _search,
+    "search_many": _search_many,
+    "delete": SplayTree.delete,
+    "update": SplayTree.update,
+    "pop": _pop,
+    "range": _range,
+    "count": SplayTree.count_range,
+    "stats": lambda tree: (tree.size, tree.search_count),
+}
+
+
+def _shard_main(connection: Any, items: List[Tuple[str, Optional[str]]]) -> None:
+    # Loop proses shard: terima satu batch operasi, kirim satu list hasil
+    tree = SplayTree.from_iterable(items)
+    while True:
+        batch = connection.recv()
+        if batch is None:
+            break
+        results: List[Any] = []
+        for name, args in batch:
+            try:
+                results.append(_OPERATIONS[name](tree, *args))
+            except Exception as exc:  # dikembalikan ke router, shard tetap hidup
+                results.append(exc)
+        connection.send(results)
+    connection.close()
+
+
+def balanced_boundaries(keys: Sequence[int], shards: int) -> List[int]:
+    """
+    Pilih prefix awal setiap shard supaya jumlah key per shard kira-kira rata.
+
+    Batas selalu jatuh di batas bucket prefix (lihat prefix_of), jadi setiap
+    shard tetap memegang rentang IP yang bersambung. `keys` harus terurut.
+    Tanpa key, ruang IPv4 dibagi rata; IPv6 ikut shard pertama dan terakhir.
+    """
+    boundaries = [0]
+    for index in range(1, shards):
+        if keys:
+            prefix = prefix_of(keys[index * len(keys) // shards])
+        else:
+            prefix = IPV4_FIRST_PREFIX + index * (1 << PREFIX_BITS) // shards
+        # Naik tegas dan masih menyisakan prefix untuk shard berikutnya
+        prefix = min(max(prefix, boundaries[-1] + 1), PREFIX_COUNT - shards + index)
+        boundaries.append(prefix)
+    return boundaries
+
+
+class ShardedSplayTree:
+    """
+    Mesin lookup yang membagi ruang IP ke beberapa proses, masing-masing
+    dengan SplayTree sendiri.
+
+    Setiap shard memegang rentang bucket prefix yang bersambung, jadi hasil
+    range dan traversal cukup disambung sesuai urutan shard. Operasi batch
+    (execute, search_many) dikelompokkan per shard dan dikirim sebagai satu
+    pesan, sehingga biaya pickle dan IPC dibayar sekali per shard, bukan per
+    operasi; semua shard bekerja paralel sebelum hasilnya dikumpulkan.
+
+    Node yang dikembalikan adalah salinan (snapshot). Panggil close() atau
+    pakai sebagai context manager untuk menghentikan proses shard.
+    """
+
+    def __init__(
+        self,
+        shards: Optional[int] = None,
+        items: Iterable[Tuple[str, Optional[str]]] = (),
+        boundaries: Optional[Sequence[int]] = None,
+    ) -> None:
+        keys, packets = sorted_unique_items(items)
+        shard_count = shards or os.cpu_count() or 1
+        if not 1 <= shard_count <= MAX_SHARDS:
+            raise ValueError(f"Jumlah shard harus 1-{MAX_SHARDS}")
+        self.boundaries = list(boundaries) if boundaries is not None else balanced_boundaries(keys, shard_count)
+        if len(self.boundaries) != shard_count or self.boundaries[0] != 0 or any(
+            low >= high for low, high in zip(self.boundaries, self.boundaries[1:])
+        ):
+            raise ValueError("boundaries harus naik tegas, dimulai dari 0, satu per shard")
+
+        # Tabel bucket prefix -> shard, dua byte per bucket
+        self._shard_of = array("H", [0]) * PREFIX_COUNT
+        for shard, (low, high) in enumerate(zip(self.boundaries, self.boundaries[1:] + [PREFIX_COUNT])):
+            self._shard_of[low:high] = array("H", [shard]) * (high - low)
+
+        per_shard: List[List[Tuple[str, Optional[str]]]] = [[] for _ in range(shard_count)]
+        for key, packet in zip(keys, packets):
+            per_shard[self._shard_of[prefix_of(key)]].append((key_to_ip(key), packet))
+
+        self._invalid_searches = 0
+        self._connections = []
+        self._processes = []
+        for shard_items in per_shard:
+            parent_end, child_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_shard_main, args=(child_end, shard_items), daemon=True)
+            process.start()
+            child_end.close()
+            self._connections.append(parent_end)
+            self._processes.append(process)
+
+    @classmethod
+    def from_iterable(
+        cls, items: Iterable[Tuple[str, Optional[str]]], shards: Optional[int] = None
+    ) -> "ShardedSplayTree":
+        return cls(shards, items)
+
+    def __enter__(self) -> "ShardedSplayTree":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for connection in self._connections:
+            try:
+                connection.send(None)
+                connection.close()
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+        self._connections = []
+        self._processes = []
+
+    @property
+    def shard_count(self) -> int:
+        return len(self.boundaries)
+
+    def shard_for(self, key: int) -> int:
+        return self._shard_of[prefix_of(key)]
+
+
+    def _dispatch(self, batches: Dict[int, List[Operation]]) -> Dict[int, List[Any]]:
+        # Kirim dulu ke semua shard, baru tunggu jawaban: shard bekerja paralel
+        for shard, batch in batches.items():
+            self._connections[shard].send(batch)
+        results = {shard: self._connections[shard].recv() for shard in batches}
+        for shard_results in results.values():
+            for result in shard_results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    def _call(self, shard: int, name: str, *args: Any) -> Any:
+        return self._dispatch({shard: [(name, args)]})[shard][0]
+
+    def execute(self, operations: Sequence[Tuple[str, str, tuple]]) -> List[Any]:
+        """
+        Jalankan banyak operasi satu-IP sekaligus, dengan satu pesan per shard.
+
+        Args:
+            operations: (nama, ip, argumen tambahan), misalnya
+                ("insert", "10.0.0.1", ("PKT-1",)) atau ("search", ip, ())
+
+        Returns:
+            list: Hasil setiap operasi sesuai urutan input. Operasi di shard
+            yang sama dijalankan sesuai urutan input. IP yang tidak valid
+            memberi None untuk search dan False untuk delete. Jika ada
+            operasi yang gagal (termasuk insert IP tidak valid), error
+            di-raise setelah semua shard selesai.
+        """
+        batches: Dict[int, List[Operation]] = {}
+        positions: Dict[int, List[int]] = {}
+        results: List[Any] = [None] * len(operations)
+        invalid_insert: Optional[ValueError] = None
+        for index, (name, ip_address, args) in enumerate(operations):
+            if name not in ("insert", "search", "delete"):
+                raise ValueError(f"Operasi batch tidak didukung: {name}")
+            key = SplayTree._lookup_key(ip_address)
+            if key is None:
+                if name == "insert":
+                    if invalid_insert is None:
+                        try:
+                            ip_to_key(ip_address)
+                        except ValueError as exc:
+                            invalid_insert = exc
+                elif name == "search":
+                    self._invalid_searches += 1
+                else:
+                    results[index] = False
+                continue
+            shard = self.shard_for(key)
+            batches.setdefault(shard, []).append((name, (ip_address,) + tuple(args)))
+            positions.setdefault(shard, []).append(index)
+
+        for shard, shard_results in self._dispatch(batches).items():
+            for index, result in zip(positions[shard], shard_results):
+                results[index] = self._node_or_value(result)
+        if invalid_insert is not None:
+            raise invalid_insert
+        return results
+
+    @staticmethod
+    def _node_or_value(result: Any) -> Any:
+        if isinstance(result, tuple):
+            key, record = result
+            return Node.from_record(key, record)
+        return result
+
+    def insert(self, ip_address: str, data_packet: Optional[str] = None, name: Optional[str] = None) -> bool:
+        return self._call(self.shard_for(ip_to_key(ip_address)), "insert", ip_address, data_packet, name)
+
+    def search(self, ip_address: str) -> Optional[Node]:
+        key = SplayTree._lookup_key(ip_address)
+        if key is None:
+            self._invalid_searches += 1
+            return None
+        return self._node_or_value(self._call(self.shard_for(key), "search", ip_address))
+
+    def search_many(
+        self,
+        ip_addresses: Iterable[str],
+        policy: SplayPolicy = SplayPolicy.EACH,
+    ) -> List[Optional[Node]]:
+        probes = list(ip_addresses)
+        batches: Dict[int, List[str]] = {}
+        positions: Dict[int, List[int]] = {}
+        for index, ip_address in enumerate(probes):
+            key = SplayTree._lookup_key(ip_address)
+            if key is None:
+                self._invalid_searches += 1
+                continue
+            shard = self.shard_for(key)
+            batches.setdefault(shard, []).append(ip_address)
+            positions.setdefault(shard, []).append(index)
+
+        results: List[Optional[Node]] = [None] * len(probes)
+        replies = self._dispatch(
+            {shard: [("search_many", (batch, policy))] for shard, batch in batches.items()}
+        )
+        for shard, (shard_results,) in replies.items():
+            for index, result in zip(positions[shard], shard_results):
+                results[index] = self._node_or_value(result)
+        return results
+
+    def delete(self, ip_address: str) -> bool:
+        key = SplayTree._lookup_key(ip_address)
+        if key is None:
+            return False
+        return self._call(self.shard_for(key), "delete", ip_address)
+
+    def update(
+        self,
+        old_ip_address: str,
+        new_ip_address: str | None = None,
+        new_data_packet: str | None = None,
+        new_name: str | None = None,
+    ) -> tuple[bool, str | None, str | None]:
+        old_key = SplayTree._lookup_key(old_ip_address)
+        if old_key is None:
+            return (False, None, None)
+        old_shard = self.shard_for(old_key)
+        if new_ip_address is None or self.shard_for(ip_to_key(new_ip_address)) == old_shard:
+            return self._call(old_shard, "update", old_ip_address, new_ip_address, new_data_packet, new_name)
+
+        # IP pindah shard: ambil record dari shard lama lalu insert ke shard baru
+        record = self._call(old_shard, "pop", old_ip_address)
+        if record is None:
+            return (False, None, None)
+        new_key = ip_to_key(new_ip_address)
+        self._call(self.shard_for(new_key), "insert_record", new_key, record.replaced(new_name, new_data_packet))
+        return (True, old_ip_address, record.data_packet)
+
+    def _shards_between(self, low: int, high: int) -> range:
+        return range(self.shard_for(low), self.shard_for(high) + 1)
+
+    def _key_range(self, low: int, high: int) -> List[Node]:
+        if low > high:
+            return []
+        # Batas dikirim sebagai IP supaya shard cukup memanggil SplayTree.range
+        bounds = (key_to_ip(low), key_to_ip(high))
+        replies = self._dispatch({shard: [("range", bounds)] for shard in self._shards_between(low, high)})
+        # Shard bersambung dan terurut, jadi cukup disambung
+        return [
+            Node.from_record(key, record)
+            for shard in sorted(replies)
+            for key, record in replies[shard][0]
+        ]
+
+    def range(self, low_ip: str, high_ip: str) -> List[Node]:
+        return self._key_range(ip_to_key(low_ip), ip_to_key(high_ip))
+
+    def in_subnet(self, cidr: str) -> List[Node]:
+        return self._key_range(*subnet_bounds(cidr))
+
+    def _count_key_range(self, low: int, high: int) -> int:
+        if low > high:
+            return 0
+        bounds = (key_to_ip(low), key_to_ip(high))
+        replies = self._dispatch({shard: [("count", bounds)] for shard in self._shards_between(low, high)})
+        return sum(shard_results[0] for shard_results in replies.values())
+
+    def count_range(self, low_ip: str, high_ip: str) -> int:
+        return self._count_key_range(ip_to_key(low_ip), ip_to_key(high_ip))
+
+    def count_subnet(self, cidr: str) -> int:
+        return self._count_key_range(*subnet_bounds(cidr))
+
+    def inorder_traversal(self) -> List[Node]:
+        return self._key_range(0, MAX_KEY)
+
+    def _stats(self) -> List[Tuple[int, int]]:
+        replies = self._dispatch({shard: [("stats", ())] for shard in range(self.shard_count)})
+        return [replies[shard][0] for shard in range(self.shard_count)]
+
+    @property
+    def size(self) -> int:
+        return sum(size for size, _ in self._stats())
+
+    @property
+    def search_count(self) -> int:
+        return self._invalid_searches + sum(count for _, count in self._stats())
+
+    def shard_sizes(self) -> List[int]:
+        return [size for size, _ in self._stats()]
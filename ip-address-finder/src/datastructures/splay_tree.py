@@ -1,9 +1,53 @@
 from __future__ import annotations
 
+from bisect import bisect_left
+from collections import Counter
+from itertools import islice
 from dataclasses import dataclass, field
-from typing import Iterable, List, Optional
+from enum import Enum
+from typing import Any, ClassVar, Dict, Iterable, Iterator, List, Optional, Protocol, Sequence, Tuple, Type
 
+from .bulk import NIL, balanced_links, paused_gc, sorted_unique_items
+from .keys import MAX_KEY, ip_to_key, subnet_bounds
+from .metrics import TreeMetrics, instrument, measured, uninstrument
 from .nodes import Node
+from .records import DeviceRecord, build_records
+from .structure import iter_structure
+
+# Batch yang lebih kecil dari ini dicari satu per satu, bukan disapu
+BATCH_SWEEP_THRESHOLD: int = 16
+
+
+class SplayPolicy(Enum):
+    # Kapan node yang ketemu di search_many di-splay ke root
+    EACH = "each"
+    HOTTEST = "hottest"
+    NONE = "none"
+
+
+class IndexPolicy(Enum):
+    """
+    Perilaku splay untuk search yang dijawab hash index.
+
+    ALWAYS: hit tetap di-splay, bentuk tree sama persis seperti tanpa index;
+        yang dihemat hanya penelusuran dari root.
+    SAMPLED: hanya satu dari setiap `index_splay_interval` hit yang di-splay,
+        jadi IP yang sering dicari tetap naik mendekati root (berguna untuk
+        range, rank dan insert di sekitarnya) dengan sebagian kecil rotasi.
+    NEVER: hit O(1) tanpa rotasi; bentuk tree hanya berubah karena operasi tulis.
+    """
+
+    ALWAYS = "always"
+    SAMPLED = "sampled"
+    NEVER = "never"
+
+
+class TreeJournal(Protocol):
+    # Penerima catatan perubahan tree (misalnya write-ahead log)
+
+    def log_insert(self, key: int, record: DeviceRecord) -> None: ...
+
+    def log_delete(self, key: int) -> None: ...
 
 
 @dataclass
@@ -12,140 +56,463 @@ class SplayTree:
     root: Optional[Node] = None
     size: int = 0
     search_count: int = 0
-    _comparison_trace: List[str] = field(default_factory=list, init=False, repr=False)
+    # Diisi enable_metrics(); None = tanpa instrumentasi sama sekali
+    metrics: Optional[TreeMetrics] = field(default=None, init=False, repr=False, compare=False)
+    # Jika diisi, setiap insert/delete/update dicatat sebelum tree diubah
+    journal: Optional[TreeJournal] = field(default=None, repr=False, compare=False)
+    # Jika diisi, pencarian exact-match dijawab lewat hash index key -> node
+    index_policy: Optional[IndexPolicy] = field(default=None, repr=False, compare=False)
+    index_splay_interval: int = field(default=16, repr=False, compare=False)
+    _index: Optional[Dict[int, Node]] = field(default=None, init=False, repr=False, compare=False)
+    _index_hits: int = field(default=0, init=False, repr=False, compare=False)
+
+    node_class: ClassVar[Type[Node]] = Node
+    tracks_parent: ClassVar[bool] = True
+
+    def __post_init__(self) -> None:
+        if self.index_policy is not None:
+            self.enable_index(self.index_policy)
+
+    def enable_index(self, policy: IndexPolicy = IndexPolicy.SAMPLED) -> None:
+        """
+        Pasang hash index key -> node untuk pencarian exact-match O(1).
+
+        Index dibangun dari isi tree saat ini (O(n)) lalu dijaga tetap
+        sinkron oleh insert, delete, update dan bulk build. Query terurut
+        (range, subnet, rank, page) tetap memakai tree. Menambah sekitar
+        satu entri dict per device.
+        """
+        self.index_policy = policy
+        self._index = {node.key: node for node in self.iter_inorder()}
+        self._index_hits = 0
 
+    def disable_index(self) -> None:
+        self.index_policy = None
+        self._index = None
+
+    def enable_metrics(self) -> TreeMetrics:
+        """
+        Aktifkan instrumentasi: perbandingan, langkah splay, histogram
+        kedalaman search dan latensi per operasi (lihat TreeMetrics).
+
+        Counter diisi di jalur yang sama dengan operasinya; tanpa metrics,
+        biayanya hanya cek `self.metrics is None` di titik-titik tersebut.
+        Pengukur latensi dipasang per instance di sini dan dilepas lagi oleh
+        disable_metrics.
+        """
+        if self.metrics is None:
+            self.metrics = TreeMetrics()
+            instrument(self)
+        return self.metrics
+
+    def disable_metrics(self) -> None:
+        self.metrics = None
+        uninstrument(self)
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"size": self.size, "search_count": self.search_count}
+        if self.metrics is not None:
+            stats.update(self.metrics.as_dict())
+        return stats
+
+    def _splay_hit(self, node: Node) -> None:
+        # Splay untuk search yang ketemu, sesuai index_policy
+        policy = self.index_policy
+        if policy is None or policy is IndexPolicy.ALWAYS:
+            self._splay(node)
+        elif policy is IndexPolicy.SAMPLED:
+            self._index_hits += 1
+            if self._index_hits >= self.index_splay_interval:
+                self._index_hits = 0
+                self._splay(node)
 
     def _left_rotate(self, x: Node) -> None:
         y = x.right
         if y is None:
             return
-        x.right = y.left
-        if y.left:
-            y.left.parent = x
-        y.parent = x.parent
-        if x.parent is None:
+        parent = x.parent
+        middle = y.left
+        x.right = middle
+        if middle is not None:
+            middle.parent = x
+        y.parent = parent
+        # Cek sisi anak pakai identitas (is), bukan __eq__
+        if parent is None:
             self.root = y
-        elif x == x.parent.left:
-            x.parent.left = y
+        elif x is parent.left:
+            parent.left = y
         else:
-            x.parent.right = y
+            parent.right = y
         y.left = x
         x.parent = y
+        # Ukuran subtree: y mengambil alih subtree x, x dihitung ulang
+        y.size = x.size
+        x.size = 1 + (x.left.size if x.left is not None else 0) + (
+            middle.size if middle is not None else 0
+        )
 
     def _right_rotate(self, x: Node) -> None:
         y = x.left
         if y is None:
             return
-        x.left = y.right
-        if y.right:
-            y.right.parent = x
-        y.parent = x.parent
-        if x.parent is None:
+        parent = x.parent
+        middle = y.right
+        x.left = middle
+        if middle is not None:
+            middle.parent = x
+        y.parent = parent
+        if parent is None:
             self.root = y
-        elif x == x.parent.right:
-            x.parent.right = y
+        elif x is parent.right:
+            parent.right = y
         else:
-            x.parent.left = y
+            parent.left = y
         y.right = x
         x.parent = y
+        y.size = x.size
+        x.size = 1 + (middle.size if middle is not None else 0) + (
+            x.right.size if x.right is not None else 0
+        )
 
 
     def _splay(self, node: Node) -> None:
-        while node.parent:
+        metrics = self.metrics
+        while True:
             parent = node.parent
+            if parent is None:
+                return
             grandparent = parent.parent
-            
+            node_is_left = node is parent.left
+
             # ZIG
             if grandparent is None:
-                if node == parent.left:
+                if node_is_left:
                     self._right_rotate(parent)
                 else:
                     self._left_rotate(parent)
-            
-            elif node == parent.left and parent == grandparent.left:
-                # ZIG-ZIG : Kiri - Kiri
-                self._right_rotate(grandparent)
-                self._right_rotate(parent)
-                
-            elif node == parent.right and parent == grandparent.right:
+                if metrics is not None:
+                    metrics.zig += 1
+
+            elif node_is_left:
+                if parent is grandparent.left:
+                    # ZIG-ZIG : Kiri - Kiri
+                    self._right_rotate(grandparent)
+                    self._right_rotate(parent)
+                    if metrics is not None:
+                        metrics.zig_zig += 1
+                else:
+                    # ZAG - ZIG : Kanan - Kiri
+                    self._right_rotate(parent)
+                    self._left_rotate(grandparent)
+                    if metrics is not None:
+                        metrics.zig_zag += 1
+
+            elif parent is grandparent.right:
                 # ZAG-ZAG : Kanan - Kanan
                 self._left_rotate(grandparent)
                 self._left_rotate(parent)
+                if metrics is not None:
+                    metrics.zig_zig += 1
 
-            elif node == parent.right and parent == grandparent.left:
-                # ZIG - ZAG : Kiri - Kanan
-                self._left_rotate(parent)
-                self._right_rotate(parent)
             else:
-                # ZAG - ZIG : Kanan - Kiri
-                self._right_rotate(parent)
+                # ZIG - ZAG : Kiri - Kanan
                 self._left_rotate(parent)
+                self._right_rotate(grandparent)
+                if metrics is not None:
+                    metrics.zig_zag += 1
 
 
-    def insert(self, ip_address: str, data_packet: Optional[str] = None) -> bool:
-        node = Node(ip_address, data_packet)
-        parent: Optional[Node] = None
-        current = self.root
+    def insert(self, ip_address: str, data_packet: Optional[str] = None, name: Optional[str] = None) -> bool:
+        # IP yang sudah ada diganti seluruh datanya (nama dan packet)
+        return self.insert_record(ip_to_key(ip_address), DeviceRecord(name, data_packet))
 
-        while current:
-            parent = current
-            if node.ip_address < current.ip_address:
-                current = current.left
-            elif node.ip_address > current.ip_address:
-                current = current.right
-            else:
-                current.data_packet = data_packet
-                self._splay(current)
-                return False
+    @measured("insert_record")
+    def insert_record(self, key: int, record: DeviceRecord) -> bool:
+        # Inti insert, juga dipakai replay log dan import yang sudah punya record
+        if self.journal is not None:
+            self.journal.log_insert(key, record)
+        if self.metrics is not None:
+            current, parent, depth = self._trace_key(key)
+            self.metrics.comparisons += depth
+        else:
+            parent = None
+            current = self.root
+            while current:
+                parent = current
+                if key < current.key:
+                    current = current.left
+                elif key > current.key:
+                    current = current.right
+                else:
+                    break
+        if current is not None:
+            current.record = record
+            self._splay(current)
+            return False
 
+        node = self.node_class.from_record(key, record)
+        if self._index is not None:
+            self._index[key] = node
         node.parent = parent
         if parent is None:
             self.root = node
-        elif node.ip_address < parent.ip_address:
+        elif key < parent.key:
             parent.left = node
         else:
             parent.right = node
+        ancestor = parent
+        while ancestor is not None:
+            ancestor.size += 1
+            ancestor = ancestor.parent
 
         self._splay(node)
         self.size += 1
         return True
 
+    @staticmethod
+    def _lookup_key(ip_address: str) -> Optional[int]:
+        # IP yang formatnya salah dianggap tidak ada di tree
+        try:
+            return ip_to_key(ip_address)
+        except ValueError:
+            return None
+
+    def peek(self, ip_address: str) -> Optional[Node]:
+        """
+        Cari IP tanpa splay dan tanpa menambah search_count.
+
+        Untuk tampilan dan validasi (mis. cek IP sudah dipakai) yang tidak
+        boleh mengubah bentuk tree maupun statistik pencarian. Counter
+        metrics juga tidak disentuh, jadi aman dipanggil banyak pembaca
+        sekaligus di bawah read lock.
+        """
+        key = self._lookup_key(ip_address)
+        if key is None:
+            return None
+        return self._walk_key(key)
+
+    def peek_key(self, key: int) -> Optional[Node]:
+        return self._walk_key(key)
+
+    def contains(self, ip_address: str) -> bool:
+        return self.peek(ip_address) is not None
+
+    def peek_many(self, ip_addresses: Iterable[str]) -> List[Optional[Node]]:
+        # search_many tanpa splay dan tanpa counter, sesuai urutan input
+        probes = [self._lookup_key(ip_address) for ip_address in ip_addresses]
+        found = self._find_keys([key for key in probes if key is not None], counted=False)
+        return [None if key is None else found.get(key) for key in probes]
+
+    def record_searches(
+        self,
+        ip_addresses: Iterable[str],
+        splay: bool = True,
+        hits: Optional[Sequence[bool]] = None,
+    ) -> None:
+        """
+        Catat search yang sudah dijawab lewat peek/peek_many di luar tree.
+
+        Dipakai ConcurrentSplayTree: pembaca hanya peek di bawah read lock,
+        lalu search-nya dicatat belakangan oleh satu penulis, termasuk
+        perbandingan dan kedalamannya jika metrics aktif. Subclass yang
+        punya pembukuan per search (mis. hit/miss cache) meng-override ini.
+
+        Args:
+            splay: True = hit di-splay seperti search (mengikuti index_policy);
+                IP yang sama cukup di-splay sekali, di posisi akses terakhirnya
+            hits: Apakah peek untuk setiap IP menemukan node, untuk subclass
+                yang membukukan hit/miss sesuai hasil yang sudah dikembalikan
+        """
+        keys = [self._lookup_key(ip_address) for ip_address in ip_addresses]
+        self.search_count += len(keys)
+        metrics = self.metrics
+        if metrics is not None and self._index is None:
+            for key in keys:
+                if key is not None:
+                    metrics.record_search(self._trace_key(key)[2])
+        if not splay:
+            return
+        latest = list(dict.fromkeys(key for key in reversed(keys) if key is not None))
+        for key in reversed(latest):
+            node = self._walk_key(key)
+            if node is not None:
+                self._splay_hit(node)
+
     def _find_node(self, ip_address: str) -> Optional[Node]:
+        key = self._lookup_key(ip_address)
+        if key is None:
+            return None
+        return self._find_key(key)
+
+    def _find_key(self, key: int) -> Optional[Node]:
+        if self.metrics is not None and self._index is None:
+            node, _, depth = self._trace_key(key)
+            self.metrics.comparisons += depth
+            return node
+        return self._walk_key(key)
+
+    def _walk_key(self, key: int) -> Optional[Node]:
+        # Cari key tanpa splay dan tanpa menyentuh counter apa pun
+        if self._index is not None:
+            return self._index.get(key)
         current = self.root
         while current:
-            if ip_address < current.ip_address:
+            if key < current.key:
                 current = current.left
-            elif ip_address > current.ip_address:
+            elif key > current.key:
                 current = current.right
             else:
                 return current
         return None
 
+    def _trace_key(self, key: int) -> Tuple[Optional[Node], Optional[Node], int]:
+        """
+        Jalur pencarian key untuk tree dengan metrics: (node atau None, node
+        terakhir sebelum node tersebut, jumlah node yang dilewati). Satu kali
+        jalan, sama seperti versi tanpa metrics.
+        """
+        depth = 0
+        parent: Optional[Node] = None
+        current = self.root
+        while current is not None:
+            depth += 1
+            if key < current.key:
+                parent, current = current, current.left
+            elif key > current.key:
+                parent, current = current, current.right
+            else:
+                break
+        return current, parent, depth
+
+    @measured("search")
     def search(self, ip_address: str) -> Optional[Node]:
         self.search_count += 1
+        key = self._lookup_key(ip_address)
+        if key is None:
+            return None
+        if self._index is not None:
+            node = self._index.get(key)
+            if node is not None:
+                self._splay_hit(node)
+            return node
+        if self.metrics is not None:
+            node, _, depth = self._trace_key(key)
+            self.metrics.record_search(depth)
+            if node is not None:
+                self._splay(node)
+            return node
         current = self.root
         while current:
-            if ip_address < current.ip_address:
+            if key < current.key:
                 current = current.left
-            elif ip_address > current.ip_address:
+            elif key > current.key:
                 current = current.right
             else:
                 self._splay(current)
                 return current
         return None
 
+    @measured("search_many")
+    def search_many(
+        self,
+        ip_addresses: Iterable[str],
+        policy: SplayPolicy = SplayPolicy.EACH,
+    ) -> List[Optional[Node]]:
+        """
+        Cari banyak IP sekaligus dalam satu panggilan.
+
+        Probe diurutkan lalu tree disapu sekali; hanya subtree yang memuat
+        probe yang dikunjungi. Batch kecil, atau tree dengan hash index,
+        dicari satu per satu.
+
+        Args:
+            ip_addresses: Daftar IP yang dicari
+            policy: EACH = setiap hit di-splay seperti search (mengikuti
+                index_policy jika ada index) sesuai urutan input,
+                HOTTEST = splay hanya IP yang paling sering dicari di batch,
+                NONE = tidak ada splay sama sekali
+
+        Returns:
+            list: Node atau None untuk setiap IP, sesuai urutan input
+        """
+        probes = [self._lookup_key(ip_address) for ip_address in ip_addresses]
+        self.search_count += len(probes)
+        valid = [key for key in probes if key is not None]
+        found = self._find_keys(valid)
+        results = [None if key is None else found.get(key) for key in probes]
+
+        if policy is SplayPolicy.EACH:
+            for node in results:
+                if node is not None:
+                    self._splay_hit(node)
+        elif policy is SplayPolicy.HOTTEST:
+            hits = Counter(key for key in valid if key in found)
+            if hits:
+                hottest, _ = hits.most_common(1)[0]
+                self._splay(found[hottest])
+        return results
+
+    def _find_keys(self, keys: List[int], counted: bool = True) -> Dict[int, Node]:
+        # Node untuk setiap key yang ada di tree, tanpa splay;
+        # counted=False: perbandingan tidak dicatat ke metrics
+        found: Dict[int, Node] = {}
+        if self._index is not None or len(keys) < BATCH_SWEEP_THRESHOLD:
+            find = self._find_key if counted else self._walk_key
+            for key in keys:
+                node = find(key)
+                if node is not None:
+                    found[key] = node
+            return found
+        return self._sweep(sorted(set(keys)), counted)
+
+    def _sweep(self, sorted_keys: List[int], counted: bool = True) -> Dict[int, Node]:
+        # Setiap frame: (node, low, high) dengan sorted_keys[low:high] pasti
+        # berada di dalam rentang subtree node tersebut
+        found: Dict[int, Node] = {}
+        visited = 0
+        stack = [(self.root, 0, len(sorted_keys))]
+        while stack:
+            node, low, high = stack.pop()
+            if node is None or low >= high:
+                continue
+            visited += 1
+            position = bisect_left(sorted_keys, node.key, low, high)
+            split = position
+            if position < high and sorted_keys[position] == node.key:
+                found[node.key] = node
+                split = position + 1
+            stack.append((node.left, low, position))
+            stack.append((node.right, split, high))
+        if counted and self.metrics is not None:
+            self.metrics.comparisons += visited
+        return found
+
+    @measured("delete")
     def delete(self, ip_address: str) -> bool:
         node = self.search(ip_address)
         if node is None:
             return False
+        self._unlink(node)
+        return True
 
+    def _unlink(self, node: Node) -> None:
+        # Lepas node dari tree (beserta journal dan index), tanpa mencari lagi
+        if self.journal is not None:
+            self.journal.log_delete(node.key)
+        if self._index is not None:
+            del self._index[node.key]
+
+        # Titik terdalam yang ukuran subtree-nya berubah, dihitung ulang ke atas
+        resize_from = node.parent
         if node.left is None:
             self._replace(node, node.right)
         elif node.right is None:
             self._replace(node, node.left)
         else:
             successor = self._minimum(node.right)
+            resize_from = successor
             if successor.parent is not node:
+                resize_from = successor.parent
                 self._replace(successor, successor.right)
                 successor.right = node.right
                 if successor.right:
@@ -154,26 +521,29 @@ class SplayTree:
             successor.left = node.left
             if successor.left:
                 successor.left.parent = successor
+        self._resize_upward(resize_from)
 
         self.size -= 1
-        return True
 
+    @measured("update")
     def update(
         self,
         old_ip_address: str,
         new_ip_address: str | None = None,
-        new_data_packet: str | None = None
+        new_data_packet: str | None = None,
+        new_name: str | None = None,
     ) -> tuple[bool, str | None, str | None]:
         """
-        Update IP address dan/atau data_packet pada node yang sudah ada.
+        Update IP address, data_packet dan/atau nama pada node yang sudah ada.
         
-        Jika IP berubah, akan delete node lama dan insert node baru.
-        Node yang diupdate akan di-splay ke root.
+        Jika IP berubah, akan delete node lama dan insert node baru yang
+        membawa record device yang sama. Node yang diupdate akan di-splay ke root.
         
         Args:
             old_ip_address: IP address yang akan diupdate
             new_ip_address: IP address baru (opsional, None = tidak diubah)
             new_data_packet: Data packet baru (opsional, None = tidak diubah)
+            new_name: Nama device baru (opsional, None = tidak diubah)
             
         Returns:
             tuple: (success: bool, old_ip: str | None, old_packet: str | None)
@@ -185,78 +555,245 @@ class SplayTree:
         
         old_packet = node.data_packet
         
-        # Jika IP tidak berubah, hanya update packet
-        if new_ip_address is None or new_ip_address == old_ip_address:
-            if new_data_packet is not None:
-                node.data_packet = new_data_packet
+        # Jika IP tidak berubah, hanya update packet/nama
+        if new_ip_address is None or ip_to_key(new_ip_address) == node.key:
+            if new_data_packet is not None or new_name is not None:
+                record = node.record.replaced(new_name, new_data_packet)
+                if self.journal is not None:
+                    self.journal.log_insert(node.key, record)
+                node.record = record
             # Splay node ke root setelah update
             self._splay(node)
             return (True, None, old_packet)
         
         # IP berubah: delete lama, insert baru
-        # Simpan packet yang akan digunakan
-        packet_to_use = new_data_packet if new_data_packet is not None else old_packet
+        # Record dibawa ke IP baru (nama dan packet lama tetap jika tidak diubah)
+        record = node.record.replaced(new_name, new_data_packet)
         
         # Delete node lama (ini akan splay successor/predecessor)
         self.delete(old_ip_address)
         
         # Insert node baru (ini akan splay node baru ke root)
-        self.insert(new_ip_address, packet_to_use)
+        self.insert_record(ip_to_key(new_ip_address), record)
         
         return (True, old_ip_address, old_packet)
 
+    def range(self, low_ip: str, high_ip: str, splay: bool = True) -> Iterator[Node]:
+        """
+        Iterasi lazy node dengan IP di antara low_ip dan high_ip (inklusif).
+
+        Hanya subtree yang beririsan dengan rentang yang dikunjungi, total
+        O(log n + k) amortized. Node batas bawah di-splay sekali di awal
+        (kecuali splay=False); setelah itu tree tidak boleh diubah selama
+        iterasi berjalan.
+        """
+        low, high = ip_to_key(low_ip), ip_to_key(high_ip)
+        if splay:
+            self._splay_near(low)
+        return self._iter_key_range(low, high)
+
+    def in_subnet(self, cidr: str, splay: bool = True) -> Iterator[Node]:
+        low, high = subnet_bounds(cidr)
+        if splay:
+            self._splay_near(low)
+        return self._iter_key_range(low, high)
+
+    def count_range(self, low_ip: str, high_ip: str, splay: bool = True) -> int:
+        low, high = ip_to_key(low_ip), ip_to_key(high_ip)
+        return self._count_key_range(low, high, splay)
+
+    def count_subnet(self, cidr: str, splay: bool = True) -> int:
+        return self._count_key_range(*subnet_bounds(cidr), splay)
+
+    def rank(self, ip_address: str) -> int:
+        # Jumlah device dengan IP lebih kecil = posisi 0-based jika IP ada
+        return self._count_below(ip_to_key(ip_address))
+
+    def select(self, index: int, splay: bool = True) -> Node:
+        """
+        Ambil device ke-`index` (0-based) dalam urutan IP, O(log n) amortized.
+
+        Args:
+            index: Posisi device, boleh negatif seperti index list
+            splay: False untuk membaca tanpa mengubah bentuk tree
+        """
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(f"Index {index} di luar rentang 0-{self.size - 1}")
+        current = self.root
+        while current is not None:
+            left_size = current.left.size if current.left is not None else 0
+            if index < left_size:
+                current = current.left
+            elif index > left_size:
+                index -= left_size + 1
+                current = current.right
+            else:
+                break
+        assert current is not None
+        if splay:
+            self._splay(current)
+        return current
+
+    def page(self, offset: int, limit: int, splay: bool = True) -> List[Node]:
+        # Satu halaman device terurut: select ke offset lalu jalan ke successor
+        if limit <= 0 or not 0 <= offset < self.size:
+            return []
+        first = self.select(offset, splay=splay)
+        return list(islice(self._iter_key_range(first.key, MAX_KEY), limit))
+
+    def _iter_key_range(self, low: int, high: int) -> Iterator[Node]:
+        # Stack hanya berisi node >= low; subtree kiri yang < low dilewati
+        stack: List[Node] = []
+        current = self.root
+        while stack or current is not None:
+            while current is not None:
+                if current.key < low:
+                    current = current.right
+                else:
+                    stack.append(current)
+                    current = current.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.key > high:
+                return
+            yield node
+            current = node.right
+
+    def _count_key_range(self, low: int, high: int, splay: bool = True) -> int:
+        if low > high:
+            return 0
+        return self._count_below(high + 1, splay) - self._count_below(low, splay)
+
+    def _count_below(self, key: int, splay: bool = True) -> int:
+        # Jumlah node dengan key < `key`, memakai ukuran subtree kiri
+        count = 0
+        last: Optional[Node] = None
+        current = self.root
+        while current is not None:
+            last = current
+            if current.key < key:
+                count += 1 + (current.left.size if current.left is not None else 0)
+                current = current.right
+            else:
+                current = current.left
+        if splay and last is not None:
+            self._splay(last)
+        return count
+
+    def _splay_near(self, key: int) -> None:
+        # Splay node terakhir di jalur pencarian key, menjaga biaya amortized
+        last: Optional[Node] = None
+        current = self.root
+        while current is not None:
+            last = current
+            if key < current.key:
+                current = current.left
+            elif key > current.key:
+                current = current.right
+            else:
+                break
+        if last is not None:
+            self._splay(last)
+
     def inorder_traversal(self) -> List[Node]:
-        result: List[Node] = []
-        self._inorder_helper(self.root, result)
-        return result
+        return list(self.iter_inorder())
+
+    def iter_inorder(self) -> Iterator[Node]:
+        # Jalan lewat pointer parent: tanpa rekursi dan tanpa stack,
+        # memori tambahan O(1) berapapun kedalaman tree.
+        # Tree tidak boleh diubah (termasuk search) selama iterasi berjalan.
+        node = self.root
+        if node is None:
+            return
+        while node.left is not None:
+            node = node.left
+        while node is not None:
+            yield node
+            if node.right is not None:
+                node = node.right
+                while node.left is not None:
+                    node = node.left
+            else:
+                child = node
+                node = node.parent
+                while node is not None and child is node.right:
+                    child = node
+                    node = node.parent
 
     def get_tree_structure(self) -> str:
-        if self.root is None:
-            return "Tree is empty\n"
-        lines: List[str] = []
-        self._tree_structure_helper(self.root, "", True, lines)
-        return "".join(lines)
+        return "".join(self.iter_tree_structure())
+
+    def iter_tree_structure(self) -> Iterator[str]:
+        return iter_structure(self.root, self._structure_children, self._format_structure_node)
 
 
     def _replace(self, u: Node, v: Optional[Node]) -> None:
         if u.parent is None:
             self.root = v
-        elif u == u.parent.left:
+        elif u is u.parent.left:
             u.parent.left = v
         else:
             u.parent.right = v
         if v:
             v.parent = u.parent
 
+    @staticmethod
+    def _resize_upward(node: Optional[Node]) -> None:
+        while node is not None:
+            node.size = 1 + (node.left.size if node.left is not None else 0) + (
+                node.right.size if node.right is not None else 0
+            )
+            node = node.parent
+
     def _minimum(self, node: Node) -> Node:
         current = node
         while current.left:
             current = current.left
         return current
 
-    def _inorder_helper(self, node: Optional[Node], result: List[Node]) -> None:
-        if node is None:
-            return
-        self._inorder_helper(node.left, result)
-        result.append(node)
-        self._inorder_helper(node.right, result)
+    @staticmethod
+    def _structure_children(node: Node) -> List[Node]:
+        return [child for child in (node.left, node.right) if child is not None]
 
-    def _tree_structure_helper(
-        self, node: Optional[Node], prefix: str, is_tail: bool, result: List[str]
-    ) -> None:
-        if node is None:
-            return
-        connector = "└── " if is_tail else "├── "
-        result.append(prefix + connector + f"{node.ip_address} (Packet: {node.data_packet})\n")
-        children: List[Optional[Node]] = [child for child in (node.left, node.right) if child]
-        for index, child in enumerate(children):
-            next_prefix = prefix + ("    " if is_tail else "│   ")
-            self._tree_structure_helper(child, next_prefix, index == len(children) - 1, result)
+    @staticmethod
+    def _format_structure_node(node: Node) -> str:
+        return f"{node.ip_address} (Packet: {node.data_packet})\n"
 
 
     @classmethod
     def from_iterable(cls, items: Iterable[tuple[str, str | None]]) -> "SplayTree":
+        # Bulk build O(n): sort + dedupe sekali, lalu rakit BST seimbang langsung
         tree = cls()
-        for ip_address, packet in items:
-            tree.insert(ip_address, packet)
+        keys, packets = sorted_unique_items(items)
+        with paused_gc():
+            tree._load_sorted(keys, build_records(packets))
         return tree
+
+    def _load_sorted(self, keys: Sequence[int], records: Sequence[DeviceRecord]) -> None:
+        # Node dibuat lewat __new__ dan slot diisi langsung: __init__ (parse
+        # IP, hitung size) tidak dibutuhkan karena key dan bentuk tree sudah pasti
+        node_class = self.node_class
+        new = node_class.__new__
+        count = len(keys)
+        root, left, right, parent, sizes = balanced_links(count)
+        tracks_parent = self.tracks_parent
+        # GC dijeda oleh pemanggil (from_iterable, load snapshot, import)
+        nodes = [new(node_class) for _ in range(count)]
+        for index, node in enumerate(nodes):
+            node.key = keys[index]
+            node.record = records[index]
+            node.size = sizes[index]
+            child = left[index]
+            node.left = nodes[child] if child != NIL else None
+            child = right[index]
+            node.right = nodes[child] if child != NIL else None
+            if tracks_parent:
+                owner = parent[index]
+                node.parent = nodes[owner] if owner != NIL else None
+        self.root = nodes[root] if nodes else None
+        self.size = count
+        if self._index is not None:
+            self._index = dict(zip(keys, nodes))
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Callable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def iter_structure(
+    root: Optional[T],
+    children: Callable[[T], List[T]],
+    label: Callable[[T], str],
+) -> Iterator[str]:
+    """
+    Baris-baris gambar tree bergaya `tree` (├── / └──), satu node per baris.
+
+    Dipakai semua engine: node boleh objek atau id array, cukup beri fungsi
+    anak dan label. Tanpa rekursi, jadi tree miring sedalam apapun aman.
+    """
+    if root is None:
+        yield "Tree is empty\n"
+        return
+    yield "└── " + label(root)
+    # segments[i] adalah potongan prefix untuk level i, stack berisi
+    # [anak-anak node, index anak berikutnya] per level yang sedang dibuka
+    segments: List[str] = ["    "]
+    stack: List[list] = [[children(root), 0]]
+    while stack:
+        frame = stack[-1]
+        nodes, index = frame
+        if index == len(nodes):
+            stack.pop()
+            segments.pop()
+            continue
+        frame[1] = index + 1
+        child = nodes[index]
+        is_tail = index == len(nodes) - 1
+        connector = "└── " if is_tail else "├── "
+        yield "".join(segments) + connector + label(child)
+        segments.append("    " if is_tail else "│   ")
+        stack.append([children(child), 0])
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import ClassVar, Iterator, List, Optional, Type
+
+from .metrics import measured
+from .nodes import BaseNode
+from .records import DeviceRecord
+from .splay_tree import SplayTree
+
+
+def _resize(node: BaseNode) -> None:
+    node.size = 1 + (node.left.size if node.left is not None else 0) + (
+        node.right.size if node.right is not None else 0
+    )
+
+
+@dataclass
+class TopDownSplayTree(SplayTree):
+    """
+    Splay tree varian top-down (Sleator-Tarjan).
+
+    Splay dilakukan sekali jalan dari root sambil memecah tree menjadi
+    subtree kiri dan kanan, lalu dirakit ulang di akhir. Node tidak
+    menyimpan pointer parent. Pencarian yang gagal tetap men-splay node
+    terakhir yang dikunjungi ke root, kecuali jika tree memakai hash index
+    (miss dijawab index tanpa menyentuh tree).
+    """
+
+    node_class: ClassVar[Type[BaseNode]] = BaseNode  # type: ignore[assignment]
+    tracks_parent: ClassVar[bool] = False
+
+
+    def _splay_key(self, key: int) -> int:
+        # Mengembalikan jumlah node yang dilewati (kedalaman key atau ujung jalurnya)
+        current = self.root
+        if current is None:
+            return 0
+        # Ujung kanan subtree kiri dan ujung kiri subtree kanan yang sedang dirakit
+        left_root: Optional[BaseNode] = None
+        left_max: Optional[BaseNode] = None
+        right_root: Optional[BaseNode] = None
+        right_min: Optional[BaseNode] = None
+        # Node yang di-link, ukuran subtree-nya dihitung ulang setelah dirakit
+        left_links: List[BaseNode] = []
+        right_links: List[BaseNode] = []
+        rotations = 0
+        # 1 jika splay berhenti tepat setelah rotasi, tanpa link
+        unlinked = 0
+
+        while True:
+            if key < current.key:
+                child = current.left
+                if child is None:
+                    break
+                if key < child.key:
+                    # ZIG-ZIG : rotasi kanan dulu
+                    current.left = child.right
+                    child.right = current
+                    _resize(current)
+                    current = child
+                    rotations += 1
+                    if current.left is None:
+                        unlinked = 1
+                        break
+                # Link ke subtree kanan
+                if right_min is None:
+                    right_root = current
+                else:
+                    right_min.left = current
+                right_min = current
+                right_links.append(current)
+                current = current.left
+            elif key > current.key:
+                child = current.right
+                if child is None:
+                    break
+                if key > child.key:
+                    # ZAG-ZAG : rotasi kiri dulu
+                    current.right = child.left
+                    child.left = current
+                    _resize(current)
+                    current = child
+                    rotations += 1
+                    if current.right is None:
+                        unlinked = 1
+                        break
+                # Link ke subtree kiri
+                if left_max is None:
+                    left_root = current
+                else:
+                    left_max.right = current
+                left_max = current
+                left_links.append(current)
+                current = current.right
+            else:
+                break
+
+        # Rakit ulang: subtree kiri + node + subtree kanan
+        if left_max is not None:
+            left_max.right = current.left
+            current.left = left_root
+        if right_min is not None:
+            right_min.left = current.right
+            current.right = right_root
+        # Link terakhir adalah yang terdalam, jadi dihitung ulang dari belakang
+        for node in reversed(left_links):
+            _resize(node)
+        for node in reversed(right_links):
+            _resize(node)
+        _resize(current)
+        self.root = current
+
+        # Setiap langkah melewati satu node (link) atau dua (rotasi + link)
+        links = len(left_links) + len(right_links)
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.comparisons += links + rotations + 1
+            metrics.zig_zig += rotations
+            metrics.zig += links - rotations + unlinked
+        return links + rotations + 1
+
+    def _splay(self, node: BaseNode) -> None:  # type: ignore[override]
+        self._splay_key(node.key)
+
+    @measured("insert_record")
+    def insert_record(self, key: int, record: DeviceRecord) -> bool:
+        if self.journal is not None:
+            self.journal.log_insert(key, record)
+        self._splay_key(key)
+        root = self.root
+        if root is not None and root.key == key:
+            root.record = record
+            return False
+
+        node = self.node_class.from_record(key, record)
+        if self._index is not None:
+            self._index[key] = node
+        if root is not None:
+            if key < root.key:
+                node.left = root.left
+                node.right = root
+                root.left = None
+            else:
+                node.right = root.right
+                node.left = root
+                root.right = None
+            _resize(root)
+            _resize(node)
+        self.root = node
+        self.size += 1
+        return True
+
+    @measured("search")
+    def search(self, ip_address: str) -> Optional[BaseNode]:  # type: ignore[override]
+        self.search_count += 1
+        key = self._lookup_key(ip_address)
+        if key is None:
+            return None
+        if self._index is not None:
+            node = self._index.get(key)
+            if node is not None:
+                self._splay_hit(node)
+            return node
+        depth = self._splay_key(key)
+        if self.metrics is not None:
+            self.metrics.depth_histogram[depth] += 1
+        root = self.root
+        if root is not None and root.key == key:
+            return root
+        return None
+
+    @measured("delete")
+    def delete(self, ip_address: str) -> bool:
+        # Node yang dihapus harus ada di root, apapun index_policy-nya
+        self.search_count += 1
+        key = self._lookup_key(ip_address)
+        if key is None or (self._index is not None and key not in self._index):
+            return False
+        depth = self._splay_key(key)
+        # Pencarian di dalam delete ikut histogram, sama seperti SplayTree.delete lewat search
+        if self.metrics is not None:
+            self.metrics.depth_histogram[depth] += 1
+        root = self.root
+        if root is None or root.key != key:
+            return False
+
+        if self.journal is not None:
+            self.journal.log_delete(root.key)
+        if self._index is not None:
+            del self._index[key]
+        if root.left is None:
+            self.root = root.right
+        else:
+            # Max dari subtree kiri naik ke root dan tidak punya anak kanan
+            right = root.right
+            self.root = root.left
+            self._splay_key(root.key)
+            self.root.right = right
+            _resize(self.root)
+        root.left = root.right = None
+        root.size = 1
+
+        self.size -= 1
+        return True
+
+    def iter_inorder(self) -> Iterator[BaseNode]:  # type: ignore[override]
+        # Tanpa pointer parent, jadi pakai stack eksplisit sedalam path saat ini
+        stack: List[BaseNode] = []
+        current = self.root
+        while stack or current is not None:
+            while current is not None:
+                stack.append(current)
+                current = current.left
+            current = stack.pop()
+            yield current
+            current = current.right
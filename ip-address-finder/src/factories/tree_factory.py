@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Protocol
+from typing import Optional, Protocol
 
+from ..datastructures.bounded_splay_tree import BoundedSplayTree
 from ..datastructures.nodes import Node
-from ..datastructures.splay_tree import SplayTree
+from ..datastructures.splay_tree import IndexPolicy, SplayTree
+from ..datastructures.top_down_splay_tree import TopDownSplayTree
 
 
 class TreeFactory(Protocol):
@@ -14,8 +16,44 @@ class TreeFactory(Protocol):
 @dataclass
 class DefaultTreeFactory:
 
+    # None = tanpa hash index
+    index_policy: Optional[IndexPolicy] = None
+
+    def create_tree(self) -> SplayTree:
+        return SplayTree(index_policy=self.index_policy)
+
+
+@dataclass
+class TopDownTreeFactory:
+
+    index_policy: Optional[IndexPolicy] = None
+
+    def create_tree(self) -> SplayTree:
+        return TopDownSplayTree(index_policy=self.index_policy)
+
+
+@dataclass
+class BoundedTreeFactory:
+
+    max_entries: int
+    # TTL default per entri dalam detik; None = tanpa TTL
+    ttl: Optional[float] = None
+    index_policy: Optional[IndexPolicy] = None
+
+    def create_tree(self) -> SplayTree:
+        return BoundedSplayTree(index_policy=self.index_policy, max_entries=self.max_entries, ttl=self.ttl)
+
+
+@dataclass
+class InstrumentedTreeFactory:
+
+    # Membungkus factory lain; setiap tree yang dibuat langsung memakai metrics
+    factory: TreeFactory
+
     def create_tree(self) -> SplayTree:
-        return SplayTree()
+        tree = self.factory.create_tree()
+        tree.enable_metrics()
+        return tree
 
 
 @dataclass
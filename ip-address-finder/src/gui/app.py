@@ -1,11 +1,11 @@
 from __future__ import annotations
 
+import os
 import random
 import socket
 import tkinter as tk
-from dataclasses import dataclass
-from tkinter import messagebox, scrolledtext, ttk
-from typing import Mapping, MutableMapping
+from tkinter import filedialog, messagebox, scrolledtext, ttk
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from ..config.settings import (
     DEFAULT_BASE_IP,
@@ -13,31 +13,66 @@ from ..config.settings import (
     DEFAULT_PACKET_PREFIX,
     GUI_STYLE,
     RANDOM_DEVICE_COUNT,
+    REFRESH_DEBOUNCE_MS,
+    SNAPSHOT_EXTENSION,
+    VIRTUAL_ROW_HEIGHT,
+    WORKER_POLL_MS,
 )
-from ..datastructures.nodes import Node
+from ..datastructures.keys import parse_cidr
+from ..datastructures.routing_table import Route, RoutingTable
 from ..datastructures.splay_tree import SplayTree
 from ..factories.tree_factory import TreeFactory
+from ..net.address import format_ip, parse_ip
+from ..net.ipv4 import IPParseError
+from ..persistence.snapshot import SnapshotReader, save_snapshot, tree_rows
+from ..persistence.wal import DurableStore
+from ..pipeline.transfer import ImportReport, export_devices, import_devices
+from .widgets import (
+    DeviceRow,
+    LazyTreeView,
+    TreeRow,
+    VirtualDeviceList,
+    snapshot_children,
+    snapshot_open_tree,
+)
+from .worker import JobContext, JobHandle, TreeJob, TreeWorker
 
 
-@dataclass
-class DeviceInfo:
-    name: str
-    node: Node
+DEVICE_FILE_TYPES = [("CSV", "*.csv"), ("JSON Lines", "*.jsonl *.ndjson"), ("Semua file", "*")]
+# Error import yang ditulis ke log aktivitas; sisanya hanya dihitung
+IMPORT_LOGGED_ERRORS = 10
+# Nama yang ditampilkan untuk device tanpa nama
+UNKNOWN_DEVICE_NAME = "Device Gak Dikenal"
+# Hasil job pencarian: (ip, packet, nama) device, atau route longest-prefix match
+SearchResult = Tuple[Optional[Tuple[str, Optional[str], Optional[str]]], Optional[Route]]
 
 
 class IPAddressFinderGUI:
-    def __init__(self, root: tk.Tk, factory: TreeFactory) -> None:
+    def __init__(self, root: tk.Tk, factory: TreeFactory, snapshot_path: Optional[str] = None) -> None:
         self.root = root
         self.root.title("Pencarian IP Address - Splay Tree")
         self.root.geometry("950x850")
         self.root.resizable(True, True)
 
-        self.splay_tree: SplayTree = factory.create_tree()
-        self.device_names: MutableMapping[str, str] = {}
+        self.factory = factory
+        # Tree dimiliki thread worker; UI hanya mengirim job lewat self.worker
+        self.worker = TreeWorker(self.root, factory.create_tree(), WORKER_POLL_MS)
+        # Route CIDR hanya di memori; seperti tree, hanya diakses dari job worker
+        self.routes = RoutingTable()
+        self._active_job: Optional[JobHandle] = None
+        self.snapshot_path = snapshot_path
+        # Dengan --snapshot, setiap perubahan dicatat di write-ahead log
+        self.store = DurableStore(snapshot_path) if snapshot_path is not None else None
+        # View yang perlu dirender ulang saat tab-nya terlihat
+        self._dirty_views: Set[str] = set()
+        self._refresh_job: Optional[str] = None
 
         self._setup_gui()
         self._load_localhost_info()
         self._refresh_views()
+        self.root.protocol("WM_DELETE_WINDOW", self._handle_close)
+        if self.store is not None:
+            self._recover_store(self.store)
 
 
     def _setup_gui(self) -> None:
@@ -133,6 +168,7 @@ class IPAddressFinderGUI:
         self._build_search_section(left_panel)
         self._build_update_section(left_panel)
         self._build_delete_section(left_panel)
+        self._build_route_section(left_panel)
         self._build_quick_actions(left_panel)
 
     def _build_add_device_section(self, parent: tk.Widget) -> None:
@@ -227,6 +263,39 @@ class IPAddressFinderGUI:
             cursor="hand2",
         ).pack(fill=tk.X, pady=(5, 0))
 
+    def _build_route_section(self, parent: tk.Widget) -> None:
+        style = GUI_STYLE
+        frame = tk.LabelFrame(parent, text="Routing Table", font=("Arial", 9, "bold"))
+        frame.pack(fill=tk.X, pady=(0, 10))
+
+        tk.Label(frame, text="CIDR (mis. 10.0.0.0/8):").pack(anchor="w", pady=(5, 0))
+        self.route_cidr_entry = tk.Entry(frame, width=25)
+        self.route_cidr_entry.pack(fill=tk.X, pady=(0, 5))
+
+        tk.Label(frame, text="Data Paket:").pack(anchor="w")
+        self.route_packet_entry = tk.Entry(frame, width=25)
+        self.route_packet_entry.pack(fill=tk.X, pady=(0, 5))
+
+        tk.Button(
+            frame,
+            text="➕ Tambah Route",
+            command=self._handle_add_route,
+            bg=style.button_add,
+            fg=GUI_STYLE.foreground,
+            font=("Arial", 9, "bold"),
+            cursor="hand2",
+        ).pack(fill=tk.X, pady=(5, 0))
+
+        tk.Button(
+            frame,
+            text="🗑️ Hapus Route",
+            command=self._handle_delete_route,
+            bg=style.button_delete,
+            fg=GUI_STYLE.foreground,
+            font=("Arial", 9, "bold"),
+            cursor="hand2",
+        ).pack(fill=tk.X, pady=(5, 0))
+
     def _build_quick_actions(self, parent: tk.Widget) -> None:
         style = GUI_STYLE
         frame = tk.LabelFrame(parent, text="Aksi Cepat", font=("Arial", 9, "bold"))
@@ -262,6 +331,46 @@ class IPAddressFinderGUI:
             cursor="hand2",
         ).pack(fill=tk.X, pady=2)
 
+        tk.Button(
+            frame,
+            text="💾 Simpan Snapshot",
+            command=self._handle_save_snapshot,
+            bg=style.button_snapshot,
+            fg=GUI_STYLE.foreground,
+            font=("Arial", 9, "bold"),
+            cursor="hand2",
+        ).pack(fill=tk.X, pady=2)
+
+        tk.Button(
+            frame,
+            text="📂 Muat Snapshot",
+            command=self._handle_load_snapshot,
+            bg=style.button_snapshot,
+            fg=GUI_STYLE.foreground,
+            font=("Arial", 9, "bold"),
+            cursor="hand2",
+        ).pack(fill=tk.X, pady=2)
+
+        tk.Button(
+            frame,
+            text="📥 Import CSV/JSONL",
+            command=self._handle_import_devices,
+            bg=style.button_transfer,
+            fg=GUI_STYLE.foreground,
+            font=("Arial", 9, "bold"),
+            cursor="hand2",
+        ).pack(fill=tk.X, pady=2)
+
+        tk.Button(
+            frame,
+            text="📤 Export CSV/JSONL",
+            command=self._handle_export_devices,
+            bg=style.button_transfer,
+            fg=GUI_STYLE.foreground,
+            font=("Arial", 9, "bold"),
+            cursor="hand2",
+        ).pack(fill=tk.X, pady=2)
+
     def _build_right_panel(self, parent: tk.Widget) -> None:
         style = GUI_STYLE
         right_panel = tk.Frame(parent)
@@ -269,22 +378,24 @@ class IPAddressFinderGUI:
 
         notebook = ttk.Notebook(right_panel)
         notebook.pack(fill=tk.BOTH, expand=True)
+        notebook.bind("<<NotebookTabChanged>>", lambda event: self._flush_refresh())
+        self.notebook = notebook
+
+        ttk.Style(self.root).configure("Treeview", rowheight=VIRTUAL_ROW_HEIGHT)
 
-        self.tree_display = scrolledtext.ScrolledText(
+        self.tree_view = LazyTreeView(
             notebook,
-            wrap=tk.WORD,
-            font=("Courier New", 9),
-            bg=style.tree_background,
+            fetch_open_tree=self._fetch_open_tree,
+            fetch_children=self._fetch_tree_children,
         )
-        notebook.add(self.tree_display, text="🌳 Struktur Tree")
+        notebook.add(self.tree_view, text="🌳 Struktur Tree")
 
-        self.device_list_display = scrolledtext.ScrolledText(
+        self.device_list = VirtualDeviceList(
             notebook,
-            wrap=tk.WORD,
-            font=("Courier New", 9),
-            bg=style.tree_background,
+            fetch_rows=self._fetch_device_rows,
+            row_height=VIRTUAL_ROW_HEIGHT,
         )
-        notebook.add(self.device_list_display, text="📋 Daftar Device")
+        notebook.add(self.device_list, text="📋 Daftar Device")
 
         self.log_display = scrolledtext.ScrolledText(
             notebook,
@@ -295,15 +406,28 @@ class IPAddressFinderGUI:
         notebook.add(self.log_display, text="📝 Log Aktivitas")
 
     def _build_status_bar(self) -> None:
+        status_frame = tk.Frame(self.root, bd=1, relief=tk.SUNKEN, bg=GUI_STYLE.status_background)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+
+        # Progress dan tombol batal untuk job panjang di thread worker
+        self.cancel_button = tk.Button(
+            status_frame,
+            text="Batalkan",
+            command=self._handle_cancel_job,
+            state=tk.DISABLED,
+            cursor="hand2",
+        )
+        self.cancel_button.pack(side=tk.RIGHT, padx=2)
+        self.progress_bar = ttk.Progressbar(status_frame, length=160, mode="determinate")
+        self.progress_bar.pack(side=tk.RIGHT, padx=2)
+
         self.status_bar = tk.Label(
-            self.root,
+            status_frame,
             text="Siap",
-            bd=1,
-            relief=tk.SUNKEN,
             anchor=tk.W,
             bg=GUI_STYLE.status_background,
         )
-        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
 
 
     def _handle_add_device(self) -> None:
@@ -314,29 +438,30 @@ class IPAddressFinderGUI:
         if not ip_address:
             messagebox.showwarning("Peringatan", "Wajib masukin IP Address dulu!")
             return
-        if not self._validate_ip(ip_address):
-            messagebox.showerror("Error", "Format IP Address nya salah!")
+        ip_address = self._parse_ip(ip_address, "IP Address")
+        if ip_address is None:
             return
 
         if not device_name:
-            device_name = f"{DEFAULT_DEVICE_PREFIX}{ip_address.split('.')[-1]}"
+            # Oktet terakhir IPv4 atau grup terakhir IPv6 (kosong untuk akhiran ::)
+            separator = ":" if ":" in ip_address else "."
+            device_name = f"{DEFAULT_DEVICE_PREFIX}{ip_address.split(separator)[-1] or 0}"
         if not packet:
             packet = f"{DEFAULT_PACKET_PREFIX}{random.randint(1000, 9999)}"
 
-        is_new = self.splay_tree.insert(ip_address, packet)
-        self.device_names[ip_address] = device_name
-
-        if is_new:
-            self._log_message(f"Device baru ditambahkan: {device_name} ({ip_address}) - Packet: {packet}")
-            messagebox.showinfo("Berhasil", f"Device {device_name} udah ditambahin!")
-        else:
-            self._log_message(f"Data diupdate: {device_name} ({ip_address}) - Packet: {packet}")
-            messagebox.showinfo("Info", f"IP {ip_address} udah ada, jadi cuma update data packet aja!")
+        def done(is_new: bool) -> None:
+            if is_new:
+                self._log_message(f"Device baru ditambahkan: {device_name} ({ip_address}) - Packet: {packet}")
+                messagebox.showinfo("Berhasil", f"Device {device_name} udah ditambahin!")
+            else:
+                self._log_message(f"Data diupdate: {device_name} ({ip_address}) - Packet: {packet}")
+                messagebox.showinfo("Info", f"IP {ip_address} udah ada, jadi cuma update data packet aja!")
+            self._refresh_views()
 
+        self._submit(lambda tree, context: tree.insert(ip_address, packet, device_name), done)
         self.device_name_entry.delete(0, tk.END)
         self.ip_entry.delete(0, tk.END)
         self.packet_entry.delete(0, tk.END)
-        self._refresh_views()
 
     def _handle_search_device(self) -> None:
         ip_address = self.search_entry.get().strip()
@@ -344,27 +469,54 @@ class IPAddressFinderGUI:
             messagebox.showwarning("Peringatan", "Isi IP Address dulu ya!")
             return
 
-        node = self.splay_tree.search(ip_address)
-        if node:
-            device_name = self.device_names.get(ip_address, "Device Gak Dikenal")
-            self._log_message(f"Ketemu nih: {device_name} ({ip_address}) - Packet: {node.data_packet}")
-            messagebox.showinfo(
-                "Hasil Pencarian",
-                "\n".join(
-                    [
-                        "Device Ketemu!",
-                        f"Nama: {device_name}",
-                        f"IP Address: {node.ip_address}",
-                        f"Data Packet: {node.data_packet}",
-                        "",
-                        "Catatan: Device udah dipindah ke root biar lebih cepet dicari nanti.",
-                    ]
-                ),
-            )
+        def job(tree: SplayTree, context: JobContext) -> SearchResult:
+            # Kembalikan salinan field, bukan node yang masih dimiliki worker.
+            # Route (immutable) hanya dicari jika device tidak ada.
+            node = tree.search(ip_address)
+            if node is not None:
+                return (node.ip_address, node.data_packet, node.name), None
+            return None, self.routes.lookup(ip_address)
+
+        def done(result: SearchResult) -> None:
+            found, route = result
+            if found:
+                found_ip, data_packet, device_name = found
+                device_name = device_name or UNKNOWN_DEVICE_NAME
+                self._log_message(f"Ketemu nih: {device_name} ({ip_address}) - Packet: {data_packet}")
+                messagebox.showinfo(
+                    "Hasil Pencarian",
+                    "\n".join(
+                        [
+                            "Device Ketemu!",
+                            f"Nama: {device_name}",
+                            f"IP Address: {found_ip}",
+                            f"Data Packet: {data_packet}",
+                            "",
+                            "Catatan: Device udah dipindah ke root biar lebih cepet dicari nanti.",
+                        ]
+                    ),
+                )
+            elif route is not None:
+                self._log_message(
+                    f"IP {ip_address} gak terdaftar, lewat route {route.cidr} - Packet: {route.data_packet}"
+                )
+                messagebox.showinfo(
+                    "Hasil Pencarian",
+                    "\n".join(
+                        [
+                            "Device gak ketemu, tapi ada route yang cocok.",
+                            f"Route: {route.cidr}",
+                            f"Data Packet: {route.data_packet or '-'}",
+                        ]
+                    ),
+                )
+            else:
+                self._log_message(f"Gagal: IP {ip_address} gak ketemu")
+                messagebox.showwarning("Gak Ketemu", f"IP Address {ip_address} gak ada di jaringan!")
+            # Counter pencarian tetap berubah walau gagal
             self._refresh_views()
-        else:
-            self._log_message(f"Gagal: IP {ip_address} gak ketemu")
-            messagebox.showwarning("Gak Ketemu", f"IP Address {ip_address} gak ada di jaringan!")
+
+        self._submit(job, done)
         self.search_entry.delete(0, tk.END)
 
     def _handle_delete_device(self) -> None:
@@ -372,22 +524,34 @@ class IPAddressFinderGUI:
         if not ip_address:
             messagebox.showwarning("Peringatan", "Isi IP Address dulu ya!")
             return
+        ip_address = self._canonical_ip(ip_address)
+        self.delete_entry.delete(0, tk.END)
 
-        device_name = self.device_names.get(ip_address, "Device Gak Dikenal")
-        if not messagebox.askyesno("Konfirmasi Hapus", f"Yakin mau hapus {device_name} ({ip_address})?"):
-            return
+        def lookup(tree: SplayTree, context: JobContext) -> Optional[str]:
+            # Nama untuk dialog konfirmasi; tanpa splay dan tanpa menambah counter
+            node = tree.peek(ip_address)
+            return None if node is None else node.name or UNKNOWN_DEVICE_NAME
 
-        success = self.splay_tree.delete(ip_address)
-        if success:
-            self.device_names.pop(ip_address, None)
-            self._log_message(f"Dihapus: {device_name} ({ip_address})")
-            messagebox.showinfo("Berhasil", f"Device {device_name} udah dihapus!")
+        def confirm(device_name: Optional[str]) -> None:
+            if device_name is None:
+                self._log_message(f"Gagal hapus: IP {ip_address} gak ketemu")
+                messagebox.showwarning("Gak Ketemu", f"IP Address {ip_address} gak ada!")
+                return
+            if messagebox.askyesno("Konfirmasi Hapus", f"Yakin mau hapus {device_name} ({ip_address})?"):
+                self._submit(
+                    lambda tree, context: tree.delete(ip_address), lambda success: deleted(success, device_name)
+                )
+
+        def deleted(success: bool, device_name: str) -> None:
+            if success:
+                self._log_message(f"Dihapus: {device_name} ({ip_address})")
+                messagebox.showinfo("Berhasil", f"Device {device_name} udah dihapus!")
+            else:
+                self._log_message(f"Gagal hapus: IP {ip_address} gak ketemu")
+                messagebox.showwarning("Gak Ketemu", f"IP Address {ip_address} gak ada!")
             self._refresh_views()
-        else:
-            self._log_message(f"Gagal hapus: IP {ip_address} gak ketemu")
-            messagebox.showwarning("Gak Ketemu", f"IP Address {ip_address} gak ada!")
 
-        self.delete_entry.delete(0, tk.END)
+        self._submit(lookup, confirm)
 
     def _handle_update_device(self) -> None:
         old_ip = self.update_ip_entry.get().strip()
@@ -403,94 +567,357 @@ class IPAddressFinderGUI:
             return
         
         # Validasi format IP baru jika diisi
-        if new_ip and not self._validate_ip(new_ip):
-            messagebox.showerror("Error", "Format IP Address Baru salah!")
-            return
-        
-        # Cek apakah IP baru sudah ada (jika berbeda dari IP lama)
-        if new_ip and new_ip != old_ip:
-            existing = self.splay_tree.search(new_ip)
-            if existing:
+        if new_ip:
+            new_ip = self._parse_ip(new_ip, "IP Address Baru")
+            if new_ip is None:
+                return
+        old_ip = self._canonical_ip(old_ip)
+
+        def job(tree: SplayTree, context: JobContext) -> Optional[tuple]:
+            # Cek apakah IP baru sudah ada (jika berbeda dari IP lama)
+            if new_ip and new_ip != old_ip and tree.search(new_ip):
+                return None
+            node = tree.peek(old_ip)
+            device_name = node.name if node is not None else None
+            return tree.update(old_ip, new_ip, new_packet) + (device_name or UNKNOWN_DEVICE_NAME,)
+
+        def done(result: Optional[tuple]) -> None:
+            if result is None:
                 messagebox.showerror("Error", f"IP Address {new_ip} sudah digunakan device lain!")
+                self._refresh_views()
                 return
 
-        device_name = self.device_names.get(old_ip, "Device Gak Dikenal")
-        success, old_ip_changed, old_packet = self.splay_tree.update(old_ip, new_ip, new_packet)
-
-        if success:
-            # Update device_names jika IP berubah
-            if old_ip_changed and new_ip:
-                self.device_names[new_ip] = device_name
-                self.device_names.pop(old_ip, None)
-            
-            # Buat pesan hasil
-            changes = []
-            if old_ip_changed:
-                changes.append(f"IP: {old_ip} → {new_ip}")
-            if new_packet:
-                changes.append(f"Packet: {old_packet} → {new_packet}")
-            
-            change_text = "\n".join(changes)
-            self._log_message(f"Updated: {device_name} - {', '.join(changes)}")
-            messagebox.showinfo(
-                "Berhasil",
-                f"Device {device_name} udah diupdate!\n\n{change_text}"
-            )
+            success, old_ip_changed, old_packet, device_name = result
+            if success:
+                # Buat pesan hasil
+                changes = []
+                if old_ip_changed:
+                    changes.append(f"IP: {old_ip} → {new_ip}")
+                if new_packet:
+                    changes.append(f"Packet: {old_packet} → {new_packet}")
+
+                change_text = "\n".join(changes)
+                self._log_message(f"Updated: {device_name} - {', '.join(changes)}")
+                messagebox.showinfo(
+                    "Berhasil",
+                    f"Device {device_name} udah diupdate!\n\n{change_text}"
+                )
+            else:
+                self._log_message(f"Gagal update: IP {old_ip} gak ketemu")
+                messagebox.showwarning("Gak Ketemu", f"IP Address {old_ip} gak ada di jaringan!")
             self._refresh_views()
-        else:
-            self._log_message(f"Gagal update: IP {old_ip} gak ketemu")
-            messagebox.showwarning("Gak Ketemu", f"IP Address {old_ip} gak ada di jaringan!")
 
+        self._submit(job, done)
         self.update_ip_entry.delete(0, tk.END)
         self.update_new_ip_entry.delete(0, tk.END)
         self.update_packet_entry.delete(0, tk.END)
 
-    def _handle_show_all_devices(self) -> None:
-        nodes = self.splay_tree.inorder_traversal()
-        if not nodes:
-            messagebox.showinfo("Daftar Device", "Belum ada device yang terdaftar!")
+    def _handle_add_route(self) -> None:
+        cidr = self._parse_cidr(self.route_cidr_entry.get().strip())
+        if cidr is None:
             return
+        packet = self.route_packet_entry.get().strip() or None
 
-        lines = [f"Jumlah Device: {len(nodes)}", "=" * 50, ""]
-        for index, node in enumerate(nodes, start=1):
-            device_name = self.device_names.get(node.ip_address, "Device Gak Dikenal")
-            lines.extend(
-                [
-                    f"{index}. {device_name}",
-                    f"   IP: {node.ip_address}",
-                    f"   Packet: {node.data_packet}",
-                    "",
-                ]
-            )
+        def done(is_new: bool) -> None:
+            action = "Route baru ditambahkan" if is_new else "Route diupdate"
+            self._log_message(f"{action}: {cidr} - Packet: {packet or '-'}")
+
+        self._submit(lambda tree, context: self.routes.insert(cidr, packet), done)
+        self.route_cidr_entry.delete(0, tk.END)
+        self.route_packet_entry.delete(0, tk.END)
+
+    def _handle_delete_route(self) -> None:
+        cidr = self._parse_cidr(self.route_cidr_entry.get().strip())
+        if cidr is None:
+            return
 
-        self._show_message_window("Daftar Semua Device (Urut berdasar IP)", "\n".join(lines))
-        self._log_message(f"Menampilkan {len(nodes)} device")
+        def done(success: bool) -> None:
+            if success:
+                self._log_message(f"Route dihapus: {cidr}")
+            else:
+                messagebox.showwarning("Gak Ketemu", f"Route {cidr} gak ada di routing table!")
+
+        self._submit(lambda tree, context: self.routes.delete(cidr), done)
+        self.route_cidr_entry.delete(0, tk.END)
+
+    def _handle_show_all_devices(self) -> None:
+        def done(size: int) -> None:
+            if not size:
+                messagebox.showinfo("Daftar Device", "Belum ada device yang terdaftar!")
+                return
+
+            window = tk.Toplevel(self.root)
+            window.title("Daftar Semua Device (Urut berdasar IP)")
+            window.geometry("560x400")
+            device_list = VirtualDeviceList(
+                window,
+                fetch_rows=self._fetch_device_rows,
+                row_height=VIRTUAL_ROW_HEIGHT,
+            )
+            device_list.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+            tk.Button(
+                window,
+                text="Tutup",
+                command=window.destroy,
+                bg=GUI_STYLE.button_search,
+                fg=GUI_STYLE.foreground,
+                font=("Arial", 10, "bold"),
+            ).pack(pady=5)
+            device_list.refresh()
+            self._log_message(f"Menampilkan {size} device")
+
+        self._submit(lambda tree, context: tree.size, done)
 
     def _handle_generate_random_devices(self) -> None:
-        generated = 0
-        for index in range(RANDOM_DEVICE_COUNT):
-            ip_address = f"{DEFAULT_BASE_IP}{random.randint(1, 254)}"
-            packet = f"{DEFAULT_PACKET_PREFIX}{random.randint(1000, 9999)}"
-            device_name = f"{DEFAULT_DEVICE_PREFIX}{index + 1}"
-
-            if self.splay_tree.insert(ip_address, packet):
-                self.device_names[ip_address] = device_name
-                generated += 1
-        if generated:
-            self._log_message(f"Dibuat {generated} device random")
-            messagebox.showinfo("Berhasil", f"Berhasil bikin {generated} device random!")
-            self._refresh_views()
-        else:
-            messagebox.showinfo("Info", "Semua IP yang digenerate udah ada!")
+        candidates = [
+            (
+                f"{DEFAULT_BASE_IP}{random.randint(1, 254)}",
+                f"{DEFAULT_PACKET_PREFIX}{random.randint(1000, 9999)}",
+                f"{DEFAULT_DEVICE_PREFIX}{index + 1}",
+            )
+            for index in range(RANDOM_DEVICE_COUNT)
+        ]
+
+        def job(tree: SplayTree, context: JobContext) -> int:
+            generated = 0
+            for index, (ip_address, packet, device_name) in enumerate(candidates):
+                context.check_cancelled()
+                if not tree.contains(ip_address):
+                    tree.insert(ip_address, packet, device_name)
+                    generated += 1
+                else:
+                    # IP yang sudah ada hanya diganti packet-nya, namanya tetap
+                    tree.update(ip_address, None, packet)
+                context.report(index + 1, len(candidates))
+            return generated
+
+        def done(generated: int) -> None:
+            if generated:
+                self._log_message(f"Dibuat {generated} device random")
+                messagebox.showinfo("Berhasil", f"Berhasil bikin {generated} device random!")
+                self._refresh_views()
+            else:
+                messagebox.showinfo("Info", "Semua IP yang digenerate udah ada!")
+
+        self._submit_long("Buat device random", job, done)
 
     def _handle_clear_all(self) -> None:
         if not messagebox.askyesno("Konfirmasi Hapus Semua", "Yakin mau hapus semua device?"):
             return
-        self.splay_tree = SplayTree()
-        self.device_names.clear()
-        self._log_message("Semua device udah dihapus")
+
+        def done(_: Any) -> None:
+            self._log_message("Semua device udah dihapus")
+            self._refresh_views()
+            messagebox.showinfo("Berhasil", "Semua device udah dihapus!")
+
+        self._submit(lambda tree, context: self._adopt_tree(self.factory.create_tree()), done)
+
+    def _handle_save_snapshot(self) -> None:
+        path = filedialog.asksaveasfilename(
+            title="Simpan Snapshot",
+            defaultextension=SNAPSHOT_EXTENSION,
+            initialfile=os.path.basename(self.snapshot_path or f"devices{SNAPSHOT_EXTENSION}"),
+            filetypes=[("Snapshot IP Address Finder", f"*{SNAPSHOT_EXTENSION}"), ("Semua file", "*")],
+        )
+        if not path:
+            return
+        store = self.store
+
+        def job(tree: SplayTree, context: JobContext) -> int:
+            if store is not None and os.path.abspath(path) == os.path.abspath(store.snapshot_path):
+                # Snapshot milik store: sekalian compaction log
+                return store.compact(tree)
+            return save_snapshot(path, tree_rows(tree))
+
+        def done(count: int) -> None:
+            self.snapshot_path = path
+            self._log_message(f"Snapshot disimpan: {count} device ke {path}")
+            messagebox.showinfo("Berhasil", f"{count} device udah disimpan ke snapshot!")
+
+        self._submit(job, done)
+
+    def _handle_load_snapshot(self) -> None:
+        path = filedialog.askopenfilename(
+            title="Muat Snapshot",
+            filetypes=[("Snapshot IP Address Finder", f"*{SNAPSHOT_EXTENSION}"), ("Semua file", "*")],
+        )
+        if not path:
+            return
+
+        def confirm(size: int) -> None:
+            if size and not messagebox.askyesno(
+                "Konfirmasi Muat Snapshot", "Device yang ada sekarang akan diganti isi snapshot. Lanjut?"
+            ):
+                return
+            self._load_snapshot(path)
+
+        self._submit(lambda tree, context: tree.size, confirm)
+
+    def _load_snapshot(self, path: str) -> None:
+        def job(tree: SplayTree, context: JobContext) -> int:
+            with SnapshotReader(path) as snapshot:
+                loaded = self.factory.create_tree()
+                snapshot.load_into(loaded)
+            self._adopt_tree(loaded)
+            return loaded.size
+
+        def done(count: int) -> None:
+            self.snapshot_path = path
+            self._log_message(f"Snapshot dimuat: {count} device dari {path}")
+            self._refresh_views()
+
+        self._submit(job, done, name="Muat snapshot")
+
+    def _handle_import_devices(self) -> None:
+        path = filedialog.askopenfilename(title="Import Device", filetypes=DEVICE_FILE_TYPES)
+        if not path:
+            return
+        store = self.store
+
+        def job(tree: SplayTree, context: JobContext) -> ImportReport:
+            # Di worker: file yang hilang atau tidak bisa dibaca masuk ke dialog error job
+            total = os.path.getsize(path)
+
+            def progress(position: int) -> None:
+                # Batal sebelum tree diubah: device hanya dimasukkan setelah seluruh file terbaca
+                context.check_cancelled()
+                context.report(position, total)
+
+            # Dengan store, import_devices langsung compaction ke snapshot
+            return import_devices(path, tree, on_progress=progress, store=store)
+
+        def done(report: ImportReport) -> None:
+            self._log_message(f"Import {os.path.basename(path)}: {report.summary()}")
+            for line, message in report.errors[:IMPORT_LOGGED_ERRORS]:
+                self._log_message(f"  Baris {line} ditolak: {message}")
+            self._refresh_views()
+            messagebox.showinfo("Import Selesai", report.summary())
+
+        self._submit_long("Import device", job, done)
+
+    def _handle_export_devices(self) -> None:
+        path = filedialog.asksaveasfilename(
+            title="Export Device",
+            defaultextension=".csv",
+            initialfile="devices.csv",
+            filetypes=DEVICE_FILE_TYPES,
+        )
+        if not path:
+            return
+
+        def job(tree: SplayTree, context: JobContext) -> int:
+            total = tree.size
+
+            def progress(written: int) -> None:
+                context.check_cancelled()
+                context.report(written, total)
+
+            return export_devices(path, tree.iter_inorder(), on_progress=progress)
+
+        def done(count: int) -> None:
+            self._log_message(f"Export: {count} device ke {path}")
+            messagebox.showinfo("Berhasil", f"{count} device udah diexport!")
+
+        self._submit_long("Export device", job, done)
+
+    def _recover_store(self, store: DurableStore) -> None:
+        def job(tree: SplayTree, context: JobContext) -> Tuple[int, int]:
+            recovered = self.factory.create_tree()
+            replayed = store.recover(recovered)
+            self.worker.replace_tree(recovered)
+            return recovered.size, replayed
+
+        def done(result: Tuple[int, int]) -> None:
+            count, replayed = result
+            self._log_message(
+                f"Dipulihkan: {count} device dari {store.snapshot_path} ({replayed} operasi log di-replay)"
+            )
+            self._refresh_views()
+
+        self._submit(job, done, name="Pemulihan")
+
+    def _adopt_tree(self, tree: SplayTree) -> None:
+        # Dipanggil di thread worker. Tree baru menggantikan isi store seluruhnya
+        self.worker.replace_tree(tree)
+        if self.store is not None:
+            self.store.attach(tree)
+            self.store.compact(tree)
+
+    def _handle_cancel_job(self) -> None:
+        if self._active_job is not None:
+            self._active_job.cancel()
+            self.status_bar.config(text=f"Membatalkan: {self._active_job.name}...")
+
+    def _handle_close(self) -> None:
+        if self._active_job is not None:
+            self._active_job.cancel()
+        # Store ditutup di thread worker setelah job terakhir yang menulis log/snapshot
+        store = self.store
+        self.worker.shutdown(None if store is None else lambda tree: store.close())
+        self.root.destroy()
+
+
+    def _submit(
+        self,
+        job: TreeJob,
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        on_cancelled: Optional[Callable[[], None]] = None,
+        name: str = "job",
+        on_error: Optional[Callable[[BaseException], None]] = None,
+    ) -> JobHandle:
+        store = self.store
+
+        def committed(tree: SplayTree, context: JobContext) -> Any:
+            # Group commit per job: perubahan di-fsync sebelum hasil sampai ke UI
+            try:
+                return job(tree, context)
+            finally:
+                if store is not None:
+                    store.commit()
+
+        return self.worker.submit(
+            committed,
+            on_done=on_done,
+            on_error=on_error or self._handle_job_error,
+            on_progress=on_progress,
+            on_cancelled=on_cancelled,
+            name=name,
+        )
+
+    def _submit_long(self, name: str, job: TreeJob, on_done: Callable[[Any], None]) -> JobHandle:
+        # Job panjang: progress bar aktif dan bisa dibatalkan lewat tombol
+        def finish() -> None:
+            self._active_job = None
+            self.cancel_button.config(state=tk.DISABLED)
+            self.progress_bar["value"] = 0
+
+        def done(result: Any) -> None:
+            finish()
+            on_done(result)
+
+        def failed(exc: BaseException) -> None:
+            finish()
+            self._handle_job_error(exc)
+
+        def cancelled() -> None:
+            finish()
+            self._log_message(f"Dibatalkan: {name}")
+            self._refresh_views()
+
+        def progress(current: int, total: int) -> None:
+            self.progress_bar["value"] = 100 * current / total if total else 0
+            self.status_bar.config(text=f"{name}: {current}/{total}")
+
+        self.progress_bar["value"] = 0
+        self.cancel_button.config(state=tk.NORMAL)
+        self._active_job = self._submit(job, done, progress, cancelled, name, failed)
+        return self._active_job
+
+    def _handle_job_error(self, exc: BaseException) -> None:
+        self._log_message(f"Error: {exc}")
+        messagebox.showerror("Error", str(exc))
         self._refresh_views()
-        messagebox.showinfo("Berhasil", "Semua device udah dihapus!")
 
 
     def _load_localhost_info(self) -> None:
@@ -504,43 +931,114 @@ class IPAddressFinderGUI:
         self.local_ip_label.config(text=f"IP Lokal: {local_ip}")
         self._log_message(f"System initialized - Hostname: {hostname}, IP: {local_ip}")
 
-    def _refresh_views(self) -> None:
-        self.tree_size_label.config(text=f"Jumlah Device: {self.splay_tree.size}")
-        self.search_count_label.config(
-            text=f"Total Pencarian: {self.splay_tree.search_count}"
-        )
-
-        self.tree_display.delete(1.0, tk.END)
-        self.tree_display.insert(tk.END, self.splay_tree.get_tree_structure())
-
-        self.device_list_display.delete(1.0, tk.END)
-        nodes = self.splay_tree.inorder_traversal()
-        if nodes:
-            self.device_list_display.insert(tk.END, "=" * 60 + "\n")
-            self.device_list_display.insert(tk.END, "DAFTAR DEVICE (Urut berdasar IP Address)\n")
-            self.device_list_display.insert(tk.END, f"Total Device: {len(nodes)}\n")
-            self.device_list_display.insert(tk.END, "=" * 60 + "\n\n")
-            for index, node in enumerate(nodes, start=1):
-                device_name = self.device_names.get(node.ip_address, "Device Gak Dikenal")
-                self.device_list_display.insert(tk.END, f"{index}. {device_name}\n")
-                self.device_list_display.insert(tk.END, f"   Alamat IP   : {node.ip_address}\n")
-                self.device_list_display.insert(tk.END, f"   Data Paket  : {node.data_packet}\n")
-                self.device_list_display.insert(tk.END, "-" * 60 + "\n")
-        else:
-            self.device_list_display.insert(tk.END, "Belum ada device yang terdaftar.\n")
-
-        self.status_bar.config(
-            text=f"Status: {self.splay_tree.size} device terdaftar, {self.splay_tree.search_count} kali pencarian"
-        )
+    def _refresh_views(self, *views: str) -> None:
+        # Refresh di-debounce: banyak panggilan beruntun hanya dirender sekali
+        self._dirty_views.update(views or ("tree", "devices"))
+        if self._refresh_job is None:
+            self._refresh_job = self.root.after(REFRESH_DEBOUNCE_MS, self._flush_refresh)
+
+    def _flush_refresh(self) -> None:
+        self._refresh_job = None
+        store = self.store
+
+        def counters(tree: SplayTree, context: JobContext) -> Dict[str, Any]:
+            # Ukuran log hanya dibaca di worker, thread yang juga menulisnya;
+            # commit(tree) sekalian compaction jika log sudah melewati batas
+            if store is not None:
+                store.commit(tree)
+            return tree.stats()
+
+        self._submit(counters, self._show_counters)
+
+        # Tab yang tidak terlihat tetap ditandai dirty sampai dibuka
+        visible = self.notebook.select()
+        if "tree" in self._dirty_views and visible == str(self.tree_view):
+            self._dirty_views.discard("tree")
+            self.tree_view.refresh()
+        if "devices" in self._dirty_views and visible == str(self.device_list):
+            self._dirty_views.discard("devices")
+            self.device_list.refresh()
+
+    def _show_counters(self, stats: Dict[str, Any]) -> None:
+        size, search_count = stats["size"], stats["search_count"]
+        self.tree_size_label.config(text=f"Jumlah Device: {size}")
+        self.search_count_label.config(text=f"Total Pencarian: {search_count}")
+        if self._active_job is None:
+            status = f"Status: {size} device terdaftar, {search_count} kali pencarian"
+            if "rotations" in stats:
+                status += " | " + self._format_metrics(stats)
+            self.status_bar.config(text=status)
+
+    @staticmethod
+    def _format_metrics(stats: Dict[str, Any]) -> str:
+        # Ringkasan metrics (--metrics) untuk status bar
+        rotations = stats["rotations"]
+        parts = [
+            f"kedalaman rata-rata {stats['mean_depth']:.1f}",
+            f"{stats['comparisons']} perbandingan",
+            f"zig {rotations['zig']} / zig-zig {rotations['zig_zig']} / zig-zag {rotations['zig_zag']}",
+        ]
+        search = stats["latency"].get("search")
+        if search is not None:
+            parts.append(f"search p50 {search['p50_us']:.0f} µs, p99 {search['p99_us']:.0f} µs")
+        return ", ".join(parts)
+
+    def _fetch_device_rows(
+        self, offset: int, limit: int, deliver: Callable[[int, int, List[DeviceRow]], None]
+    ) -> None:
+        def job(tree: SplayTree, context: JobContext) -> Tuple[int, int, List[DeviceRow]]:
+            start = max(0, min(offset, tree.size - limit))
+            # splay=False: scroll daftar tidak boleh mengubah bentuk tree yang ditampilkan
+            nodes = tree.page(start, limit, splay=False)
+            rows = [
+                (
+                    str(index),
+                    node.name or UNKNOWN_DEVICE_NAME,
+                    node.ip_address,
+                    str(node.data_packet),
+                )
+                for index, node in enumerate(nodes, start=start + 1)
+            ]
+            return start, tree.size, rows
+
+        self._submit(job, lambda result: deliver(*result))
+
+    def _fetch_open_tree(self, open_keys: Set[int], deliver: Callable[[List[TreeRow]], None]) -> None:
+        self._submit(lambda tree, context: snapshot_open_tree(tree.root, open_keys), deliver)
+
+    def _fetch_tree_children(self, key: int, deliver: Callable[[List[TreeRow]], None]) -> None:
+        self._submit(lambda tree, context: snapshot_children(tree.peek_key(key)), deliver)
+
+    def _parse_ip(self, ip_address: str, label: str) -> Optional[str]:
+        # Bentuk kanonik IP, atau None setelah menunjukkan letak kesalahannya
+        try:
+            return format_ip(parse_ip(ip_address))
+        except IPParseError as exc:
+            messagebox.showerror(
+                "Error",
+                f"Format {label} nya salah!\n{exc.reason} di karakter ke-{exc.position + 1}: {ip_address}",
+            )
+            return None
 
-    def _validate_ip(self, ip_address: str) -> bool:
-        parts = ip_address.split(".")
-        if len(parts) != 4:
-            return False
+    def _parse_cidr(self, cidr: str) -> Optional[str]:
+        if not cidr:
+            messagebox.showwarning("Peringatan", "Isi CIDR dulu ya!")
+            return None
+        try:
+            parse_cidr(cidr)
+        except ValueError as exc:
+            # IPParseError turunan ValueError, jadi IP yang salah ikut tertangkap
+            messagebox.showerror("Error", f"Format CIDR nya salah!\n{exc}")
+            return None
+        return cidr
+
+    @staticmethod
+    def _canonical_ip(ip_address: str) -> str:
+        # IP yang formatnya salah dibiarkan apa adanya; tree akan melaporkan tidak ketemu
         try:
-            return all(0 <= int(part) <= 255 for part in parts)
-        except ValueError:
-            return False
+            return format_ip(parse_ip(ip_address))
+        except IPParseError:
+            return ip_address
 
     def _log_message(self, message: str) -> None:
         from datetime import datetime
@@ -548,22 +1046,3 @@ class IPAddressFinderGUI:
         timestamp = datetime.now().strftime("%H:%M:%S")
         self.log_display.insert(tk.END, f"[{timestamp}] {message}\n")
         self.log_display.see(tk.END)
-
-    def _show_message_window(self, title: str, message: str) -> None:
-        window = tk.Toplevel(self.root)
-        window.title(title)
-        window.geometry("500x400")
-        text_widget = scrolledtext.ScrolledText(
-            window, wrap=tk.WORD, font=("Courier New", 9)
-        )
-        text_widget.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        text_widget.insert(tk.END, message)
-        text_widget.config(state=tk.DISABLED)
-        tk.Button(
-            window,
-            text="Tutup",
-            command=window.destroy,
-            bg=GUI_STYLE.button_search,
-            fg=GUI_STYLE.foreground,
-            font=("Arial", 10, "bold"),
-        ).pack(pady=5)
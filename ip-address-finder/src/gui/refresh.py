@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from typing import Sequence, Tuple
+
+
+def changed_span(old: Sequence[str], new: Sequence[str]) -> Tuple[int, int, int]:
+    """
+    Cari blok baris yang berbeda antara render lama dan baru.
+
+    Returns:
+        tuple: (head, old_end, new_end) sehingga old[head:old_end] cukup
+        diganti dengan new[head:new_end]
+    """
+    limit = min(len(old), len(new))
+    head = 0
+    while head < limit and old[head] == new[head]:
+        head += 1
+    tail = 0
+    while tail < limit - head and old[-1 - tail] == new[-1 - tail]:
+        tail += 1
+    return head, len(old) - tail, len(new) - tail
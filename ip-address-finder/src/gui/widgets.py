@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import tkinter as tk
+from dataclasses import dataclass
+from tkinter import ttk
+from typing import AbstractSet, Callable, List, Optional, Sequence, Set, Tuple
+
+from ..datastructures.nodes import BaseNode
+from .refresh import changed_span
+
+DeviceRow = Tuple[str, ...]
+
+PLACEHOLDER_SUFFIX = ":placeholder"
+
+
+@dataclass(frozen=True)
+class TreeRow:
+    # Snapshot satu node untuk LazyTreeView, dibuat di thread worker
+
+    parent_key: Optional[int]
+    key: int
+    text: str
+    has_children: bool
+    expanded: bool
+
+
+def _tree_row(node: BaseNode, parent_key: Optional[int], side: str, expanded: bool) -> TreeRow:
+    return TreeRow(
+        parent_key,
+        node.key,
+        f"{side}: {node.ip_address} (Packet: {node.data_packet})",
+        node.left is not None or node.right is not None,
+        expanded,
+    )
+
+
+def snapshot_open_tree(root: Optional[BaseNode], open_keys: AbstractSet[int]) -> List[TreeRow]:
+    # Preorder dari root, hanya turun ke node yang sedang di-expand (root selalu)
+    if root is None:
+        return []
+    rows: List[TreeRow] = []
+    stack: List[Tuple[BaseNode, Optional[int], str]] = [(root, None, "Root")]
+    while stack:
+        node, parent_key, side = stack.pop()
+        expanded = parent_key is None or node.key in open_keys
+        rows.append(_tree_row(node, parent_key, side, expanded))
+        if expanded:
+            if node.right is not None:
+                stack.append((node.right, node.key, "R"))
+            if node.left is not None:
+                stack.append((node.left, node.key, "L"))
+    return rows
+
+
+def snapshot_children(node: Optional[BaseNode]) -> List[TreeRow]:
+    if node is None:
+        return []
+    return [
+        _tree_row(child, node.key, side, False)
+        for child, side in ((node.left, "L"), (node.right, "R"))
+        if child is not None
+    ]
+
+
+# Provider data dipanggil di thread UI; hasilnya dikirim balik lewat callback
+RowsProvider = Callable[[int, int, Callable[[int, int, List[DeviceRow]], None]], None]
+OpenTreeProvider = Callable[[Set[int], Callable[[List[TreeRow]], None]], None]
+ChildrenProvider = Callable[[int, Callable[[List[TreeRow]], None]], None]
+
+
+class VirtualDeviceList(tk.Frame):
+    """
+    Daftar device virtual: hanya baris yang terlihat yang ada di Treeview.
+
+    Scrollbar dipetakan ke offset di urutan device, lalu baris untuk jendela
+    yang terlihat diminta lewat `fetch_rows(offset, limit, deliver)`.
+    Provider memanggil deliver(offset, total, rows) dengan offset yang sudah
+    dijepit ke jumlah device; jawaban yang sudah basi diabaikan.
+    """
+
+    COLUMNS: Tuple[Tuple[str, str, int], ...] = (
+        ("no", "No", 60),
+        ("name", "Nama Device", 160),
+        # Cukup lebar untuk IPv6 seperti 2001:db8:85a3::8a2e:370:7334
+        ("ip", "Alamat IP", 240),
+        ("packet", "Data Paket", 130),
+    )
+
+    def __init__(
+        self,
+        master: tk.Widget,
+        fetch_rows: RowsProvider,
+        row_height: int,
+    ) -> None:
+        super().__init__(master)
+        self.fetch_rows = fetch_rows
+        self.row_height = row_height
+        self.offset = 0
+        self.visible_rows = 1
+        self.total = 0
+        self._rows: List[DeviceRow] = []
+        self._request_serial = 0
+
+        self.summary_label = tk.Label(self, text="Total Device: 0", anchor="w")
+        self.summary_label.pack(side=tk.TOP, fill=tk.X, padx=5, pady=2)
+
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.view = ttk.Treeview(
+            self,
+            columns=[column for column, _, _ in self.COLUMNS],
+            show="headings",
+            selectmode="browse",
+        )
+        for column, heading, width in self.COLUMNS:
+            self.view.heading(column, text=heading)
+            self.view.column(column, width=width, anchor=tk.W)
+        self.view.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.view.bind("<Configure>", self._on_resize)
+        self.view.bind("<MouseWheel>", lambda event: self.scroll(-3 if event.delta > 0 else 3))
+        self.view.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.view.bind("<Button-5>", lambda event: self.scroll(3))
+
+    def refresh(self) -> None:
+        self._request_serial += 1
+        serial = self._request_serial
+        self.fetch_rows(
+            max(0, self.offset),
+            self.visible_rows,
+            lambda offset, total, rows: self._on_rows(serial, offset, total, rows),
+        )
+
+    def _on_rows(self, serial: int, offset: int, total: int, rows: List[DeviceRow]) -> None:
+        if serial != self._request_serial or not self.winfo_exists():
+            return
+        self.offset = offset
+        self.total = total
+        self._show_rows(rows)
+        self.summary_label.config(text=f"Total Device: {self.total} (Urut berdasar IP Address)")
+        if self.total:
+            first = self.offset / self.total
+            last = min(1.0, (self.offset + self.visible_rows) / self.total)
+            self.scrollbar.set(first, last)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, rows: int) -> None:
+        self.offset += rows
+        self.refresh()
+
+    def _show_rows(self, rows: Sequence[DeviceRow]) -> None:
+        # Item Treeview dipakai ulang per posisi; hanya baris yang berubah disentuh
+        head, old_end, new_end = changed_span(self._rows, rows)
+        items = self.view.get_children()
+        for index in range(head, new_end):
+            if index < len(items):
+                self.view.item(items[index], values=rows[index])
+            else:
+                self.view.insert("", tk.END, values=rows[index])
+        if len(items) > len(rows):
+            self.view.delete(*items[len(rows):])
+        self._rows = list(rows)
+
+    def _on_scroll(self, action: str, amount: str, unit: Optional[str] = None) -> None:
+        if action == tk.MOVETO:
+            self.offset = int(float(amount) * self.total)
+        elif unit == tk.PAGES:
+            self.offset += int(amount) * self.visible_rows
+        else:
+            self.offset += int(amount)
+        self.refresh()
+
+    def _on_resize(self, event: tk.Event) -> None:
+        # Header kolom kira-kira setinggi satu baris
+        visible_rows = max(1, event.height // self.row_height - 1)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.refresh()
+
+
+class LazyTreeView(tk.Frame):
+    """
+    Struktur splay tree yang dibuka bertahap.
+
+    Anak sebuah node baru diminta ke provider ketika node itu di-expand, jadi
+    biaya render sebanding dengan bagian tree yang sedang dibuka, bukan
+    dengan jumlah device.
+    """
+
+    def __init__(
+        self,
+        master: tk.Widget,
+        fetch_open_tree: OpenTreeProvider,
+        fetch_children: ChildrenProvider,
+    ) -> None:
+        super().__init__(master)
+        self.fetch_open_tree = fetch_open_tree
+        self.fetch_children = fetch_children
+        # Key yang sedang di-expand, dipertahankan saat tree berubah bentuk
+        self._open_keys: Set[int] = set()
+        self._request_serial = 0
+
+        scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.view = ttk.Treeview(self, show="tree", selectmode="browse", yscrollcommand=scrollbar.set)
+        self.view.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.view.yview)
+
+        self.view.bind("<<TreeviewOpen>>", self._on_open)
+        self.view.bind("<<TreeviewClose>>", self._on_close)
+
+    def refresh(self) -> None:
+        self._request_serial += 1
+        serial = self._request_serial
+        self.fetch_open_tree(set(self._open_keys), lambda rows: self._show(serial, rows))
+
+    def _show(self, serial: int, rows: List[TreeRow]) -> None:
+        if serial != self._request_serial:
+            return
+        self.view.delete(*self.view.get_children())
+        if not rows:
+            self.view.insert("", tk.END, text="Tree is empty")
+            return
+        for row in rows:
+            self._insert_row(row)
+
+    def _insert_row(self, row: TreeRow) -> None:
+        iid = str(row.key)
+        parent_iid = "" if row.parent_key is None else str(row.parent_key)
+        # Lewati baris yang sudah tampil atau parent-nya sudah hilang (tree berubah)
+        if self.view.exists(iid) or (parent_iid and not self.view.exists(parent_iid)):
+            return
+        self.view.insert(parent_iid, tk.END, iid=iid, text=row.text, open=row.expanded)
+        if row.has_children and not row.expanded:
+            self.view.insert(iid, tk.END, iid=iid + PLACEHOLDER_SUFFIX, text="…")
+
+    def _on_open(self, event: tk.Event) -> None:
+        iid = self.view.focus()
+        placeholder = iid + PLACEHOLDER_SUFFIX
+        if not self.view.exists(placeholder):
+            return
+        self.view.delete(placeholder)
+        key = int(iid)
+        self._open_keys.add(key)
+        serial = self._request_serial
+
+        def attach(rows: List[TreeRow]) -> None:
+            if serial == self._request_serial:
+                for row in rows:
+                    self._insert_row(row)
+
+        self.fetch_children(key, attach)
+
+    def _on_close(self, event: tk.Event) -> None:
+        iid = self.view.focus()
+        if iid.isdigit():
+            self._open_keys.discard(int(iid))
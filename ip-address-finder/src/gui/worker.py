@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import queue
+import threading
+import tkinter as tk
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from ..datastructures.splay_tree import SplayTree
+
+
+class JobCancelled(Exception):
+    pass
+
+
+@dataclass
+class JobHandle:
+
+    name: str
+    _cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def cancel(self) -> None:
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+
+@dataclass
+class JobContext:
+    # Diberikan ke setiap job yang berjalan di thread worker
+
+    worker: TreeWorker
+    handle: JobHandle
+    on_progress: Optional[Callable[[int, int], None]] = None
+
+    def report(self, done: int, total: int) -> None:
+        if self.on_progress is not None:
+            callback = self.on_progress
+            self.worker._deliver(lambda: callback(done, total))
+
+    def check_cancelled(self) -> None:
+        if self.handle.cancelled:
+            raise JobCancelled(self.handle.name)
+
+
+TreeJob = Callable[[SplayTree, JobContext], Any]
+
+
+@dataclass
+class _QueuedJob:
+
+    job: TreeJob
+    handle: JobHandle
+    on_done: Optional[Callable[[Any], None]]
+    on_error: Optional[Callable[[BaseException], None]]
+    on_progress: Optional[Callable[[int, int], None]]
+    on_cancelled: Optional[Callable[[], None]]
+
+
+class TreeWorker:
+    """
+    Thread tunggal yang memiliki SplayTree.
+
+    Semua operasi tree dikirim sebagai job lewat submit() dan dijalankan
+    berurutan di thread worker. Hasil, progress dan error dikembalikan ke
+    thread Tk lewat antrian yang di-poll dengan root.after(), jadi callback
+    aman menyentuh widget. Thread UI tidak boleh mengakses tree secara
+    langsung.
+    """
+
+    def __init__(self, root: tk.Misc, tree: SplayTree, poll_ms: int) -> None:
+        self.root = root
+        self.tree = tree
+        self.poll_ms = poll_ms
+        self._jobs: "queue.Queue[Optional[_QueuedJob]]" = queue.Queue()
+        self._results: "queue.Queue[Callable[[], None]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="tree-worker", daemon=True)
+        self._thread.start()
+        self._poll_job = self.root.after(self.poll_ms, self._poll)
+
+    def submit(
+        self,
+        job: TreeJob,
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[BaseException], None]] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        on_cancelled: Optional[Callable[[], None]] = None,
+        name: str = "job",
+    ) -> JobHandle:
+        handle = JobHandle(name)
+        self._jobs.put(_QueuedJob(job, handle, on_done, on_error, on_progress, on_cancelled))
+        return handle
+
+    def replace_tree(self, tree: SplayTree) -> None:
+        # Hanya dipanggil dari dalam job (thread worker)
+        self.tree = tree
+
+    def shutdown(self, final: Optional[Callable[[SplayTree], None]] = None) -> None:
+        """
+        Hentikan worker setelah semua job yang sudah diantre selesai.
+
+        `final` dijalankan di thread worker sebagai job terakhir, mis. untuk
+        menutup store yang juga ditulis oleh job lain. Menunggu tanpa batas
+        waktu: job yang tidak bisa dibatalkan (finish() import, compaction)
+        tetap diselesaikan dulu.
+        """
+        if final is not None:
+            self.submit(lambda tree, context: final(tree), name="shutdown")
+        self._jobs.put(None)
+        self.root.after_cancel(self._poll_job)
+        self._thread.join()
+
+    def _deliver(self, callback: Callable[[], None]) -> None:
+        self._results.put(callback)
+
+    def _run(self) -> None:
+        while True:
+            queued = self._jobs.get()
+            if queued is None:
+                return
+            context = JobContext(self, queued.handle, queued.on_progress)
+            try:
+                if queued.handle.cancelled:
+                    raise JobCancelled(queued.handle.name)
+                result = queued.job(self.tree, context)
+            except JobCancelled:
+                if queued.on_cancelled is not None:
+                    self._deliver(queued.on_cancelled)
+            except Exception as exc:  # diteruskan ke UI, worker tetap hidup
+                if queued.on_error is not None:
+                    self._deliver(lambda on_error=queued.on_error, exc=exc: on_error(exc))
+            else:
+                if queued.on_done is not None:
+                    self._deliver(lambda on_done=queued.on_done, result=result: on_done(result))
+
+    def _poll(self) -> None:
+        # Jadwalkan poll berikutnya dulu supaya callback yang error tidak menghentikan polling
+        self._poll_job = self.root.after(self.poll_ms, self._poll)
+        while True:
+            try:
+                callback = self._results.get_nowait()
+            except queue.Empty:
+                return
+            callback()
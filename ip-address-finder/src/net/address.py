@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import socket
+from typing import List, Optional, Sequence, Tuple
+
+from .ipv4 import (
+    HAVE_NUMPY,
+    OCTET_TEXT,
+    UINT32,
+    IPParseError,
+    IPv4Batch,
+    np,
+    parse_ipv4,
+    split_lines,
+    validate_ipv4_batch,
+)
+from .ipv6 import IPV6_BITS, format_ipv6, parse_ipv6
+
+# IPv4 disimpan sebagai IPv4-mapped IPv6 (::ffff:a.b.c.d), jadi kedua
+# keluarga alamat berbagi satu ruang key 128-bit dan satu tabel
+KEY_BITS: int = IPV6_BITS
+MAX_KEY: int = (1 << KEY_BITS) - 1
+IPV4_MAPPED: int = 0xFFFF << 32
+IPV4_MASK: int = 0xFFFFFFFF
+
+IPBatch = IPv4Batch
+
+_pton = socket.inet_pton
+_AF_INET = socket.AF_INET
+_AF_INET6 = socket.AF_INET6
+_unpack_uint32 = UINT32.unpack
+_pack_uint32 = UINT32.pack
+
+
+def is_ipv4_key(key: int) -> bool:
+    return key >> 32 == 0xFFFF
+
+
+def parse_ip(text: str) -> int:
+    """
+    Ubah IPv4 atau IPv6 menjadi key 128-bit.
+
+    IPv4 "10.0.0.1" dan "::ffff:10.0.0.1" menghasilkan key yang sama. Jalur
+    IPv4 hanya menambah satu cek ':' dan satu OR dibanding parse_ipv4.
+
+    Raises:
+        IPParseError: Jika format IP salah
+    """
+    try:
+        if ":" in text:
+            return int.from_bytes(_pton(_AF_INET6, text), "big")
+        return IPV4_MAPPED | _unpack_uint32(_pton(_AF_INET, text))[0]
+    except (OSError, ValueError):
+        pass
+    if ":" in text:
+        return parse_ipv6(text)
+    return IPV4_MAPPED | parse_ipv4(text)
+
+
+def format_ip(key: int) -> str:
+    # IPv4-mapped ditulis sebagai dotted-quad biasa (format_ipv4 di-inline)
+    if key >> 32 == 0xFFFF:
+        a, b, c, d = _pack_uint32(key & IPV4_MASK)
+        octets = OCTET_TEXT
+        return f"{octets[a]}.{octets[b]}.{octets[c]}.{octets[d]}"
+    return format_ipv6(key)
+
+
+def validate_ip_batch(
+    addresses: IPBatch, use_numpy: Optional[bool] = None
+) -> Tuple[List[int], List[IPParseError]]:
+    """
+    Parse banyak IPv4/IPv6 sekaligus dan kumpulkan semua error.
+
+    Batch tanpa ':' sama sekali (hanya IPv4) diserahkan ke
+    validate_ipv4_batch beserta jalur cepat C/NumPy-nya; batch campuran
+    diparse per alamat.
+
+    Returns:
+        tuple: (list key IP yang valid sesuai urutan input, daftar
+        IPParseError dengan `index` posisi IP di input)
+    """
+    if use_numpy and not HAVE_NUMPY:
+        raise RuntimeError("NumPy tidak terpasang")
+    if np is not None and isinstance(addresses, np.ndarray):
+        addresses = addresses.astype(str).tolist()
+    if isinstance(addresses, (bytes, bytearray, memoryview)):
+        data = bytes(addresses)
+        if b":" not in data:
+            ipv4_keys, errors = validate_ipv4_batch(data, use_numpy)
+            return list(map(IPV4_MAPPED.__or__, ipv4_keys)), errors
+        addresses = split_lines(data[:-1] if data.endswith(b"\n") else data)
+    elif ":" not in "".join(addresses):
+        ipv4_keys, errors = validate_ipv4_batch(addresses, use_numpy)
+        return list(map(IPV4_MAPPED.__or__, ipv4_keys)), errors
+
+    try:
+        return list(map(parse_ip, addresses)), []
+    except IPParseError:
+        pass
+    keys: List[int] = []
+    errors: List[IPParseError] = []
+    for index, address in enumerate(addresses):
+        try:
+            keys.append(parse_ip(address))
+        except IPParseError as exc:
+            errors.append(exc.at_index(index))
+    return keys, errors
+
+
+def parse_ip_batch(addresses: Sequence[str], use_numpy: Optional[bool] = None) -> List[int]:
+    """
+    Raises:
+        IPParseError: Untuk IP pertama yang tidak valid, dengan `index`
+            urutannya di input
+    """
+    keys, errors = validate_ip_batch(addresses, use_numpy)
+    if errors:
+        raise errors[0]
+    return keys
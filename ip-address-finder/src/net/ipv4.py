@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import socket
+import struct
+import sys
+from array import array
+from functools import partial
+from typing import List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy opsional
+    np = None
+
+HAVE_NUMPY: bool = np is not None
+
+IPv4Batch = Union[Sequence[str], bytes, bytearray, memoryview]
+
+# Dipakai bersama oleh parser/formatter IPv4 di sini dan di address.py
+UINT32 = struct.Struct("!I")
+OCTET_TEXT: Tuple[str, ...] = tuple(str(octet) for octet in range(256))
+_PACK_IPV4 = partial(socket.inet_pton, socket.AF_INET)
+_pton = socket.inet_pton
+_AF_INET = socket.AF_INET
+_unpack_uint32 = UINT32.unpack
+_pack_uint32 = UINT32.pack
+
+
+class IPParseError(ValueError):
+    """
+    IP Address yang tidak valid.
+
+    Attributes:
+        text: Teks IP yang ditolak
+        position: Index karakter (mulai 0) tempat kesalahan ditemukan
+        index: Urutan IP di dalam batch, None untuk parse satu IP
+    """
+
+    def __init__(self, reason: str, text: str, position: int, index: Optional[int] = None) -> None:
+        self.reason = reason
+        self.text = text
+        self.position = position
+        self.index = index
+        where = f"IP ke-{index + 1}, " if index is not None else ""
+        super().__init__(f"{reason} ({where}kolom {position + 1}): {text!r}")
+
+    def at_index(self, index: int) -> "IPParseError":
+        return IPParseError(self.reason, self.text, self.position, index)
+
+    def __reduce__(self) -> Tuple[type, Tuple[str, str, int, Optional[int]]]:
+        # Bisa di-pickle utuh, mis. error dari proses shard ShardedSplayTree
+        return IPParseError, (self.reason, self.text, self.position, self.index)
+
+
+def scan_ipv4(text: str) -> int:
+    # Scanner karakter per karakter: menerima nol di depan (mis. 010.0.0.1)
+    # dan melaporkan posisi persis dari kesalahan pertama. Juga dipakai
+    # parser IPv6 untuk IPv4 di ujung alamat (::ffff:1.2.3.4)
+    if not text:
+        raise IPParseError("IP Address kosong", text, 0)
+    key = 0
+    value = 0
+    digits = 0
+    octets = 0
+    start = 0
+    for position, char in enumerate(text):
+        if "0" <= char <= "9":
+            digits += 1
+            if digits > 3:
+                raise IPParseError("Oktet lebih dari 3 digit", text, position)
+            value = value * 10 + ord(char) - 48
+        elif char == ".":
+            if not digits:
+                raise IPParseError("Oktet kosong", text, position)
+            if value > 255:
+                raise IPParseError("Oktet di luar rentang 0-255", text, start)
+            octets += 1
+            if octets == 4:
+                raise IPParseError("Lebih dari 4 oktet", text, position)
+            key = (key << 8) | value
+            value = digits = 0
+            start = position + 1
+        else:
+            raise IPParseError(f"Karakter tidak valid {char!r}", text, position)
+    if not digits:
+        raise IPParseError("Oktet kosong", text, len(text))
+    if value > 255:
+        raise IPParseError("Oktet di luar rentang 0-255", text, start)
+    if octets != 3:
+        raise IPParseError("Kurang dari 4 oktet", text, len(text))
+    return (key << 8) | value
+
+
+def parse_ipv4(text: str) -> int:
+    """
+    Ubah IPv4 dotted-quad menjadi key integer 32-bit.
+
+    Bentuk kanonik diparse oleh inet_pton di C. inet_pton hanya menerima
+    subset ketat dari format yang valid, jadi apa pun yang ditolaknya diulang
+    di Python, yang juga menerima nol di depan (mis. 010.0.0.1) dan memberi
+    posisi error yang tepat.
+
+    Raises:
+        IPParseError: Jika format IP salah
+    """
+    try:
+        return _unpack_uint32(_pton(_AF_INET, text))[0]
+    except (OSError, ValueError):
+        return _parse_padded(text)
+
+
+def _parse_padded(text: str) -> int:
+    # Jalur kedua untuk IP valid dengan nol di depan; jika gagal, scanner
+    # yang menentukan pesan dan posisi error
+    parts = text.split(".")
+    if len(parts) == 4:
+        key = 0
+        for part in parts:
+            # isascii() mencegah digit unicode seperti '²' lolos dari isdigit()
+            if not (part.isascii() and part.isdigit()) or len(part) > 3:
+                break
+            octet = int(part)
+            if octet > 255:
+                break
+            key = (key << 8) | octet
+        else:
+            return key
+    return scan_ipv4(text)
+
+
+def format_ipv4(key: int) -> str:
+    try:
+        a, b, c, d = _pack_uint32(key)
+    except struct.error:
+        raise ValueError(f"Key di luar rentang IPv4: {key}") from None
+    octets = OCTET_TEXT
+    return f"{octets[a]}.{octets[b]}.{octets[c]}.{octets[d]}"
+
+
+def split_lines(data: Union[bytes, bytearray, memoryview]) -> List[str]:
+    # Buffer teks satu IP per baris -> list string (byte rusak jadi U+FFFD)
+    text = bytes(data).decode("utf-8", errors="replace")
+    return text.split("\n") if text else []
+
+
+def _pack_canonical(addresses: Sequence[str]) -> Optional[array]:
+    # Satu panggilan inet_pton per IP tanpa loop Python; None jika ada yang
+    # bukan bentuk kanonik
+    keys = array("I")
+    try:
+        keys.frombytes(b"".join(map(_PACK_IPV4, addresses)))
+    except (OSError, ValueError, TypeError):
+        return None
+    if sys.byteorder == "little":
+        keys.byteswap()
+    return keys
+
+
+def _parse_buffer_numpy(data: bytes) -> Optional[array]:
+    """
+    Parse buffer IP yang dipisah newline dengan operasi vektor NumPy.
+
+    Returns:
+        array: Key semua baris, atau None jika ada baris yang tidak valid.
+        Pesan error dan posisinya lalu dicari lewat jalur per IP supaya
+        sama persis dengan parse_ipv4.
+    """
+    if not data:
+        # Satu baris kosong (buffer kosong sudah ditangani pemanggil)
+        return None
+    chars = np.frombuffer(data, dtype=np.uint8)
+    is_digit = (chars >= 48) & (chars <= 57)
+    is_newline = chars == 10
+    line_of_char = np.cumsum(is_newline) - is_newline
+    line_count = int(line_of_char[-1]) + 1
+
+    bad_char = ~(is_digit | is_newline | (chars == 46))
+    bad_lines = np.zeros(line_count, dtype=bool)
+    bad_lines[line_of_char[bad_char]] = True
+
+    # Oktet = rentang digit di antara dua pemisah (titik, newline, awal/akhir buffer)
+    separators = np.flatnonzero(~is_digit)
+    starts = np.concatenate(([0], separators + 1))
+    ends = np.concatenate((separators, [len(chars)]))
+    lengths = ends - starts
+    field_line = line_of_char[np.minimum(starts, len(chars) - 1)]
+    # Nilai oktet dari maksimal 3 digit terakhir; digit di luar panjang oktet dianggap 0
+    values = np.zeros(len(starts), dtype=np.int64)
+    for place, scale in ((1, 1), (2, 10), (3, 100)):
+        index = np.maximum(ends - place, 0)
+        digit = chars[index].astype(np.int64) - 48
+        values += np.where(lengths >= place, digit, 0) * scale
+    bad_field = (lengths < 1) | (lengths > 3) | (values > 255)
+    bad_lines[field_line[bad_field]] = True
+    bad_lines |= np.bincount(field_line, minlength=line_count) != 4
+
+    if bad_lines.any():
+        return None
+    octets = values.reshape(-1, 4).astype(np.uint32)
+    keys = (octets[:, 0] << 24) | (octets[:, 1] << 16) | (octets[:, 2] << 8) | octets[:, 3]
+    result = array("I")
+    result.frombytes(keys.astype(np.uint32).tobytes())
+    return result
+
+
+def validate_ipv4_batch(
+    addresses: IPv4Batch, use_numpy: Optional[bool] = None
+) -> Tuple[array, List[IPParseError]]:
+    """
+    Parse banyak IP sekaligus dan kumpulkan semua error.
+
+    Args:
+        addresses: List string IP, atau buffer bytes berisi IP yang dipisah
+            newline (mis. isi file). Array NumPy string juga diterima.
+        use_numpy: Paksa pakai/tidak pakai NumPy; default otomatis jika terpasang
+
+    Returns:
+        tuple: (array uint32 berisi key IP yang valid sesuai urutan input,
+        daftar IPParseError dengan `index` posisi IP di input)
+    """
+    if use_numpy is None:
+        use_numpy = HAVE_NUMPY
+    elif use_numpy and not HAVE_NUMPY:
+        raise RuntimeError("NumPy tidak terpasang")
+
+    if np is not None and isinstance(addresses, np.ndarray):
+        addresses = addresses.astype(str).tolist()
+    if isinstance(addresses, (bytes, bytearray, memoryview)):
+        data = bytes(addresses)
+        if data.endswith(b"\n"):
+            data = data[:-1]
+        if use_numpy and data:
+            keys = _parse_buffer_numpy(data)
+            if keys is not None:
+                return keys, []
+        addresses = split_lines(data)
+    else:
+        keys = _pack_canonical(addresses)
+        if keys is not None:
+            return keys, []
+        if use_numpy and addresses:
+            blob = "\n".join(addresses)
+            # IP yang berisi newline merusak pembagian baris; cek per IP saja
+            if blob.count("\n") == len(addresses) - 1:
+                keys = _parse_buffer_numpy(blob.encode("utf-8"))
+                if keys is not None:
+                    return keys, []
+
+    keys = array("I")
+    errors: List[IPParseError] = []
+    for index, address in enumerate(addresses):
+        try:
+            keys.append(parse_ipv4(address))
+        except IPParseError as exc:
+            errors.append(exc.at_index(index))
+    return keys, errors
+
+
+def parse_ipv4_batch(addresses: IPv4Batch, use_numpy: Optional[bool] = None) -> array:
+    """
+    Parse banyak IP sekaligus menjadi array uint32.
+
+    Raises:
+        IPParseError: Untuk IP pertama yang tidak valid, dengan `index`
+            urutannya di input dan `position` kolomnya
+    """
+    keys, errors = validate_ipv4_batch(addresses, use_numpy)
+    if errors:
+        raise errors[0]
+    return keys
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import socket
+from typing import List
+
+from .ipv4 import IPParseError, scan_ipv4
+
+IPV6_BITS: int = 128
+_GROUPS = 8
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+_IPV6_CHARS = _HEX_DIGITS | frozenset(":.")
+_pton = socket.inet_pton
+_ntop = socket.inet_ntop
+_AF_INET6 = socket.AF_INET6
+
+
+def _groups(text: str, part: str, offset: int, allow_ipv4: bool) -> List[int]:
+    # Nilai 16-bit setiap grup di `part` (potongan `text` mulai kolom `offset`)
+    if not part:
+        return []
+    values: List[int] = []
+    start = offset
+    pieces = part.split(":")
+    for index, piece in enumerate(pieces):
+        if not piece:
+            raise IPParseError("Grup kosong", text, start)
+        if "." in piece:
+            if not allow_ipv4 or index != len(pieces) - 1:
+                raise IPParseError("IPv4 hanya boleh di akhir alamat", text, start)
+            try:
+                value = scan_ipv4(piece)
+            except IPParseError as exc:
+                raise IPParseError(exc.reason, text, start + exc.position) from None
+            values += (value >> 16, value & 0xFFFF)
+        else:
+            if len(piece) > 4:
+                raise IPParseError("Grup lebih dari 4 digit hex", text, start + 4)
+            values.append(int(piece, 16))
+        start += len(piece) + 1
+    return values
+
+
+def _parse_exact(text: str) -> int:
+    # Parser Python untuk semua yang ditolak inet_pton: menerima nol di depan
+    # pada IPv4 di akhir alamat dan melaporkan posisi kesalahan pertama
+    if not text:
+        raise IPParseError("IP Address kosong", text, 0)
+    for position, char in enumerate(text):
+        if char not in _IPV6_CHARS:
+            raise IPParseError(f"Karakter tidak valid {char!r}", text, position)
+    gap = text.find("::")
+    if gap < 0:
+        groups = _groups(text, text, 0, True)
+        if len(groups) != _GROUPS:
+            reason = "Kurang dari 8 grup" if len(groups) < _GROUPS else "Lebih dari 8 grup"
+            raise IPParseError(reason, text, len(text))
+    else:
+        second = text.find("::", gap + 1)
+        if second >= 0:
+            raise IPParseError("'::' hanya boleh muncul sekali", text, second)
+        head = _groups(text, text[:gap], 0, False)
+        tail = _groups(text, text[gap + 2:], gap + 2, True)
+        if len(head) + len(tail) >= _GROUPS:
+            raise IPParseError("Terlalu banyak grup untuk '::'", text, gap)
+        groups = head + [0] * (_GROUPS - len(head) - len(tail)) + tail
+    key = 0
+    for value in groups:
+        key = (key << 16) | value
+    return key
+
+
+def parse_ipv6(text: str) -> int:
+    """
+    Ubah IPv6 menjadi key integer 128-bit.
+
+    Sama seperti parse_ipv4: bentuk standar diparse inet_pton di C, sisanya
+    diulang di Python untuk posisi error yang tepat. Zone id (fe80::1%eth0)
+    tidak diterima.
+
+    Raises:
+        IPParseError: Jika format IP salah
+    """
+    try:
+        return int.from_bytes(_pton(_AF_INET6, text), "big")
+    except (OSError, ValueError):
+        return _parse_exact(text)
+
+
+def format_ipv6(key: int) -> str:
+    # Bentuk ringkas huruf kecil (RFC 5952) dari inet_ntop
+    try:
+        return _ntop(_AF_INET6, key.to_bytes(16, "big"))
+    except OverflowError:
+        raise ValueError(f"Key di luar rentang IPv6: {key}") from None
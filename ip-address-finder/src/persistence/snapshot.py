@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from ..datastructures.bulk import paused_gc
+from ..datastructures.keys import ip_to_key, key_to_ip, subnet_bounds
+from ..datastructures.records import build_records
+from ..datastructures.splay_tree import SplayTree
+
+# Format snapshot (little-endian):
+#
+#   header  : magic, versi, lebar key (byte), jumlah device, ukuran heap
+#   highs   : count x uint64, 64 bit atas key 128-bit
+#   lows    : count x uint64, 64 bit bawah key; (high, low) terurut naik
+#             tanpa duplikat
+#   flags   : count x uint8, bit 0 = ada packet, bit 1 = ada nama device
+#             (lalu padding sampai kelipatan 4 byte)
+#   updated : count x uint32, waktu update terakhir (detik epoch)
+#   offsets : (2 x count + 1) x uint32, awal string ke-j di heap; string
+#             ke-2i adalah packet device i dan ke-2i+1 adalah namanya
+#   heap    : semua string UTF-8 disambung tanpa pemisah
+
+SNAPSHOT_MAGIC: bytes = b"IPFSNAP\x00"
+SNAPSHOT_VERSION: int = 3
+KEY_WIDTH: int = 16
+_LOW_MASK = (1 << 64) - 1
+_HEADER = struct.Struct("<8sHHIQ")
+_HAS_PACKET = 1
+_HAS_NAME = 2
+_MAX_HEAP = (1 << 32) - 1
+# Per bit flag: semua nilai byte flag yang memiliki bit itu
+_WITH_BIT = {bit: bytes(flag for flag in range(256) if flag & bit) for bit in (_HAS_PACKET, _HAS_NAME)}
+
+SnapshotRow = Tuple[int, Optional[str], Optional[str], int]
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class SnapshotRecord:
+    # Satu device yang dibaca langsung dari file snapshot
+
+    key: int
+    data_packet: Optional[str]
+    name: Optional[str]
+    updated_at: int
+
+    @property
+    def ip_address(self) -> str:
+        return key_to_ip(self.key)
+
+
+def _pad(length: int) -> int:
+    return -length % 4
+
+
+def _all_have(flags: bytes, bit: int) -> bool:
+    # Semua device punya field `bit`: tidak ada byte yang tersisa setelah
+    # byte yang memiliki bit itu dihapus (dikerjakan di C, tanpa loop Python)
+    return not flags.translate(None, _WITH_BIT[bit])
+
+
+def tree_rows(tree: SplayTree) -> Iterator[SnapshotRow]:
+    # Baris snapshot dari tree, sudah terurut berdasarkan key
+    for node in tree.iter_inorder():
+        record = node.record
+        yield node.key, record.data_packet, record.name, record.updated_at
+
+
+def save_snapshot(path: str, rows: Iterable[SnapshotRow]) -> int:
+    """
+    Tulis snapshot secara atomik (file sementara lalu os.replace).
+
+    Args:
+        path: Lokasi file snapshot
+        rows: (key, packet, nama, waktu update) terurut naik berdasarkan key
+
+    Returns:
+        int: Jumlah device yang ditulis
+    """
+    highs = array("Q")
+    lows = array("Q")
+    flags = bytearray()
+    updated = array("I")
+    offsets = array("I", [0])
+    heap = bytearray()
+    previous = -1
+    for key, data_packet, name, updated_at in rows:
+        if key <= previous:
+            raise SnapshotError("Baris snapshot harus terurut naik tanpa duplikat")
+        previous = key
+        highs.append(key >> 64)
+        lows.append(key & _LOW_MASK)
+        updated.append(updated_at)
+        flag = 0
+        for bit, text in ((_HAS_PACKET, data_packet), (_HAS_NAME, name)):
+            if text is not None:
+                flag |= bit
+                heap += text.encode("utf-8")
+            offsets.append(len(heap))
+        flags.append(flag)
+    if len(heap) > _MAX_HEAP:
+        raise SnapshotError("Heap string snapshot melebihi 4 GiB")
+    if sys.byteorder != "little":
+        highs.byteswap()
+        lows.byteswap()
+        updated.byteswap()
+        offsets.byteswap()
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, KEY_WIDTH, len(lows), len(heap)))
+        handle.write(highs.tobytes())
+        handle.write(lows.tobytes())
+        handle.write(flags)
+        handle.write(bytes(_pad(len(flags))))
+        handle.write(updated.tobytes())
+        handle.write(offsets.tobytes())
+        handle.write(heap)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+    return len(lows)
+
+
+class SnapshotReader:
+    """
+    Pembaca snapshot berbasis mmap.
+
+    Membuka file hanya memetakan dan memvalidasi header, O(1) berapapun
+    jumlah device. Lookup (search, range, count) dilayani langsung dari file
+    lewat binary search pada kolom key, sehingga data bisa dibaca sebelum
+    tree selesai dibangun. load_into() mengisi SplayTree kosong lewat bulk
+    build O(n) tanpa parse IP maupun sort ulang.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.search_count = 0
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            if size < _HEADER.size:
+                raise SnapshotError(f"File snapshot terlalu pendek: {path}")
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, key_width, count, heap_size = _HEADER.unpack_from(self._map, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise SnapshotError(f"Bukan file snapshot IP Address Finder: {path}")
+        if version != SNAPSHOT_VERSION or key_width != KEY_WIDTH:
+            self.close()
+            raise SnapshotError(f"Versi snapshot tidak didukung: {version} (key {key_width} byte)")
+
+        keys_start = _HEADER.size
+        lows_start = keys_start + count * 8
+        flags_start = keys_start + count * KEY_WIDTH
+        updated_start = flags_start + count + _pad(count)
+        offsets_start = updated_start + count * 4
+        heap_start = offsets_start + (2 * count + 1) * 4
+        if heap_start + heap_size != size:
+            self.close()
+            raise SnapshotError(f"Ukuran file snapshot tidak cocok dengan header: {path}")
+
+        self._count = count
+        view = memoryview(self._map)
+        self._flags = view[flags_start:updated_start]
+        self._heap = view[heap_start:]
+        if sys.byteorder == "little":
+            self._highs = view[keys_start:lows_start].cast("Q")
+            self._lows = view[lows_start:flags_start].cast("Q")
+            self._updated = view[updated_start:offsets_start].cast("I")
+            self._offsets = view[offsets_start:heap_start].cast("I")
+        else:
+            # Host big-endian: salin lalu balik urutan byte
+            self._highs = array("Q", view[keys_start:lows_start].tobytes())
+            self._lows = array("Q", view[lows_start:flags_start].tobytes())
+            self._updated = array("I", view[updated_start:offsets_start].tobytes())
+            self._offsets = array("I", view[offsets_start:heap_start].tobytes())
+            self._highs.byteswap()
+            self._lows.byteswap()
+            self._updated.byteswap()
+            self._offsets.byteswap()
+
+    def close(self) -> None:
+        for name in ("_highs", "_lows", "_updated", "_offsets", "_flags", "_heap"):
+            view = getattr(self, name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        if not self._map.closed:
+            self._map.close()
+
+    def __enter__(self) -> "SnapshotReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def size(self) -> int:
+        return self._count
+
+
+    def _string(self, index: int, bit: int) -> Optional[str]:
+        if not self._flags[index // 2] & bit:
+            return None
+        return str(self._heap[self._offsets[index]:self._offsets[index + 1]], "utf-8")
+
+    def record(self, position: int) -> SnapshotRecord:
+        return SnapshotRecord(
+            self._key(position),
+            self._string(2 * position, _HAS_PACKET),
+            self._string(2 * position + 1, _HAS_NAME),
+            self._updated[position],
+        )
+
+    def _key(self, position: int) -> int:
+        return (self._highs[position] << 64) | self._lows[position]
+
+    def _bisect(self, key: int, right: bool = False) -> int:
+        # bisect_left/right atas key 128-bit tanpa membuat int per posisi:
+        # cari dulu rentang word high yang sama, lalu bisect word low di dalamnya
+        find = bisect_right if right else bisect_left
+        high = key >> 64
+        start = bisect_left(self._highs, high)
+        stop = bisect_right(self._highs, high, start)
+        return find(self._lows, key & _LOW_MASK, start, stop)
+
+    def _position(self, key: int) -> int:
+        position = self._bisect(key)
+        if position < self._count and self._key(position) == key:
+            return position
+        return -1
+
+    def search(self, ip_address: str) -> Optional[SnapshotRecord]:
+        self.search_count += 1
+        key = SplayTree._lookup_key(ip_address)
+        if key is None:
+            return None
+        position = self._position(key)
+        return None if position < 0 else self.record(position)
+
+    def search_many(self, ip_addresses: Iterable[str], policy: object = None) -> List[Optional[SnapshotRecord]]:
+        return [self.search(ip_address) for ip_address in ip_addresses]
+
+    def records(self) -> Iterator[SnapshotRecord]:
+        # Semua device terurut berdasarkan key, dibaca satu per satu dari file
+        return (self.record(position) for position in range(self._count))
+
+    def _key_range(self, low: int, high: int) -> Iterator[SnapshotRecord]:
+        start = self._bisect(low)
+        stop = self._bisect(high, right=True)
+        return (self.record(position) for position in range(start, stop))
+
+    def range(self, low_ip: str, high_ip: str) -> Iterator[SnapshotRecord]:
+        return self._key_range(ip_to_key(low_ip), ip_to_key(high_ip))
+
+    def in_subnet(self, cidr: str) -> Iterator[SnapshotRecord]:
+        return self._key_range(*subnet_bounds(cidr))
+
+    def _count_key_range(self, low: int, high: int) -> int:
+        if low > high:
+            return 0
+        return self._bisect(high, right=True) - self._bisect(low)
+
+    def count_range(self, low_ip: str, high_ip: str) -> int:
+        return self._count_key_range(ip_to_key(low_ip), ip_to_key(high_ip))
+
+    def count_subnet(self, cidr: str) -> int:
+        return self._count_key_range(*subnet_bounds(cidr))
+
+    def _strings(self, parity: int, bit: int) -> List[Optional[str]]:
+        # Decode semua packet (parity 0) atau semua nama (parity 1) sekaligus
+        heap = self._heap.tobytes()
+        offsets = self._offsets.tolist()
+        starts = offsets[parity:-1:2]
+        ends = offsets[parity + 1::2]
+        flags = self._flags.tobytes()
+        if _all_have(flags, bit):
+            # Bit ini ada di semua device (umumnya packet): tanpa cek flag
+            return [heap[start:end].decode("utf-8") for start, end in zip(starts, ends)]
+        return [
+            heap[start:end].decode("utf-8") if flag & bit else None
+            for start, end, flag in zip(starts, ends, flags)
+        ]
+
+    def _keys(self) -> List[int]:
+        lows = self._lows.tolist()
+        highs = self._highs.tolist()
+        if not any(highs):
+            # Hanya IPv4 (dan IPv6 di bawah 2**64): word low sudah key utuh
+            return lows
+        return [(high << 64) | low for high, low in zip(highs, lows)]
+
+    def load_into(self, tree: SplayTree) -> None:
+        if tree.size:
+            raise SnapshotError("Snapshot hanya bisa dimuat ke tree kosong")
+        with paused_gc():
+            records = build_records(
+                self._strings(0, _HAS_PACKET), self._strings(1, _HAS_NAME), self._updated.tolist()
+            )
+            tree._load_sorted(self._keys(), records)
+        tree.search_count += self.search_count
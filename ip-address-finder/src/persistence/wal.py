@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import os
+import struct
+import time
+import zlib
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+from ..datastructures.bounded_splay_tree import BoundedSplayTree
+from ..datastructures.keys import IPV4_FIRST_KEY, is_ipv4_key, key_to_ip
+from ..datastructures.records import DeviceRecord
+from ..datastructures.splay_tree import SplayTree
+from .snapshot import SnapshotReader, save_snapshot, tree_rows
+
+# File log: magic lalu deretan frame [panjang payload, crc32 payload, payload].
+# Payload: kode operasi (uint8), key, lalu untuk insert record: flag (bit 0
+# packet, bit 1 nama), waktu update (uint32), panjang packet (uint32),
+# packet UTF-8 lalu nama UTF-8. Key IPv4 ditulis sebagai uint32 (kode 1-2),
+# key lain sebagai dua uint64 high dan low (kode 3-4), jadi log IPv4 tidak
+# bertambah besar.
+# Frame yang terpotong atau crc-nya salah di ujung file (crash saat menulis)
+# dibuang saat recovery.
+WAL_MAGIC: bytes = b"IPFWAL\x00\x01"
+_FRAME = struct.Struct("<II")
+_OPERATION = struct.Struct("<BI")
+_WIDE_OPERATION = struct.Struct("<BQQ")
+_RECORD = struct.Struct("<BII")
+_INSERT = 1
+_DELETE = 2
+_INSERT_WIDE = 3
+_DELETE_WIDE = 4
+_LOW_MASK = (1 << 64) - 1
+_HAS_PACKET = 1
+_HAS_NAME = 2
+
+LogRecord = Tuple[int, int, Optional[DeviceRecord]]
+
+
+class WalError(ValueError):
+    pass
+
+
+def _encode_key(operation: int, wide_operation: int, key: int) -> bytes:
+    if is_ipv4_key(key):
+        return _OPERATION.pack(operation, key & ~IPV4_FIRST_KEY)
+    return _WIDE_OPERATION.pack(wide_operation, key >> 64, key & _LOW_MASK)
+
+
+def _decode_key(payload: bytes) -> Tuple[int, int, int]:
+    # (kode operasi, key, posisi awal data setelah key)
+    if payload[0] in (_INSERT_WIDE, _DELETE_WIDE):
+        operation, high, low = _WIDE_OPERATION.unpack_from(payload)
+        return operation, (high << 64) | low, _WIDE_OPERATION.size
+    operation, key = _OPERATION.unpack_from(payload)
+    return operation, IPV4_FIRST_KEY | key, _OPERATION.size
+
+
+def _encode_insert(key: int, record: DeviceRecord) -> bytes:
+    data_packet, name = record.data_packet, record.name
+    packet = b"" if data_packet is None else data_packet.encode("utf-8")
+    flags = (_HAS_PACKET if data_packet is not None else 0) | (_HAS_NAME if name is not None else 0)
+    return (
+        _encode_key(_INSERT, _INSERT_WIDE, key)
+        + _RECORD.pack(flags, record.updated_at, len(packet))
+        + packet
+        + (b"" if name is None else name.encode("utf-8"))
+    )
+
+
+def _decode_record(payload: bytes, start: int) -> DeviceRecord:
+    flags, updated_at, length = _RECORD.unpack_from(payload, start)
+    start += _RECORD.size
+    data_packet = payload[start:start + length].decode("utf-8") if flags & _HAS_PACKET else None
+    name = payload[start + length:].decode("utf-8") if flags & _HAS_NAME else None
+    return DeviceRecord(name, data_packet, updated_at)
+
+
+def _frame(payload: bytes) -> bytes:
+    return _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def _payloads(handle: BinaryIO, path: str) -> Iterator[bytes]:
+    # Payload frame yang valid satu per satu, berhenti di ekor yang rusak
+    if handle.read(len(WAL_MAGIC)) != WAL_MAGIC:
+        raise WalError(f"Bukan file write-ahead log IP Address Finder: {path}")
+    while True:
+        header = handle.read(_FRAME.size)
+        if len(header) < _FRAME.size:
+            return
+        length, checksum = _FRAME.unpack(header)
+        payload = handle.read(length)
+        if len(payload) < length or zlib.crc32(payload) != checksum or length < _OPERATION.size:
+            return
+        yield payload
+
+
+def read_log(path: str) -> Iterator[LogRecord]:
+    """
+    Baca record (operasi, key, record device atau None) dari file log.
+
+    Frame dibaca satu per satu dari file, jadi memori yang dipakai sebesar
+    satu frame, bukan seluruh log. Ekor yang rusak tidak ikut dibaca.
+    """
+    with open(path, "rb") as handle:
+        for payload in _payloads(handle, path):
+            operation, key, data_start = _decode_key(payload)
+            record: Optional[DeviceRecord] = None
+            if operation in (_INSERT, _INSERT_WIDE):
+                record = _decode_record(payload, data_start)
+            yield operation, key, record
+
+
+def log_end(path: str) -> int:
+    # Offset akhir frame valid terakhir; data setelahnya adalah ekor rusak
+    with open(path, "rb") as handle:
+        position = len(WAL_MAGIC)
+        for payload in _payloads(handle, path):
+            position += _FRAME.size + len(payload)
+    return position
+
+
+def replay(records: Iterator[LogRecord], tree: SplayTree) -> int:
+    # Insert bersifat upsert dan delete idempoten, jadi replay di atas
+    # snapshot yang sudah memuat sebagian record tetap menghasilkan state akhir yang sama
+    count = 0
+    for operation, key, record in records:
+        if record is not None:
+            tree.insert_record(key, record)
+        elif operation in (_DELETE, _DELETE_WIDE):
+            tree.delete(key_to_ip(key))
+        else:
+            raise WalError(f"Kode operasi log tidak dikenal: {operation}")
+        count += 1
+    return count
+
+
+def log_path(snapshot_path: str) -> str:
+    # Log milik sebuah snapshot selalu berada di sampingnya
+    return f"{snapshot_path}.wal"
+
+
+def has_log_records(snapshot_path: str) -> bool:
+    # Cek tanpa membuka log untuk ditulis; ekor rusak tidak dihitung
+    path = log_path(snapshot_path)
+    return os.path.exists(path) and os.path.getsize(path) > len(WAL_MAGIC)
+
+
+def restore(snapshot_path: str, tree: SplayTree) -> int:
+    """
+    Muat snapshot lalu replay log di sampingnya ke tree kosong, hanya baca.
+
+    Tidak ada file yang dibuat atau diubah, jadi aman untuk export dari
+    snapshot milik proses lain. Journal tree tidak dipasang.
+
+    Returns:
+        int: Jumlah record log yang di-replay
+    """
+    tree.journal = None
+    if os.path.exists(snapshot_path):
+        with SnapshotReader(snapshot_path) as snapshot:
+            snapshot.load_into(tree)
+    path = log_path(snapshot_path)
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return 0
+    # Delete saat replay memakai search; jangan dihitung sebagai pencarian
+    search_count = tree.search_count
+    with tree.paused_eviction() if isinstance(tree, BoundedSplayTree) else nullcontext():
+        replayed = replay(read_log(path), tree)
+    tree.search_count = search_count
+    return replayed
+
+
+class WriteAheadLog:
+    """
+    Log operasi append-only dengan group commit.
+
+    Record ditampung di buffer dan ditulis + fsync sekaligus saat buffer
+    mencapai `group_size` record, saat record tertua sudah menunggu lebih
+    dari `group_delay` detik, atau saat commit() dipanggil. Satu fsync
+    dipakai bersama oleh seluruh record di grup. Dipasang ke tree lewat
+    `tree.journal`.
+
+    Tidak ada timer: `group_delay` hanya dicek ketika record baru ditulis,
+    jadi record terakhir sebelum tree diam tetap di buffer. Pemanggil wajib
+    commit() di akhir setiap batch atau request sebelum melaporkan hasilnya
+    (GUI per job, TreeService per batch, server sebelum membalas).
+    """
+
+    def __init__(self, path: str, group_size: int = 512, group_delay: float = 0.01) -> None:
+        self.path = path
+        self.group_size = group_size
+        self.group_delay = group_delay
+        self._buffer = bytearray()
+        self._pending = 0
+        self._first_pending_at = 0.0
+
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, "wb") as handle:
+                handle.write(WAL_MAGIC)
+                handle.flush()
+                os.fsync(handle.fileno())
+        valid_end = log_end(path)
+        self._handle: BinaryIO = open(path, "r+b")
+        # Buang ekor rusak supaya record baru tidak ditulis setelah sampah
+        self._handle.truncate(valid_end)
+        self._handle.seek(valid_end)
+        self.size_bytes = valid_end
+
+    def log_insert(self, key: int, record: DeviceRecord) -> None:
+        self._append(_encode_insert(key, record))
+
+    def log_delete(self, key: int) -> None:
+        self._append(_encode_key(_DELETE, _DELETE_WIDE, key))
+
+    def _append(self, payload: bytes) -> None:
+        if not self._pending:
+            self._first_pending_at = time.monotonic()
+        self._buffer += _frame(payload)
+        self._pending += 1
+        if self._pending >= self.group_size or time.monotonic() - self._first_pending_at >= self.group_delay:
+            self.commit()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def has_records(self) -> bool:
+        return self.size_bytes + len(self._buffer) > len(WAL_MAGIC)
+
+    def commit(self) -> None:
+        if not self._buffer:
+            return
+        self._handle.write(self._buffer)
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self.size_bytes += len(self._buffer)
+        self._buffer.clear()
+        self._pending = 0
+
+    def reset(self) -> None:
+        # Dipanggil setelah compaction: semua record sudah ada di snapshot
+        self._buffer.clear()
+        self._pending = 0
+        self._handle.seek(len(WAL_MAGIC))
+        self._handle.truncate()
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+        self.size_bytes = len(WAL_MAGIC)
+
+    def close(self) -> None:
+        if not self._handle.closed:
+            self.commit()
+            self._handle.close()
+
+
+@dataclass
+class DurableStore:
+    """
+    Snapshot + write-ahead log untuk satu tabel device.
+
+    recover() memuat snapshot (bulk build), me-replay log, lalu memasang log
+    sebagai journal tree. Setelah log melewati `compact_bytes`, commit()
+    menulis snapshot baru dan mengosongkan log, jadi tidak ada dump penuh
+    untuk setiap perubahan.
+    """
+
+    snapshot_path: str
+    compact_bytes: int = 64 << 20
+    group_size: int = 512
+    group_delay: float = 0.01
+    wal: WriteAheadLog = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.wal = WriteAheadLog(self.wal_path, self.group_size, self.group_delay)
+
+    @property
+    def wal_path(self) -> str:
+        return log_path(self.snapshot_path)
+
+    def recover(self, tree: SplayTree) -> int:
+        """
+        Returns:
+            int: Jumlah record log yang di-replay
+        """
+        self.wal.commit()
+        replayed = restore(self.snapshot_path, tree)
+        self.attach(tree)
+        return replayed
+
+    def attach(self, tree: SplayTree) -> None:
+        tree.journal = self.wal
+
+    def commit(self, tree: Optional[SplayTree] = None) -> None:
+        self.wal.commit()
+        if tree is not None and self.wal.size_bytes >= self.compact_bytes:
+            self.compact(tree)
+
+    def compact(self, tree: SplayTree) -> int:
+        # Urutan aman: log di-fsync, snapshot diganti atomik, baru log dikosongkan.
+        # Crash di antaranya hanya membuat log di-replay ulang (idempoten).
+        self.wal.commit()
+        count = save_snapshot(self.snapshot_path, tree_rows(tree))
+        self.wal.reset()
+        return count
+
+    def close(self) -> None:
+        self.wal.close()
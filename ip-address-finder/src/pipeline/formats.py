@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+# Satu baris device di file import/export: (nama, ip, packet)
+DeviceRow = Tuple[Optional[str], str, Optional[str]]
+
+FORMATS: Tuple[str, ...] = ("csv", "jsonl")
+CSV_COLUMNS: Tuple[str, ...] = ("name", "ip", "packet")
+_EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+_decode = json.JSONDecoder().decode
+
+
+class FormatError(ValueError):
+    pass
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    if fmt is not None:
+        if fmt not in FORMATS:
+            raise FormatError(f"Format tidak didukung: {fmt!r} (pilih {', '.join(FORMATS)})")
+        return fmt
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _EXTENSIONS:
+        raise FormatError(f"Format file tidak dikenali dari ekstensi: {path!r} (pakai .csv atau .jsonl)")
+    return _EXTENSIONS[extension]
+
+
+@dataclass
+class RowChunk:
+    # Baris yang sudah dipisah per kolom, belum divalidasi IP-nya
+
+    lines: List[int] = field(default_factory=list)
+    names: List[Optional[str]] = field(default_factory=list)
+    ips: List[str] = field(default_factory=list)
+    packets: List[Optional[str]] = field(default_factory=list)
+    # (nomor baris, pesan) untuk baris yang rusak sebelum sampai validasi IP
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    # Posisi byte di file setelah chunk ini, untuk progress
+    position: int = 0
+
+    def __len__(self) -> int:
+        return len(self.ips)
+
+
+def _optional(value: Optional[str]) -> Optional[str]:
+    # Sel kosong berarti tidak ada nama/packet
+    if value is None:
+        return None
+    value = value.strip()
+    return value or None
+
+
+def _optional_column(values: Iterable[str]) -> List[Optional[str]]:
+    return [value or None for value in map(str.strip, values)]
+
+
+def _csv_chunks(handle: io.TextIOWrapper, chunk_size: int) -> Iterator[RowChunk]:
+    reader = csv.reader(handle)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [column.strip().lower() for column in header]
+    if "ip" not in columns:
+        raise FormatError(f"Header CSV harus punya kolom 'ip' (ditemukan: {', '.join(header)})")
+    ip_index = columns.index("ip")
+    name_index = columns.index("name") if "name" in columns else None
+    packet_index = columns.index("packet") if "packet" in columns else None
+    width = len(columns)
+
+    while True:
+        chunk = RowChunk()
+        rows: List[List[str]] = []
+        # Nomor baris dicatat per record karena field ber-quote bisa berisi newline
+        for cells in islice(reader, chunk_size):
+            rows.append(cells)
+            chunk.lines.append(reader.line_num)
+        if not rows:
+            return
+        if set(map(len, rows)) != {width}:
+            # Ada baris kosong atau jumlah kolom salah: pisahkan dulu
+            valid_rows: List[List[str]] = []
+            lines: List[int] = []
+            for line, cells in zip(chunk.lines, rows):
+                if len(cells) == width:
+                    valid_rows.append(cells)
+                    lines.append(line)
+                elif cells:
+                    chunk.errors.append((line, f"Jumlah kolom {len(cells)}, seharusnya {width}"))
+            rows, chunk.lines = valid_rows, lines
+        if rows:
+            # Transpose baris ke kolom di C lalu olah per kolom
+            table = list(zip(*rows))
+            chunk.ips = list(map(str.strip, table[ip_index]))
+            chunk.names = _optional_column(table[name_index]) if name_index is not None else [None] * len(rows)
+            chunk.packets = _optional_column(table[packet_index]) if packet_index is not None else [None] * len(rows)
+        yield chunk
+
+
+def _jsonl_record(record: object) -> Optional[str]:
+    # Pesan error untuk record yang strukturnya salah, None jika valid
+    if not isinstance(record, dict):
+        return "Baris JSONL harus berupa object"
+    if not isinstance(record.get("ip"), str):
+        return "Field 'ip' wajib berupa string"
+    name, packet = record.get("name"), record.get("packet")
+    if not (name is None or isinstance(name, str)) or not (packet is None or isinstance(packet, str)):
+        return "Field 'name' dan 'packet' harus string atau null"
+    return None
+
+
+def _jsonl_chunks(handle: io.TextIOWrapper, chunk_size: int) -> Iterator[RowChunk]:
+    first_line = 1
+    while True:
+        texts = list(islice(handle, chunk_size))
+        if not texts:
+            return
+        chunk = RowChunk()
+        records: List[dict] = []
+        try:
+            # Setiap baris di-decode sendiri (lewat map, tanpa loop Python): menggabungkan
+            # baris jadi satu array bisa menerima dua baris rusak sebagai satu record
+            decoded = list(map(_decode, texts))
+        except ValueError:
+            decoded = None
+        if decoded is not None and not any(map(_jsonl_record, decoded)):
+            records = decoded
+            chunk.lines = list(range(first_line, first_line + len(texts)))
+        else:
+            # Ada baris rusak atau kosong: decode per baris untuk tahu yang mana
+            for line, text in enumerate(texts, start=first_line):
+                if not text.strip():
+                    continue
+                try:
+                    record = json.loads(text)
+                except ValueError as exc:
+                    chunk.errors.append((line, f"JSON tidak valid: {exc}"))
+                    continue
+                message = _jsonl_record(record)
+                if message is not None:
+                    chunk.errors.append((line, message))
+                    continue
+                records.append(record)
+                chunk.lines.append(line)
+        first_line += len(texts)
+        chunk.ips = [record["ip"].strip() for record in records]
+        chunk.names = [_optional(record.get("name")) for record in records]
+        chunk.packets = [_optional(record.get("packet")) for record in records]
+        yield chunk
+
+
+def read_chunks(path: str, fmt: Optional[str] = None, chunk_size: int = 50_000) -> Iterator[RowChunk]:
+    """
+    Baca file device CSV/JSONL secara streaming, `chunk_size` baris per chunk.
+
+    Memori yang dipakai hanya sebesar satu chunk, berapapun ukuran file.
+    Baris yang strukturnya rusak dicatat di RowChunk.errors.
+    """
+    read = _csv_chunks if detect_format(path, fmt) == "csv" else _jsonl_chunks
+    with open(path, "rb") as raw:
+        handle = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        for chunk in read(handle, chunk_size):
+            chunk.position = raw.tell()
+            yield chunk
+
+
+def _write_csv(handle: io.TextIOWrapper, rows: Iterable[List[DeviceRow]]) -> Iterator[int]:
+    writer = csv.writer(handle, lineterminator="\n")
+    writer.writerow(CSV_COLUMNS)
+    for batch in rows:
+        writer.writerows(
+            ("" if name is None else name, ip_address, "" if packet is None else packet)
+            for name, ip_address, packet in batch
+        )
+        yield len(batch)
+
+
+def _write_jsonl(handle: io.TextIOWrapper, rows: Iterable[List[DeviceRow]]) -> Iterator[int]:
+    for batch in rows:
+        handle.write(
+            "".join(
+                _encode({"name": name, "ip": ip_address, "packet": packet}) + "\n"
+                for name, ip_address, packet in batch
+            )
+        )
+        yield len(batch)
+
+
+def write_rows(
+    path: str,
+    batches: Iterable[List[DeviceRow]],
+    fmt: Optional[str] = None,
+    on_batch: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Tulis device ke CSV/JSONL secara atomik (file sementara lalu os.replace).
+
+    Args:
+        batches: Baris device yang sudah dikelompokkan per batch
+        on_batch: Dipanggil dengan jumlah baris yang sudah ditulis setelah setiap batch
+
+    Returns:
+        int: Jumlah baris yang ditulis
+    """
+    write = _write_csv if detect_format(path, fmt) == "csv" else _write_jsonl
+    temporary = f"{path}.tmp"
+    written = 0
+    try:
+        with open(temporary, "wb") as raw:
+            handle = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+            for count in write(handle, batches):
+                written += count
+                if on_batch is not None:
+                    on_batch(written)
+            handle.flush()
+            os.fsync(raw.fileno())
+            handle.detach()
+    except BaseException:
+        # Export gagal atau dibatalkan: jangan tinggalkan file setengah jadi
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+    os.replace(temporary, path)
+    return written
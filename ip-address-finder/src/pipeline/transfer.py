@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from ..config.settings import IMPORT_CHUNK_SIZE, IMPORT_MAX_ERRORS
+from ..datastructures.bulk import paused_gc, sorted_unique_keys
+from ..datastructures.records import DeviceRecord, build_records
+from ..datastructures.splay_tree import SplayTree
+from ..net.address import validate_ip_batch
+from ..persistence.wal import DurableStore
+from .formats import DeviceRow, read_chunks, write_rows
+
+# Sisa insert satu per satu lebih mahal dari membangun ulang tree (O(n + m))
+# kalau jumlah device baru lebih dari 1/REBUILD_RATIO isi tree
+REBUILD_RATIO: int = 4
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    added: int = 0
+    # Device yang sudah ada di tree sebelum import lalu diganti datanya
+    updated: int = 0
+    # Baris valid yang IP-nya muncul lagi di baris setelahnya dalam file yang sama
+    duplicates: int = 0
+    rejected: int = 0
+    # Hanya IMPORT_MAX_ERRORS error pertama yang disimpan
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    bytes_read: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        megabytes_per_second = self.bytes_read / self.seconds / (1 << 20) if self.seconds else 0.0
+        return (
+            f"{self.rows} baris: {self.added} device baru, {self.updated} diupdate, "
+            f"{self.duplicates} duplikat, {self.rejected} ditolak dalam {self.seconds:.2f} detik "
+            f"({self.rows_per_second:,.0f} baris/detik, {megabytes_per_second:.1f} MB/detik)"
+        )
+
+    def _reject(self, line: int, message: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append((line, message))
+
+
+Run = Tuple[List[int], List[DeviceRecord]]
+
+
+def _merge_runs(older: Run, newer: Run) -> Run:
+    # Merge linear dua run terurut tanpa duplikat; key yang sama diambil dari run baru
+    old_keys, old_records = older
+    new_keys, new_records = newer
+    keys: List[int] = []
+    records: List[DeviceRecord] = []
+    i = j = 0
+    while i < len(old_keys) and j < len(new_keys):
+        old_key, new_key = old_keys[i], new_keys[j]
+        if old_key < new_key:
+            keys.append(old_key)
+            records.append(old_records[i])
+            i += 1
+        else:
+            keys.append(new_key)
+            records.append(new_records[j])
+            j += 1
+            if old_key == new_key:
+                i += 1
+    keys.extend(old_keys[i:])
+    records.extend(old_records[i:])
+    keys.extend(new_keys[j:])
+    records.extend(new_records[j:])
+    return keys, records
+
+
+class BulkLoader:
+    """
+    Menampung device hasil validasi lalu memasukkannya ke tree sekaligus.
+    Device dengan IP yang sudah ada diganti seluruh datanya.
+
+    Setiap chunk langsung diurutkan, di-dedupe dan dijadikan record, lalu
+    digabung ke run terurut yang sudah ada. Ukuran run dijaga menurun
+    seperti counter biner, jadi total merge O(m log k) untuk k chunk dan
+    memori yang ditahan sebanding dengan jumlah device unik (yang memang
+    akan masuk tree), bukan jumlah baris. Tree baru diubah di finish(),
+    sehingga import yang dibatalkan di tengah jalan tidak meninggalkan
+    sisa.
+
+    Tree kosong dibangun lewat bulk build O(n). Jika device baru cukup banyak
+    dibanding isi tree, tree dibangun ulang dari gabungan keduanya (O(n + m));
+    sisanya di-insert satu per satu dalam urutan key naik supaya splay
+    berikutnya mulai dekat dengan root. Jika tree punya journal, setiap
+    device yang dimasukkan ikut dicatat, termasuk lewat bulk build.
+    """
+
+    def __init__(self, tree: SplayTree) -> None:
+        self.tree = tree
+        self._runs: List[Run] = []
+        self._accepted = 0
+
+    def __len__(self) -> int:
+        # Jumlah baris yang diterima, termasuk IP yang muncul lebih dari sekali
+        return self._accepted
+
+    def add(self, keys: List[int], packets: List[Optional[str]], names: List[Optional[str]]) -> None:
+        self._accepted += len(keys)
+        # Dedupe lewat posisi baris, lalu packet dan nama diambil per posisi
+        unique_keys, rows = sorted_unique_keys(keys, range(len(keys)))
+        if not unique_keys:
+            return
+        run: Run = (unique_keys, build_records([packets[row] for row in rows], [names[row] for row in rows]))
+        while self._runs and len(self._runs[-1][0]) <= len(run[0]):
+            run = _merge_runs(self._runs.pop(), run)
+        self._runs.append(run)
+
+    def finish(self) -> Tuple[int, int]:
+        """
+        Returns:
+            tuple: (device baru, device lama yang datanya diganti)
+        """
+        tree = self.tree
+        if not self._runs:
+            return 0, 0
+        # Merge dan bulk build membuat jutaan objek tanpa siklus; GC dijeda di sini saja
+        with paused_gc():
+            keys, records = self._runs.pop()
+            while self._runs:
+                keys, records = _merge_runs(self._runs.pop(), (keys, records))
+            if tree.size and len(keys) * REBUILD_RATIO < tree.size:
+                added = 0
+                for key, record in zip(keys, records):
+                    added += tree.insert_record(key, record)
+                return added, len(keys) - added
+
+            # Bulk build tidak lewat insert_record, jadi journal diisi di sini
+            journal = tree.journal
+            if journal is not None:
+                for key, record in zip(keys, records):
+                    journal.log_insert(key, record)
+            if tree.size == 0:
+                tree._load_sorted(keys, records)
+                return len(keys), 0
+            before = tree.size
+            latest = {node.key: node.record for node in tree.iter_inorder()}
+            latest.update(zip(keys, records))
+            # Dua run terurut (isi lama lalu key baru): sort Timsort cukup merge linear
+            merged = sorted(latest)
+            tree._load_sorted(merged, [latest[key] for key in merged])
+            added = len(merged) - before
+            return added, len(keys) - added
+
+
+def import_devices(
+    path: str,
+    tree: SplayTree,
+    fmt: Optional[str] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    on_progress: Optional[Callable[[int], None]] = None,
+    store: Optional[DurableStore] = None,
+) -> ImportReport:
+    """
+    Import device dari file CSV/JSONL ke tree.
+
+    File dibaca dan divalidasi per chunk, jadi memori di luar tree tetap
+    kecil untuk file sebesar apapun. Baris yang tidak valid dilewati dan
+    dicatat di report.
+
+    Args:
+        on_progress: Dipanggil dengan jumlah byte yang sudah dibaca setelah
+            setiap chunk; boleh melempar exception untuk membatalkan import
+            sebelum tree diubah
+        store: DurableStore milik tree. Jika diisi, import tidak ditulis ke
+            log satu per satu; store langsung di-compact menjadi snapshot
+            baru. Tanpa store, device dicatat lewat tree.journal (jika ada)
+    """
+    report = ImportReport()
+    loader = BulkLoader(tree)
+    start = time.perf_counter()
+    for chunk in read_chunks(path, fmt, chunk_size):
+        for line, message in chunk.errors:
+            report._reject(line, message)
+        report.rows += len(chunk) + len(chunk.errors)
+        report.bytes_read = chunk.position
+
+        keys, errors = validate_ip_batch(chunk.ips)
+        names, packets = chunk.names, chunk.packets
+        if errors:
+            invalid = {exc.index for exc in errors}
+            for exc in errors:
+                report._reject(chunk.lines[exc.index], f"{exc.reason} (kolom {exc.position + 1}): {exc.text!r}")
+            names = [name for index, name in enumerate(names) if index not in invalid]
+            packets = [packet for index, packet in enumerate(packets) if index not in invalid]
+        loader.add(keys, packets, names)
+        if on_progress is not None:
+            on_progress(chunk.position)
+
+    if store is None:
+        report.added, report.updated = loader.finish()
+    else:
+        journal = tree.journal
+        tree.journal = None
+        try:
+            report.added, report.updated = loader.finish()
+        finally:
+            tree.journal = journal
+        store.compact(tree)
+    report.duplicates = len(loader) - report.added - report.updated
+    report.errors.sort()
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def device_rows(nodes: Iterable[object], batch_size: int = IMPORT_CHUNK_SIZE) -> Iterator[List[DeviceRow]]:
+    # Node tree atau SnapshotRecord -> baris export, dikelompokkan per batch
+    iterator = iter(nodes)
+    while True:
+        batch = [
+            (node.name, node.ip_address, node.data_packet)  # type: ignore[attr-defined]
+            for node in islice(iterator, batch_size)
+        ]
+        if not batch:
+            return
+        yield batch
+
+
+def export_devices(
+    path: str,
+    nodes: Iterable[object],
+    fmt: Optional[str] = None,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Export device (node tree atau record snapshot) ke file CSV/JSONL.
+
+    Baris ditulis per batch selama traversal inorder, jadi hasilnya terurut
+    berdasarkan IP dan memori tidak bertambah dengan jumlah device.
+
+    Returns:
+        int: Jumlah device yang ditulis
+    """
+    return write_rows(path, device_rows(nodes), fmt, on_progress)
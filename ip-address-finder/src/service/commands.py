@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+
+from ..datastructures.nodes import BaseNode
+from ..datastructures.routing_table import Route, RoutingTable
+from ..datastructures.splay_tree import SplayTree
+from ..persistence.snapshot import SnapshotReader, SnapshotRecord, save_snapshot, tree_rows
+from ..persistence.wal import DurableStore
+
+
+class CommandError(Exception):
+    # Request ditolak (op tidak dikenal / argumen salah); dikirim balik ke client
+    pass
+
+
+def _node_result(node: Union[BaseNode, SnapshotRecord, None]) -> Optional[Dict[str, Any]]:
+    if node is None:
+        return None
+    return {"ip": node.ip_address, "packet": node.data_packet, "name": node.name, "updated_at": node.updated_at}
+
+
+def _route_result(route: Optional[Route]) -> Optional[Dict[str, Any]]:
+    if route is None:
+        return None
+    return {"cidr": route.cidr, "packet": route.data_packet}
+
+
+def _argument(request: Mapping[str, Any], name: str, expected: type = str) -> Any:
+    try:
+        value = request[name]
+    except KeyError:
+        raise CommandError(f"Argumen '{name}' wajib diisi") from None
+    if not isinstance(value, expected):
+        raise CommandError(f"Argumen '{name}' harus bertipe {expected.__name__}")
+    if isinstance(value, str):
+        # JSON boleh berisi surrogate tunggal, tetapi log dan snapshot menyimpan UTF-8
+        try:
+            value.encode("utf-8")
+        except UnicodeEncodeError:
+            raise CommandError(f"Argumen '{name}' bukan teks UTF-8 yang valid") from None
+    return value
+
+
+def _optional_text(request: Mapping[str, Any], name: str) -> Optional[str]:
+    if request.get(name) is None:
+        return None
+    return _argument(request, name)
+
+
+@dataclass
+class TreeService:
+    """
+    Dispatcher perintah service ke SplayTree.
+
+    Setiap request adalah dict dengan field "op" dan argumennya, hasilnya
+    dict {"id", "ok", "result"} atau {"id", "ok": False, "error"}. Tidak ada
+    I/O di sini, jadi bisa dipakai dari server asyncio maupun langsung.
+
+    Jika `snapshot` diisi, operasi baca dilayani langsung dari file snapshot
+    yang di-mmap; tree baru dibangun dari snapshot saat operasi tulis
+    pertama datang (atau saat materialize() dipanggil). Jika `store` diisi,
+    tree dipulihkan lewat store (snapshot + replay log) dan setiap perubahan
+    dicatat di write-ahead log; commit() dipanggil di akhir setiap batch.
+
+    Route CIDR disimpan di `routes` (RoutingTable) dan dijawab dengan
+    longest-prefix match lewat op "route". Route hanya ada di memori; tidak
+    ikut snapshot maupun write-ahead log.
+    """
+
+    tree: SplayTree
+    range_limit: int
+    snapshot: Optional[SnapshotReader] = None
+    snapshot_path: Optional[str] = None
+    store: Optional[DurableStore] = None
+    routes: RoutingTable = field(default_factory=RoutingTable)
+    _handlers: Dict[str, Callable[[Mapping[str, Any]], Any]] = field(
+        init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self._handlers = {
+            "ping": lambda request: "pong",
+            "insert": self._insert,
+            "search": self._search,
+            "search_many": self._search_many,
+            "delete": self._delete,
+            "update": self._update,
+            "range": self._range,
+            "subnet": self._subnet,
+            "count": self._count,
+            "stats": self._stats,
+            "save": self._save,
+            "route_add": self._route_add,
+            "route_delete": self._route_delete,
+            "route": self._route,
+            "routes": self._routes,
+        }
+
+    def handle(self, request: Any) -> Dict[str, Any]:
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict):
+                raise CommandError("Request harus berupa object JSON")
+            op = _argument(request, "op")
+            handler = self._handlers.get(op)
+            if handler is None:
+                raise CommandError(f"Operasi tidak dikenal: {op}")
+            result = handler(request)
+        except (CommandError, ValueError, IndexError) as exc:
+            return {"id": request_id, "ok": False, "error": str(exc)}
+        except OSError as exc:
+            # Gagal baca/tulis file (save, materialize, log): service tetap jalan
+            return {"id": request_id, "ok": False, "error": f"Gagal mengakses file: {exc}"}
+        return {"id": request_id, "ok": True, "result": result}
+
+    def _source(self) -> Any:
+        # Sumber operasi baca: snapshot selama tree belum dibangun
+        return self.snapshot if self.snapshot is not None else self.tree
+
+    def materialize(self) -> SplayTree:
+        if self.snapshot is not None:
+            if self.store is not None:
+                # Reader ditutup dulu; store memuat snapshot yang sama lalu me-replay log
+                self.snapshot.close()
+                self.store.recover(self.tree)
+            else:
+                self.snapshot.load_into(self.tree)
+                self.snapshot.close()
+            self.snapshot = None
+        return self.tree
+
+    def commit(self) -> None:
+        # Group commit: satu fsync untuk semua perubahan di batch request ini
+        if self.store is not None and self.snapshot is None:
+            self.store.commit(self.tree)
+
+    def _insert(self, request: Mapping[str, Any]) -> Dict[str, bool]:
+        created = self.materialize().insert(
+            _argument(request, "ip"), _optional_text(request, "packet"), _optional_text(request, "name")
+        )
+        return {"created": created}
+
+    def _search(self, request: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        return _node_result(self._source().search(_argument(request, "ip")))
+
+    def _search_many(self, request: Mapping[str, Any]) -> List[Optional[Dict[str, Any]]]:
+        ips = _argument(request, "ips", list)
+        if not all(isinstance(ip_address, str) for ip_address in ips):
+            raise CommandError("Argumen 'ips' harus berisi string")
+        return [_node_result(node) for node in self._source().search_many(ips)]
+
+    def _delete(self, request: Mapping[str, Any]) -> Dict[str, bool]:
+        return {"deleted": self.materialize().delete(_argument(request, "ip"))}
+
+    def _update(self, request: Mapping[str, Any]) -> Dict[str, Any]:
+        old_ip = _argument(request, "ip")
+        self.materialize()
+        new_ip = _optional_text(request, "new_ip")
+        # Sama seperti GUI: IP baru tidak boleh menimpa device lain
+        if new_ip is not None:
+            existing = self.tree.peek(new_ip)
+            if existing is not None and existing is not self.tree.peek(old_ip):
+                raise CommandError(f"IP Address {new_ip} sudah digunakan device lain")
+        success, old_ip_changed, old_packet = self.tree.update(
+            old_ip, new_ip, _optional_text(request, "packet"), _optional_text(request, "name")
+        )
+        return {"updated": success, "old_ip": old_ip_changed, "old_packet": old_packet}
+
+    def _limit(self, request: Mapping[str, Any]) -> int:
+        limit = request.get("limit", self.range_limit)
+        if not isinstance(limit, int) or limit < 0:
+            raise CommandError("limit harus bilangan bulat >= 0")
+        return min(limit, self.range_limit)
+
+    def _range(self, request: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        nodes = self._source().range(_argument(request, "low"), _argument(request, "high"))
+        return [_node_result(node) for node in islice(nodes, self._limit(request))]
+
+    def _subnet(self, request: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        nodes = self._source().in_subnet(_argument(request, "cidr"))
+        return [_node_result(node) for node in islice(nodes, self._limit(request))]
+
+    def _count(self, request: Mapping[str, Any]) -> int:
+        if "cidr" in request:
+            return self._source().count_subnet(_argument(request, "cidr"))
+        if "low" in request or "high" in request:
+            return self._source().count_range(_argument(request, "low"), _argument(request, "high"))
+        return self._source().size
+
+    def _stats(self, request: Mapping[str, Any]) -> Dict[str, Any]:
+        source = self._source()
+        if isinstance(source, SplayTree):
+            # Termasuk counter cache dan metrics jika tree memilikinya
+            return source.stats()
+        return {"size": source.size, "search_count": source.search_count}
+
+    def _save(self, request: Mapping[str, Any]) -> Dict[str, Any]:
+        path = _optional_text(request, "path") or self.snapshot_path
+        if path is None:
+            raise CommandError("Argumen 'path' wajib diisi (service dijalankan tanpa --snapshot)")
+        # Reader ditutup dulu supaya file snapshot lama tidak sedang di-mmap saat diganti
+        tree = self.materialize()
+        if self.store is not None and path == self.store.snapshot_path:
+            return {"path": path, "saved": self.store.compact(tree)}
+        return {"path": path, "saved": save_snapshot(path, tree_rows(tree))}
+
+    def _route_add(self, request: Mapping[str, Any]) -> Dict[str, bool]:
+        return {"created": self.routes.insert(_argument(request, "cidr"), _optional_text(request, "packet"))}
+
+    def _route_delete(self, request: Mapping[str, Any]) -> Dict[str, bool]:
+        return {"deleted": self.routes.delete(_argument(request, "cidr"))}
+
+    def _route(self, request: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        # Longest-prefix match; None jika tidak ada route (termasuk default) yang cocok
+        return _route_result(self.routes.lookup(_argument(request, "ip")))
+
+    def _routes(self, request: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        return [_route_result(route) for route in islice(self.routes.iter_routes(), self._limit(request))]
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import List, Optional
+
+from ..config.settings import SERVICE_MAX_LINE_BYTES
+from .commands import TreeService
+
+# ensure_ascii: string dari client (mis. id) bisa berisi surrogate tunggal yang tidak bisa di-encode UTF-8
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class LookupProtocol(asyncio.Protocol):
+    """
+    Protokol JSON-lines: satu request per baris, satu response per baris.
+
+    Client boleh mengirim banyak request tanpa menunggu jawaban (pipelining).
+    Semua baris lengkap di satu chunk diproses berurutan dan jawabannya
+    dikirim dengan satu write, sehingga urutan response sama dengan urutan
+    request. Tree hanya disentuh dari event loop, jadi tidak perlu lock.
+    Semua perubahan dalam satu chunk di-commit ke log dengan satu fsync.
+    """
+
+    def __init__(self, service: TreeService) -> None:
+        self.service = service
+        self.transport: Optional[asyncio.Transport] = None
+        self._buffer = b""
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        assert isinstance(transport, asyncio.Transport)
+        self.transport = transport
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.transport = None
+
+    def data_received(self, data: bytes) -> None:
+        assert self.transport is not None
+        *lines, self._buffer = (self._buffer + data).split(b"\n")
+        responses: List[dict] = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except (ValueError, RecursionError) as exc:
+                # RecursionError: array/object bersarang terlalu dalam
+                responses.append({"id": None, "ok": False, "error": f"JSON tidak valid: {exc}"})
+                continue
+            responses.append(self.service.handle(request))
+        # Perubahan di-fsync sebelum jawaban dikirim
+        try:
+            self.service.commit()
+        except OSError as exc:
+            # Perubahan belum tentu tersimpan, jadi tidak boleh dilaporkan sukses
+            error = f"Gagal commit log: {exc}"
+            responses = [
+                {"id": response["id"], "ok": False, "error": error} if response["ok"] else response
+                for response in responses
+            ]
+        # Baris lengkap sebelum sisa yang terlalu panjang tetap dijawab dulu
+        too_long = len(self._buffer) > SERVICE_MAX_LINE_BYTES
+        if too_long:
+            responses.append({"id": None, "ok": False, "error": "Request terlalu panjang"})
+        self._reply(responses)
+        if too_long:
+            self._buffer = b""
+            self.transport.close()
+
+    def _reply(self, responses: List[dict]) -> None:
+        if responses and self.transport is not None:
+            self.transport.write("".join(_encode(response) + "\n" for response in responses).encode())
+
+    # Backpressure: berhenti membaca request selama client lambat membaca jawaban
+    def pause_writing(self) -> None:
+        if self.transport is not None:
+            self.transport.pause_reading()
+
+    def resume_writing(self) -> None:
+        if self.transport is not None:
+            self.transport.resume_reading()
+
+
+async def start_server(service: TreeService, host: str, port: int) -> asyncio.AbstractServer:
+    loop = asyncio.get_running_loop()
+    return await loop.create_server(lambda: LookupProtocol(service), host, port)
+
+
+async def serve_forever(service: TreeService, host: str, port: int) -> None:
+    server = await start_server(service, host, port)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Service IP Address Finder jalan di {addresses} (Ctrl+C untuk berhenti)")
+    async with server:
+        await server.serve_forever()
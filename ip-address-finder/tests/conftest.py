@@ -0,0 +1,7 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+# Paket `src` di-import relatif dari root proyek, sama seperti ip_address_finder.py
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pickle
+
+import pytest
+
+from src.net.address import IPV4_MAPPED, format_ip, parse_ip, validate_ip_batch
+from src.net.ipv4 import IPParseError, format_ipv4, parse_ipv4, scan_ipv4, split_lines
+from src.net.ipv6 import format_ipv6, parse_ipv6
+
+
+def test_ipv4_parse_and_format() -> None:
+    assert parse_ipv4("10.0.0.1") == 0x0A000001
+    assert parse_ipv4("010.000.000.001") == 0x0A000001
+    assert format_ipv4(0x0A000001) == "10.0.0.1"
+    with pytest.raises(ValueError):
+        format_ipv4(1 << 32)
+
+
+@pytest.mark.parametrize(
+    ("text", "position"),
+    (("", 0), ("1.2.3", 5), ("1.2.3.256", 6), ("1.2..4", 4), ("1.2.3.4.5", 7), ("1.a.3.4", 2)),
+)
+def test_ipv4_error_position(text: str, position: int) -> None:
+    with pytest.raises(IPParseError) as caught:
+        parse_ipv4(text)
+    assert caught.value.position == position
+    with pytest.raises(IPParseError):
+        scan_ipv4(text)
+
+
+def test_parse_error_survives_pickle() -> None:
+    # Error dari proses lain (shard) dikirim lewat pickle
+    with pytest.raises(IPParseError) as caught:
+        parse_ip("10.0.0.300")
+    copied = pickle.loads(pickle.dumps(caught.value.at_index(4)))
+    assert (copied.reason, copied.text, copied.position, copied.index) == (
+        caught.value.reason,
+        "10.0.0.300",
+        caught.value.position,
+        4,
+    )
+    assert str(copied) == str(caught.value.at_index(4))
+
+
+def test_ipv6_parse_and_format() -> None:
+    assert parse_ipv6("2001:db8::1") == (0x20010DB8 << 96) | 1
+    assert format_ipv6((0x20010DB8 << 96) | 1) == "2001:db8::1"
+    assert parse_ipv6("::ffff:1.2.3.4") == IPV4_MAPPED | 0x01020304
+    with pytest.raises(IPParseError):
+        parse_ipv6("2001:db8::1::2")
+
+
+def test_mapped_ipv4_shares_key() -> None:
+    assert parse_ip("10.0.0.1") == parse_ip("::ffff:10.0.0.1") == IPV4_MAPPED | 0x0A000001
+    assert format_ip(parse_ip("::ffff:10.0.0.1")) == "10.0.0.1"
+    assert format_ip(parse_ip("2001:DB8::0:1")) == "2001:db8::1"
+
+
+@pytest.mark.parametrize("batch", (["10.0.0.1", "x", "::1"], b"10.0.0.1\nx\n::1\n"))
+def test_validate_batch_collects_errors(batch) -> None:
+    keys, errors = validate_ip_batch(batch)
+    assert keys == [parse_ip("10.0.0.1"), 1]
+    assert [error.index for error in errors] == [1]
+
+
+def test_split_lines() -> None:
+    assert split_lines(b"") == []
+    assert split_lines(b"1.1.1.1\n2.2.2.2") == ["1.1.1.1", "2.2.2.2"]
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from typing import List
+
+import pytest
+
+from src.datastructures.bounded_splay_tree import BoundedSplayTree
+from src.datastructures.keys import ip_to_key
+from src.datastructures.records import DeviceRecord
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _ips(tree: BoundedSplayTree) -> List[str]:
+    return [node.ip_address for node in tree.iter_inorder()]
+
+
+def test_evicts_least_recently_used() -> None:
+    tree = BoundedSplayTree(max_entries=3)
+    for index in range(3):
+        tree.insert(f"10.0.0.{index}", f"PKT-{index}")
+    assert tree.search("10.0.0.0") is not None
+    tree.update("10.0.0.1", new_data_packet="PKT-baru")
+    tree.insert("10.0.0.3", None)
+    assert _ips(tree) == ["10.0.0.0", "10.0.0.1", "10.0.0.3"]
+    tree.insert("10.0.0.4", None)
+    assert _ips(tree) == ["10.0.0.1", "10.0.0.3", "10.0.0.4"]
+    assert tree.evictions == 2
+    # Device yang dibuang tidak lagi ditemukan dan dihitung miss
+    assert tree.search("10.0.0.2") is None
+    assert (tree.hits, tree.misses) == (1, 1)
+
+
+def test_lru_heap_rebuild_keeps_order() -> None:
+    tree = BoundedSplayTree(max_entries=4)
+    for index in range(4):
+        tree.insert(f"10.0.0.{index}", None)
+    # Banyak stempel basi memaksa heap dibangun ulang beberapa kali
+    for _ in range(300):
+        tree.search("10.0.0.0")
+        tree.search("10.0.0.2")
+    tree.insert("10.0.0.9", None)
+    tree.insert("10.0.0.8", None)
+    assert _ips(tree) == ["10.0.0.0", "10.0.0.2", "10.0.0.8", "10.0.0.9"]
+    assert len(tree._lru) <= 2 * tree.size + 64
+
+
+def test_ttl_expiry_with_injected_clock() -> None:
+    clock = FakeClock()
+    tree = BoundedSplayTree(max_entries=10, ttl=5, clock=clock)
+    tree.insert("10.0.0.1", None)
+    tree.insert("10.0.0.2", None, ttl=20)
+    tree.insert_record(ip_to_key("10.0.0.3"), DeviceRecord(None, "PKT"), ttl=1)
+    clock.now = 4.0
+    assert tree.search("10.0.0.1") is not None
+    # Search dan update packet tidak memperpanjang TTL
+    tree.update("10.0.0.1", new_data_packet="PKT-2")
+    assert tree.peek("10.0.0.3") is None
+    assert tree.size == 3
+
+    clock.now = 5.0
+    assert tree.search("10.0.0.1") is None
+    assert (tree.size, tree.expirations, tree.misses) == (2, 1, 1)
+    assert tree.purge_expired() == 1
+    assert _ips(tree) == ["10.0.0.2"]
+    assert tree.expirations == 2
+
+    # Insert ulang memulai TTL baru dari waktu insert
+    tree.insert("10.0.0.2", "PKT-ulang", ttl=20)
+    clock.now = 24.0
+    assert tree.search("10.0.0.2").data_packet == "PKT-ulang"
+    clock.now = 25.0
+    assert tree.purge_expired() == 1
+    assert tree.size == 0
+
+
+def test_expired_entries_go_before_lru_eviction() -> None:
+    clock = FakeClock()
+    tree = BoundedSplayTree(max_entries=2, clock=clock)
+    tree.insert("10.0.0.1", None)
+    tree.insert("10.0.0.2", None, ttl=1)
+    clock.now = 2.0
+    tree.insert("10.0.0.3", None)
+    assert _ips(tree) == ["10.0.0.1", "10.0.0.3"]
+    assert (tree.evictions, tree.expirations) == (0, 1)
+
+
+def test_eviction_work_stays_logarithmic(monkeypatch) -> None:
+    # Insert IP berurutan membuat tree berbentuk jalur; korban LRU ada di ujungnya
+    tree = BoundedSplayTree(max_entries=512)
+    for index in range(512):
+        tree.insert_record(index, DeviceRecord(None, None))
+
+    steps = 0
+    resize_upward = BoundedSplayTree._resize_upward
+
+    def counting_resize(node) -> None:
+        nonlocal steps
+        while node is not None:
+            steps += 1
+            node = node.parent
+        resize_upward(node)
+
+    monkeypatch.setattr(BoundedSplayTree, "_resize_upward", staticmethod(counting_resize))
+    for index in range(512, 1024):
+        tree.insert_record(index, DeviceRecord(None, None))
+    assert tree.evictions == 512
+    # Tanpa splay sebelum _unlink, setiap eviksi berjalan sepanjang ~512 node
+    assert steps <= 512 * 10
+
+
+def test_purge_expired_splays_before_unlink(monkeypatch) -> None:
+    clock = FakeClock()
+    tree = BoundedSplayTree(max_entries=1024, ttl=1, clock=clock)
+    for index in range(512):
+        tree.insert_record(index, DeviceRecord(None, None))
+    depths: List[int] = []
+    unlink = BoundedSplayTree._unlink
+
+    def recording_unlink(self, node) -> None:
+        depth, parent = 0, node.parent
+        while parent is not None:
+            depth, parent = depth + 1, parent.parent
+        depths.append(depth)
+        unlink(self, node)
+
+    monkeypatch.setattr(BoundedSplayTree, "_unlink", recording_unlink)
+    clock.now = 2.0
+    assert tree.purge_expired() == 512
+    assert tree.size == 0
+    assert max(depths) == 0
+
+
+def test_update_and_delete_treat_expired_entry_as_missing() -> None:
+    clock = FakeClock()
+    tree = BoundedSplayTree(max_entries=10, ttl=5, clock=clock)
+    tree.insert("10.0.0.1", "PKT-1")
+    tree.insert("10.0.0.2", "PKT-2")
+    clock.now = 5.0
+    assert tree.update("10.0.0.1", "10.0.0.9", "PKT-baru") == (False, None, None)
+    assert tree.delete("10.0.0.2") is False
+    assert tree.size == 0 and tree.peek("10.0.0.9") is None
+    assert (tree.expirations, tree.hits, tree.misses) == (2, 0, 0)
+
+
+def test_delete_counts_search_like_base_tree() -> None:
+    tree = BoundedSplayTree(max_entries=10)
+    tree.insert("10.0.0.1", None)
+    assert tree.delete("10.0.0.1") and not tree.delete("10.0.0.1")
+    assert tree.search_count == 2
+    assert (tree.hits, tree.misses) == (0, 0)
+
+
+def test_paused_eviction_trims_on_exit() -> None:
+    tree = BoundedSplayTree(max_entries=2)
+    with tree.paused_eviction():
+        for index in range(5):
+            tree.insert(f"10.0.0.{index}", None)
+        assert tree.size == 5
+    assert _ips(tree) == ["10.0.0.3", "10.0.0.4"]
+    assert tree.evictions == 3
+
+
+def test_bulk_load_respects_capacity_and_stats() -> None:
+    tree = BoundedSplayTree.from_iterable((f"10.0.0.{index}", None) for index in range(10))
+    assert tree.size == 10
+    small = BoundedSplayTree(max_entries=4)
+    small._load_sorted(
+        [ip_to_key(f"10.0.0.{index}") for index in range(10)], [DeviceRecord(None, None)] * 10
+    )
+    # Bulk build menganggap urutan IP sebagai urutan akses
+    assert _ips(small) == ["10.0.0.6", "10.0.0.7", "10.0.0.8", "10.0.0.9"]
+
+    assert small.delete("10.0.0.6")
+    assert not small.delete("10.0.0.6")
+    small.search("10.0.0.7")
+    small.search("10.0.0.1")
+    stats = small.stats()
+    assert (stats["max_entries"], stats["hits"], stats["misses"], stats["evictions"]) == (4, 1, 1, 6)
+    assert small.hit_ratio == 0.5
+
+
+@pytest.mark.parametrize("arguments", [{"max_entries": 0}, {"ttl": 0}, {"ttl": -1.0}])
+def test_rejects_invalid_limits(arguments) -> None:
+    with pytest.raises(ValueError):
+        BoundedSplayTree(**arguments)
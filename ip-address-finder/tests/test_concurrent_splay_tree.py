@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from src.datastructures.bounded_splay_tree import BoundedSplayTree
+from src.datastructures.concurrent_splay_tree import ConcurrentSplayTree, LockPolicy
+from src.datastructures.splay_tree import SplayTree
+
+
+@pytest.mark.parametrize("policy", list(LockPolicy), ids=lambda policy: policy.value)
+def test_searches_are_counted_once_flushed(policy: LockPolicy) -> None:
+    tree = SplayTree.from_iterable((f"10.0.0.{index}", f"PKT-{index}") for index in range(100))
+    shared = ConcurrentSplayTree(tree, policy, splay_batch=1000)
+    assert shared.search("10.0.0.7").data_packet == "PKT-7"
+    assert shared.search("10.0.1.7") is None
+    assert [node and node.data_packet for node in shared.search_many(["10.0.0.1", "x"])] == ["PKT-1", None]
+    assert shared.search_count == 4
+    shared.flush()
+    assert tree.search_count == 4
+    if policy is LockPolicy.READ_WRITE:
+        assert tree.root.ip_address != "10.0.0.1"
+    else:
+        assert tree.root.ip_address == "10.0.0.1"
+
+
+@pytest.mark.parametrize("policy", list(LockPolicy), ids=lambda policy: policy.value)
+def test_bounded_tree_keeps_cache_bookkeeping(policy: LockPolicy) -> None:
+    tree = BoundedSplayTree(max_entries=3)
+    shared = ConcurrentSplayTree(tree, policy)
+    for index in range(3):
+        shared.insert(f"10.0.0.{index}", None)
+    # Hit pada 10.0.0.0 membuatnya paling baru dipakai, jadi 10.0.0.1 yang dibuang
+    assert shared.search("10.0.0.0") is not None
+    assert shared.search("10.0.0.9") is None
+    shared.flush()
+    assert (tree.hits, tree.misses) == (1, 1)
+    shared.insert("10.0.0.3", None)
+    assert [node.ip_address for node in shared.inorder_traversal()] == ["10.0.0.0", "10.0.0.2", "10.0.0.3"]
+
+
+def test_bounded_tree_hides_expired_entries_from_readers() -> None:
+    now = [0.0]
+    tree = BoundedSplayTree(max_entries=10, ttl=5, clock=lambda: now[0])
+    shared = ConcurrentSplayTree(tree, LockPolicy.READ_WRITE)
+    shared.insert("10.0.0.1", None)
+    now[0] = 6.0
+    assert shared.search("10.0.0.1") is None
+    shared.flush()
+    assert (tree.size, tree.expirations, tree.misses) == (0, 1, 1)
+
+
+def test_bounded_tree_counts_hit_returned_before_expiry() -> None:
+    # Entri kedaluwarsa antara peek dan flush: pemanggil sudah menerima hit
+    now = [0.0]
+    tree = BoundedSplayTree(max_entries=10, ttl=5, clock=lambda: now[0])
+    shared = ConcurrentSplayTree(tree, LockPolicy.READ_WRITE, splay_batch=1000)
+    shared.insert("10.0.0.1", None)
+    assert shared.search("10.0.0.1") is not None
+    now[0] = 6.0
+    shared.flush()
+    assert (tree.hits, tree.misses) == (1, 0)
+    assert (tree.size, tree.expirations) == (0, 1)
+
+
+@pytest.mark.parametrize("policy", [LockPolicy.READ_WRITE, LockPolicy.BUFFERED], ids=lambda policy: policy.value)
+def test_readers_leave_metrics_to_the_writer(policy: LockPolicy) -> None:
+    tree = SplayTree.from_iterable((f"10.0.0.{index}", None) for index in range(100))
+    metrics = tree.enable_metrics()
+    shared = ConcurrentSplayTree(tree, policy, splay_batch=1000)
+    shared.search("10.0.0.7")
+    shared.search_many([f"10.0.0.{index}" for index in range(50)] + ["10.0.1.1"])
+    assert (metrics.comparisons, sum(metrics.depth_histogram.values())) == (0, 0)
+    shared.flush()
+    assert sum(metrics.depth_histogram.values()) == 52
+    assert metrics.comparisons == sum(depth * amount for depth, amount in metrics.depth_histogram.items())
+
+
+def test_parallel_readers_and_writers() -> None:
+    shared = ConcurrentSplayTree(SplayTree(), LockPolicy.BUFFERED, splay_batch=8)
+
+    def work(offset: int) -> None:
+        for index in range(200):
+            shared.insert(f"10.{offset}.0.{index}", None)
+            assert shared.search(f"10.{offset}.0.{index}") is not None
+
+    threads = [threading.Thread(target=work, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    shared.flush()
+    assert shared.size == 800
+    assert shared.search_count == 800
+    assert shared.count_subnet("10.2.0.0/16") == 200
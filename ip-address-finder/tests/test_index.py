@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import random
+from typing import List
+
+import pytest
+
+from src.datastructures.bounded_splay_tree import BoundedSplayTree
+from src.datastructures.keys import ip_to_key
+from src.datastructures.records import DeviceRecord
+from src.datastructures.splay_tree import IndexPolicy, SplayTree
+from src.datastructures.top_down_splay_tree import TopDownSplayTree
+
+ENGINES = (SplayTree, TopDownSplayTree, BoundedSplayTree)
+
+
+def _check_index(tree: SplayTree) -> List[int]:
+    # Index harus berisi tepat node yang ada di tree, objek yang sama
+    nodes = list(tree.iter_inorder())
+    assert tree._index is not None
+    assert sorted(tree._index) == [node.key for node in nodes]
+    assert all(tree._index[node.key] is node for node in nodes)
+    return [node.key for node in nodes]
+
+
+def _random_ip(rng: random.Random) -> str:
+    return f"10.0.{rng.randrange(4)}.{rng.randrange(64)}"
+
+
+@pytest.mark.parametrize("policy", list(IndexPolicy), ids=lambda policy: policy.value)
+@pytest.mark.parametrize("engine", ENGINES, ids=lambda engine: engine.__name__)
+def test_index_follows_mixed_operations(engine, policy: IndexPolicy) -> None:
+    rng = random.Random(23)
+    tree = engine(index_policy=policy, index_splay_interval=3)
+    reference = SplayTree()
+    keys = sorted({ip_to_key(_random_ip(rng)) for _ in range(80)})
+    tree._load_sorted(keys, [DeviceRecord(None, f"PKT-{key & 0xFFFF}") for key in keys])
+    reference._load_sorted(keys, [DeviceRecord(None, f"PKT-{key & 0xFFFF}") for key in keys])
+    _check_index(tree)
+
+    for step in range(600):
+        ip_address, other = _random_ip(rng), _random_ip(rng)
+        action = step % 5
+        if action == 0:
+            assert tree.insert(ip_address, f"PKT-{step}") == reference.insert(ip_address, f"PKT-{step}")
+        elif action == 1:
+            assert tree.delete(ip_address) == reference.delete(ip_address)
+        elif action == 2 and reference.search(other) is None:
+            assert tree.update(ip_address, other) == reference.update(ip_address, other)
+        elif action == 3:
+            assert tree.update(ip_address, None, f"PKT-u{step}") == reference.update(ip_address, None, f"PKT-u{step}")
+        else:
+            found, expected = tree.search(ip_address), reference.search(ip_address)
+            assert (found and found.data_packet) == (expected and expected.data_packet)
+    assert _check_index(tree) == [node.key for node in reference.iter_inorder()]
+
+    tree.disable_index()
+    assert tree._index is None and tree.index_policy is None
+    tree.enable_index(policy)
+    _check_index(tree)
+
+
+def test_index_after_from_iterable_and_enable() -> None:
+    tree = SplayTree.from_iterable((f"10.0.0.{index}", None) for index in range(50))
+    assert tree._index is None
+    tree.enable_index(IndexPolicy.NEVER)
+    assert len(_check_index(tree)) == 50
+    assert tree.search("10.0.0.50") is None
+    assert tree.search("bukan-ip") is None
+    assert tree.search_count == 2
+
+
+def test_index_drops_evicted_and_expired_entries() -> None:
+    now = [0.0]
+    tree = BoundedSplayTree(max_entries=8, clock=lambda: now[0], index_policy=IndexPolicy.SAMPLED)
+    for index in range(20):
+        tree.insert(f"10.0.0.{index}", None, ttl=5 if index % 3 == 0 else None)
+        if index % 4 == 0:
+            tree.search(f"10.0.0.{index // 2}")
+    assert tree.evictions > 0
+    _check_index(tree)
+    now[0] = 10.0
+    for index in range(20):
+        tree.search(f"10.0.0.{index}")
+    assert tree.expirations > 0
+    keys = _check_index(tree)
+    assert len(keys) == tree.size <= 8
+
+
+@pytest.mark.parametrize("engine", ENGINES, ids=lambda engine: engine.__name__)
+def test_index_policy_controls_splay(engine) -> None:
+    items = [(f"10.0.0.{index}", None) for index in range(31)]
+
+    always = engine.from_iterable(items)
+    always.enable_index(IndexPolicy.ALWAYS)
+    assert always.search("10.0.0.3") is always.root
+
+    never = engine.from_iterable(items)
+    never.enable_index(IndexPolicy.NEVER)
+    root = never.root
+    for index in range(31):
+        assert never.search(f"10.0.0.{index}") is not None
+    assert never.root is root
+
+    sampled = engine.from_iterable(items)
+    sampled.enable_index(IndexPolicy.SAMPLED)
+    sampled.index_splay_interval = 4
+    root = sampled.root
+    for _ in range(3):
+        sampled.search("10.0.0.3")
+        assert sampled.root is root
+    # Hit ke-4 di-splay ke root
+    assert sampled.search("10.0.0.3") is sampled.root
+    assert sampled.root is not root
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import pytest
+
+from src.datastructures.bounded_splay_tree import BoundedSplayTree
+from src.datastructures.metrics import LatencyStats
+from src.datastructures.splay_tree import IndexPolicy, SplayTree
+from src.datastructures.top_down_splay_tree import TopDownSplayTree
+from src.factories.tree_factory import DefaultTreeFactory, InstrumentedTreeFactory
+
+ENGINES = (SplayTree, TopDownSplayTree, BoundedSplayTree)
+
+
+def _left_spine() -> SplayTree:
+    # Insert menaik: setiap node baru menjadi root dengan node lama di kiri
+    tree = SplayTree()
+    for index in range(1, 8):
+        tree.insert(f"10.0.0.{index}")
+    return tree
+
+
+def test_search_counts_one_walk() -> None:
+    tree = _left_spine()
+    metrics = tree.enable_metrics()
+    assert tree.search("10.0.0.1") is not None
+    assert (metrics.zig, metrics.zig_zig, metrics.zig_zag) == (0, 3, 0)
+    assert dict(metrics.depth_histogram) == {7: 1}
+    assert metrics.comparisons == 7
+    assert metrics.latencies["search"].count == 1
+
+
+def test_index_hit_adds_no_comparisons() -> None:
+    tree = _left_spine()
+    tree.enable_index(IndexPolicy.NEVER)
+    metrics = tree.enable_metrics()
+    tree.search("10.0.0.1")
+    assert metrics.comparisons == 0
+
+
+@pytest.mark.parametrize("engine", ENGINES, ids=lambda engine: engine.__name__)
+def test_nested_operations_are_timed_once(engine) -> None:
+    tree = engine()
+    metrics = tree.enable_metrics()
+    tree.insert("10.0.0.1")
+    tree.insert("10.0.0.2")
+    tree.update("10.0.0.1", "10.0.0.3")
+    tree.delete("10.0.0.2")
+    counts = {operation: stats.count for operation, stats in metrics.latencies.items()}
+    assert counts == {"insert_record": 2, "update": 1, "delete": 1}
+    assert not metrics.busy
+
+
+@pytest.mark.parametrize("engine", ENGINES, ids=lambda engine: engine.__name__)
+def test_metrics_do_not_change_behavior(engine) -> None:
+    plain, measured = engine(), engine()
+    measured.enable_metrics()
+    for tree in (plain, measured):
+        for index in range(0, 200, 7):
+            tree.insert(f"10.0.0.{index}", str(index))
+        for index in range(0, 200, 3):
+            tree.search(f"10.0.0.{index}")
+        tree.delete("10.0.0.14")
+    assert [node.key for node in plain.iter_inorder()] == [node.key for node in measured.iter_inorder()]
+    assert plain.root.key == measured.root.key
+    assert plain.search_count == measured.search_count
+    assert "rotations" not in plain.stats()
+    assert measured.stats()["comparisons"] > 0
+    measured.disable_metrics()
+    assert "rotations" not in measured.stats()
+
+
+@pytest.mark.parametrize("engine", ENGINES, ids=lambda engine: engine.__name__)
+def test_disabled_metrics_call_methods_directly(engine) -> None:
+    # Tanpa metrics tidak ada pembungkus: atribut instance kosong, method kelas tidak dibungkus
+    tree = engine()
+    assert not hasattr(engine.search, "__wrapped__")
+    assert "search" not in vars(tree)
+    tree.enable_metrics()
+    assert "search" in vars(tree) and "delete" in vars(tree)
+    tree.disable_metrics()
+    assert "search" not in vars(tree)
+    tree.search("10.0.0.1")
+
+
+@pytest.mark.parametrize("engine", (SplayTree, TopDownSplayTree), ids=lambda engine: engine.__name__)
+def test_delete_search_counts_in_depth_histogram(engine) -> None:
+    tree = engine()
+    for index in range(1, 8):
+        tree.insert(f"10.0.0.{index}")
+    metrics = tree.enable_metrics()
+    assert tree.delete("10.0.0.1")
+    assert not tree.delete("10.0.0.1")
+    assert sum(metrics.depth_histogram.values()) == 2
+
+
+def test_instrumented_factory() -> None:
+    tree = InstrumentedTreeFactory(DefaultTreeFactory()).create_tree()
+    assert tree.metrics is not None
+
+
+def test_latency_percentiles() -> None:
+    stats = LatencyStats()
+    for seconds in (1e-6, 2e-6, 3e-6, 1e-3):
+        stats.add(seconds)
+    report = stats.as_dict()
+    assert report["count"] == 4
+    assert report["p50_us"] <= 4
+    assert report["p99_us"] >= 500
+    assert report["max_us"] == 1000
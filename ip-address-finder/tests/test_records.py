@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import threading
+
+from src.datastructures import records
+from src.datastructures.records import DeviceRecord, build_records, compact_column, compact_text, expand_text
+
+
+def test_compact_text_round_trip() -> None:
+    for text in ("PKT-1234", "PKT-007", "PKT-0", "Router", "", "42", None, "x" * 20 + "1234567890"):
+        assert expand_text(compact_text(text)) == text
+    assert isinstance(compact_text("PKT-1234"), int)
+    assert isinstance(compact_text("PKT-007"), str)
+
+
+def test_mixed_column_registers_no_prefix() -> None:
+    before = list(records._prefixes)
+    # Jalur cepat gagal: prefix kolom pertama tidak boleh ikut terdaftar
+    assert records._compact_uniform(["Zq-mixed-1", "Zq-lain-2"]) is None
+    assert records._compact_uniform(["Zq-mixed-1", "Zq-mixed-x"]) is None
+    assert records._compact_uniform(["Zq-mixed-1", "Zq-mixed-01"]) is None
+    assert records._prefixes == before
+    column = ["Zq-mixed-1", "Zq-mixed-2", "lain-3"]
+    assert [expand_text(value) for value in compact_column(column)] == column
+
+
+def test_uniform_column_matches_compact_text() -> None:
+    column = [f"Dev-{index}" for index in range(1, 200)] + [None, "Dev-0", "Dev-010"]
+    assert [expand_text(value) for value in compact_column(column)] == column
+    built = build_records(column, column)
+    assert [record.data_packet for record in built] == column
+    assert [record.name for record in built] == column
+
+
+def test_prefix_table_is_safe_across_threads() -> None:
+    results = {}
+
+    def work(worker: int) -> None:
+        texts = [f"T{worker % 4}-{index}" for index in range(1, 500)]
+        values = compact_column(texts) + [compact_text(f"S{worker % 4}-{index}") for index in range(1, 50)]
+        results[worker] = [expand_text(value) for value in values]
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for worker, expanded in results.items():
+        assert expanded == [f"T{worker % 4}-{index}" for index in range(1, 500)] + [
+            f"S{worker % 4}-{index}" for index in range(1, 50)
+        ]
+    assert len(records._prefixes) == len(set(records._prefixes)) == len(records._prefix_ids)
+
+
+def test_device_record_replaced_keeps_original() -> None:
+    record = DeviceRecord("Router", "PKT-1", 100)
+    copy = record.replaced(data_packet="PKT-2")
+    assert (record.name, record.data_packet, record.updated_at) == ("Router", "PKT-1", 100)
+    assert (copy.name, copy.data_packet) == ("Router", "PKT-2")
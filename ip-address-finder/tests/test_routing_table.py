@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import ipaddress
+import random
+from typing import List, Optional, Tuple, Union
+
+import pytest
+
+from src.datastructures.routing_table import RoutingTable
+
+
+def _node_count(table: RoutingTable) -> int:
+    stack, count = [table._root], 0
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(child for child in (node.zero, node.one) if child is not None)
+    return count
+
+
+def test_split_and_merge_on_delete() -> None:
+    table = RoutingTable()
+    assert table.insert("10.0.0.0/24", "A")
+    assert table.insert("10.0.1.0/24", "B")
+    # Dua prefix bercabang di bit ke-23: satu node cabang tanpa route disisipkan
+    assert _node_count(table) == 4
+    assert table.lookup("10.0.1.9").data_packet == "B"
+    assert table.lookup("10.0.2.1") is None
+
+    assert table.delete("10.0.0.0/24")
+    # Node cabang yang tinggal punya satu anak digabung kembali
+    assert _node_count(table) == 2
+    assert table.lookup("10.0.0.1") is None
+    assert table.lookup("10.0.1.1").data_packet == "B"
+
+    assert table.insert("10.0.0.0/16", "C")
+    assert table.insert("10.0.0.0/8", "D")
+    assert not table.insert("10.0.0.0/8", "E")
+    assert table.get("10.0.0.0/8").data_packet == "E"
+    assert table.size == 3
+    assert table.delete("10.0.0.0/16")
+    assert not table.delete("10.0.0.0/16")
+    assert not table.delete("10.0.0.0/12")
+    assert table.get("10.0.0.0/16") is None
+    assert table.lookup("10.0.7.7").cidr == "10.0.0.0/8"
+    assert table.lookup("10.0.1.7").cidr == "10.0.1.0/24"
+    assert table.size == 2
+
+
+def test_default_and_host_routes() -> None:
+    table = RoutingTable()
+    assert table.lookup("10.0.0.1") is None
+    table.insert("0.0.0.0/0", "default-v4")
+    table.insert("::/0", "default-v6")
+    table.insert("10.0.0.1/32", "host-v4")
+    table.insert("2001:db8::1/128", "host-v6")
+    assert table.lookup("10.0.0.1").cidr == "10.0.0.1/32"
+    assert table.lookup("10.0.0.2").data_packet == "default-v4"
+    assert table.lookup("2001:db8::1").cidr == "2001:db8::1/128"
+    assert table.lookup("2001:db8::2").data_packet == "default-v6"
+    # 0.0.0.0/0 hanya mencakup IPv4 (di bawah ::ffff:0:0/96), ::/0 mencakup semuanya
+    assert table.lookup("::ffff:1.2.3.4").data_packet == "default-v4"
+    assert table.lookup("bukan-ip") is None
+    assert table.lookup_count == 7
+
+    assert table.delete("::/0")
+    assert table.lookup("2001:db8::2") is None
+    assert table.lookup("1.2.3.4").data_packet == "default-v4"
+    assert [route.cidr for route in table.routes()] == ["0.0.0.0/0", "10.0.0.1/32", "2001:db8::1/128"]
+
+
+@pytest.mark.parametrize("cidr", ["10.0.0.1/8", "10.0.0.0/33", "2001:db8::/129", "10.0.0.0", "10.0.0.0/x"])
+def test_rejects_invalid_cidr(cidr: str) -> None:
+    with pytest.raises(ValueError):
+        RoutingTable().insert(cidr)
+
+
+def _random_network(rng: random.Random) -> str:
+    if rng.random() < 0.6:
+        length = rng.choice((0, 1, 8, 12, 16, 20, 24, 28, 31, 32))
+        address = rng.choice((10, 172, 192)) << 24 | rng.getrandbits(24)
+        network = ipaddress.ip_network((address, length), strict=False)
+    else:
+        length = rng.choice((0, 16, 32, 48, 64, 96, 127, 128))
+        network = ipaddress.ip_network((0x20010DB8 << 96 | rng.getrandbits(40) << 56, length), strict=False)
+    return str(network)
+
+
+def _brute_force(routes: List[Tuple[str, str]], ip_address: str) -> Optional[str]:
+    address = ipaddress.ip_address(ip_address)
+    best: Optional[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]] = None
+    for cidr, _ in routes:
+        network = ipaddress.ip_network(cidr)
+        if network.version == address.version and address in network:
+            if best is None or network.prefixlen > best.prefixlen:
+                best = network
+    return None if best is None else str(best)
+
+
+def test_random_longest_prefix_match_against_brute_force() -> None:
+    rng = random.Random(8)
+    table = RoutingTable()
+    routes = {}
+    for step in range(400):
+        cidr = _random_network(rng)
+        if step % 4 == 3 and routes:
+            victim = rng.choice(sorted(routes))
+            assert table.delete(victim)
+            del routes[victim]
+        else:
+            assert table.insert(cidr, f"PKT-{step}") == (cidr not in routes)
+            routes[cidr] = f"PKT-{step}"
+    assert table.size == len(routes)
+    assert sorted(route.cidr for route in table.routes()) == sorted(routes)
+
+    listed = sorted(routes.items())
+    for _ in range(500):
+        if rng.random() < 0.6:
+            probe = str(ipaddress.IPv4Address(rng.choice((10, 172, 192)) << 24 | rng.getrandbits(24)))
+        else:
+            probe = str(ipaddress.IPv6Address(0x20010DB8 << 96 | rng.getrandbits(40) << 56 | rng.getrandbits(8)))
+        found = table.lookup(probe)
+        expected = _brute_force(listed, probe)
+        assert (found and found.cidr) == expected
+        if found is not None:
+            assert found.data_packet == routes[expected]
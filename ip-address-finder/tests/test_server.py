@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from src.datastructures.splay_tree import SplayTree
+from src.persistence.wal import DurableStore, read_log
+from src.service import server
+from src.service.commands import TreeService
+
+
+async def _exchange(service: TreeService, chunks: List[bytes], expected: int) -> List[Optional[dict]]:
+    # Kirim chunk apa adanya ke server di port loopback acak, baca `expected` baris jawaban
+    listener = await server.start_server(service, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for chunk in chunks:
+            writer.write(chunk)
+            await writer.drain()
+        replies: List[Optional[dict]] = []
+        for _ in range(expected):
+            line = await asyncio.wait_for(reader.readline(), 5)
+            replies.append(json.loads(line) if line else None)
+        return replies
+    finally:
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+
+
+def _lines(*requests: object) -> bytes:
+    return b"".join(json.dumps(request).encode() + b"\n" for request in requests)
+
+
+def test_pipelined_requests_answer_in_order() -> None:
+    service = TreeService(SplayTree(), range_limit=100)
+    batch = _lines(
+        *({"id": index, "op": "insert", "ip": f"10.0.0.{index}", "packet": f"PKT-{index}"} for index in range(20))
+    )
+    # Baris terakhir dipotong di tengah chunk
+    tail = _lines({"id": "s", "op": "search", "ip": "10.0.0.7"}, {"id": "c", "op": "count"})
+    replies = asyncio.run(_exchange(service, [batch + tail[:10], tail[10:]], 22))
+    assert [reply["id"] for reply in replies] == list(range(20)) + ["s", "c"]
+    assert all(reply["ok"] for reply in replies)
+    assert replies[20]["result"]["packet"] == "PKT-7"
+    assert replies[21]["result"] == 20
+
+
+def test_bad_lines_get_error_replies() -> None:
+    service = TreeService(SplayTree(), range_limit=100)
+    chunks = [b"{bukan json\n", b"[" * 100_000 + b"\n", b"\n", _lines({"id": 1, "op": "ping"})]
+    replies = asyncio.run(_exchange(service, chunks, 3))
+    assert [reply["ok"] for reply in replies] == [False, False, True]
+    assert replies[1]["error"].startswith("JSON tidak valid")
+    assert replies[2] == {"id": 1, "ok": True, "result": "pong"}
+
+
+def test_lone_surrogates_get_error_replies() -> None:
+    service = TreeService(SplayTree(), range_limit=100)
+    chunk = (
+        b'{"id": 1, "op": "insert", "ip": "10.0.0.1", "packet": "\\ud800"}\n'
+        b'{"id": "\\udfff", "op": "ping"}\n'
+        + _lines({"id": 3, "op": "count"})
+    )
+    replies = asyncio.run(_exchange(service, [chunk], 3))
+    assert replies[0]["ok"] is False
+    assert "packet" in replies[0]["error"]
+    # id tetap dikembalikan apa adanya (di-escape), balasan lain di chunk tidak hilang
+    assert replies[1] == {"id": "\udfff", "ok": True, "result": "pong"}
+    assert replies[2] == {"id": 3, "ok": True, "result": 0}
+
+
+def test_overlong_line_closes_connection(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(server, "SERVICE_MAX_LINE_BYTES", 64)
+    service = TreeService(SplayTree(), range_limit=100)
+    # Ping di chunk yang sama dengan sisa yang terlalu panjang tetap dijawab
+    replies = asyncio.run(_exchange(service, [_lines({"id": 1, "op": "ping"}) + b"x" * 100], 3))
+    assert replies[0]["ok"] is True
+    assert replies[1] == {"id": None, "ok": False, "error": "Request terlalu panjang"}
+    assert replies[2] is None
+
+
+def test_changes_are_committed_before_reply(tmp_path: Path) -> None:
+    # Batas grup yang besar: tanpa commit dari server, record masih di buffer
+    store = DurableStore(str(tmp_path / "devices.ipsnap"), group_size=1000, group_delay=3600)
+    tree = SplayTree()
+    store.recover(tree)
+    service = TreeService(tree, 100, None, store.snapshot_path, store)
+    try:
+        replies = asyncio.run(_exchange(service, [_lines({"id": 1, "op": "insert", "ip": "10.0.0.1"})], 1))
+        assert replies[0]["result"] == {"created": True}
+        assert [key for _, key, _ in read_log(store.wal_path)] == [tree.root.key]
+    finally:
+        store.close()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from src.datastructures.splay_tree import SplayTree
+from src.service.commands import TreeService
+
+
+def _service() -> TreeService:
+    return TreeService(SplayTree(), range_limit=100)
+
+
+def test_insert_search_and_errors() -> None:
+    service = _service()
+    assert service.handle({"id": 1, "op": "insert", "ip": "10.0.0.1", "packet": "PKT"}) == {
+        "id": 1,
+        "ok": True,
+        "result": {"created": True},
+    }
+    found = service.handle({"id": 2, "op": "search", "ip": "10.0.0.1"})
+    assert found["ok"] and found["result"]["packet"] == "PKT"
+    assert service.handle({"id": 3, "op": "bogus"})["ok"] is False
+    assert service.handle({"id": 4, "op": "insert", "ip": "999.0.0.1"})["ok"] is False
+    assert service.handle(["not", "a", "dict"])["ok"] is False
+
+
+def test_update_rejects_ip_of_other_device() -> None:
+    service = _service()
+    service.handle({"op": "insert", "ip": "10.0.0.1"})
+    service.handle({"op": "insert", "ip": "10.0.0.2"})
+    response = service.handle({"op": "update", "ip": "10.0.0.1", "new_ip": "10.0.0.2"})
+    assert response["ok"] is False
+    assert service.handle({"op": "update", "ip": "10.0.0.1", "new_ip": "10.0.0.1", "packet": "x"})["ok"]
+
+
+def test_save_reports_os_error(tmp_path: Path) -> None:
+    service = _service()
+    service.handle({"op": "insert", "ip": "10.0.0.1"})
+    response = service.handle({"id": 7, "op": "save", "path": str(tmp_path / "missing" / "devices.ipsnap")})
+    assert response["id"] == 7
+    assert response["ok"] is False
+    assert "Gagal mengakses file" in response["error"]
+    saved = service.handle({"op": "save", "path": str(tmp_path / "devices.ipsnap")})
+    assert saved["ok"] and saved["result"]["saved"] == 1
+
+
+def test_route_longest_prefix_match() -> None:
+    service = _service()
+    assert service.handle({"op": "route_add", "cidr": "10.0.0.0/8", "packet": "PKT-1"})["result"] == {"created": True}
+    service.handle({"op": "route_add", "cidr": "10.1.0.0/16", "packet": "PKT-2"})
+    service.handle({"op": "route_add", "cidr": "2001:db8::/32", "packet": "PKT-6"})
+    assert service.handle({"op": "route", "ip": "10.1.2.3"})["result"] == {"cidr": "10.1.0.0/16", "packet": "PKT-2"}
+    assert service.handle({"op": "route", "ip": "10.2.0.1"})["result"]["cidr"] == "10.0.0.0/8"
+    assert service.handle({"op": "route", "ip": "2001:db8::1"})["result"]["packet"] == "PKT-6"
+    assert service.handle({"op": "route", "ip": "192.168.0.1"})["result"] is None
+    assert [route["cidr"] for route in service.handle({"op": "routes", "limit": 2})["result"]] == [
+        "10.0.0.0/8",
+        "10.1.0.0/16",
+    ]
+
+    assert service.handle({"op": "route_delete", "cidr": "10.1.0.0/16"})["result"] == {"deleted": True}
+    assert service.handle({"op": "route", "ip": "10.1.2.3"})["result"]["cidr"] == "10.0.0.0/8"
+    assert service.handle({"op": "route_add", "cidr": "10.0.0.1/8"})["ok"] is False
+    # Route tidak ikut tabel device
+    assert service.handle({"op": "count"})["result"] == 0
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import random
+from typing import Iterator, List
+
+import pytest
+
+from src.datastructures.keys import IPV4_FIRST_KEY, IPV4_LAST_KEY, MAX_KEY, ip_to_key
+from src.datastructures.sharded_splay_tree import (
+    IPV4_FIRST_PREFIX,
+    IPV6_FIRST_PREFIX,
+    PREFIX_COUNT,
+    ShardedSplayTree,
+    balanced_boundaries,
+    prefix_of,
+)
+from src.datastructures.splay_tree import SplayPolicy, SplayTree
+from src.net.ipv4 import IPParseError
+
+
+def _items(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    items = [
+        (f"{rng.choice((10, 172, 192))}.{rng.randrange(256)}.{rng.randrange(4)}.{rng.randrange(256)}", f"PKT-{index}")
+        for index in range(count)
+    ]
+    items += [("::1", "PKT-lo"), ("2001:db8::5", "PKT-v6"), ("fe80::1", "PKT-link")]
+    return items
+
+
+def _state(nodes) -> List[tuple]:
+    return [(node.ip_address, node.data_packet, node.name) for node in nodes]
+
+
+@pytest.fixture
+def pair() -> Iterator[tuple]:
+    items = _items(600, 16)
+    with ShardedSplayTree(4, items) as sharded:
+        yield sharded, SplayTree.from_iterable(items)
+
+
+def test_prefix_buckets_follow_key_order() -> None:
+    assert prefix_of(0) == 0
+    assert prefix_of(IPV4_FIRST_KEY - 1) == 0
+    assert prefix_of(IPV4_FIRST_KEY) == IPV4_FIRST_PREFIX
+    assert prefix_of(ip_to_key("10.1.255.255")) == IPV4_FIRST_PREFIX + 0x0A01
+    assert prefix_of(IPV4_LAST_KEY) == IPV6_FIRST_PREFIX - 1
+    assert prefix_of(IPV4_LAST_KEY + 1) == IPV6_FIRST_PREFIX
+    assert prefix_of(MAX_KEY) == PREFIX_COUNT - 1
+
+    keys = sorted(ip_to_key(ip_address) for ip_address, _ in _items(400, 1))
+    boundaries = balanced_boundaries(keys, 4)
+    assert boundaries[0] == 0 and boundaries == sorted(set(boundaries))
+    # Semua key di satu bucket: shard tetap dapat prefix yang berbeda
+    first = IPV4_FIRST_PREFIX + 0x0A00
+    assert balanced_boundaries([ip_to_key("10.0.0.1")] * 8, 3) == [0, first, first + 1]
+    with pytest.raises(ValueError):
+        ShardedSplayTree(2, boundaries=[0, 0])
+
+
+def test_reads_match_single_tree(pair) -> None:
+    sharded, reference = pair
+    assert sharded.size == reference.size
+    assert sum(sharded.shard_sizes()) == reference.size
+    assert all(sharded.shard_sizes())
+    assert _state(sharded.inorder_traversal()) == _state(reference.inorder_traversal())
+
+    probes = [node.ip_address for node in reference.inorder_traversal()[::37]] + ["10.9.9.9", "bukan-ip", "::2"]
+    assert _state(filter(None, sharded.search_many(probes, SplayPolicy.NONE))) == _state(
+        filter(None, reference.search_many(probes))
+    )
+    assert sharded.search("bukan-ip") is None
+    assert sharded.search(probes[0]).data_packet == reference.search(probes[0]).data_packet
+    assert sharded.search_count == len(probes) + 2
+
+    bounds = (
+        ("10.0.0.0", "172.255.255.255"),
+        ("0.0.0.0", "255.255.255.255"),
+        ("::", "ffff::"),
+        ("192.0.0.0", "10.0.0.0"),
+    )
+    for low, high in bounds:
+        assert _state(sharded.range(low, high)) == _state(reference.range(low, high))
+        assert sharded.count_range(low, high) == reference.count_range(low, high)
+    for cidr in ("172.16.0.0/12", "10.128.0.0/9", "2001:db8::/32", "0.0.0.0/0"):
+        assert _state(sharded.in_subnet(cidr)) == _state(reference.in_subnet(cidr))
+        assert sharded.count_subnet(cidr) == reference.count_subnet(cidr)
+
+
+def test_writes_match_single_tree(pair) -> None:
+    sharded, reference = pair
+    rng = random.Random(5)
+    ips = [node.ip_address for node in reference.inorder_traversal()]
+    for step in range(150):
+        ip_address = rng.choice(ips)
+        other = f"{rng.choice((10, 172, 192))}.{rng.randrange(256)}.9.{rng.randrange(256)}"
+        action = step % 4
+        if action == 0:
+            arguments = (other, f"PKT-n{step}", f"dev-{step}")
+            assert sharded.insert(*arguments) == reference.insert(*arguments)
+        elif action == 1:
+            assert sharded.delete(ip_address) == reference.delete(ip_address)
+        elif action == 2:
+            # IP baru hampir selalu di shard lain
+            if reference.search(other) is None:
+                assert sharded.update(ip_address, other, None, f"moved-{step}") == reference.update(
+                    ip_address, other, None, f"moved-{step}"
+                )
+        else:
+            arguments = (ip_address, None, f"PKT-u{step}")
+            assert sharded.update(*arguments) == reference.update(*arguments)
+    assert sharded.update("bukan-ip", "10.0.0.1") == (False, None, None)
+    assert sharded.update("10.255.255.255", "2001:db8::99") == reference.update("10.255.255.255", "2001:db8::99")
+    assert sharded.delete("bukan-ip") is False
+    assert _state(sharded.inorder_traversal()) == _state(reference.inorder_traversal())
+
+
+def test_execute_batches_in_input_order(pair) -> None:
+    sharded, reference = pair
+    operations = [
+        ("insert", "10.200.0.1", ("PKT-a",)),
+        ("search", "10.200.0.1", ()),
+        ("insert", "2001:db8::77", ("PKT-b", "v6")),
+        ("delete", "10.200.0.1", ()),
+        ("search", "10.200.0.1", ()),
+        ("search", "2001:db8::77", ()),
+    ]
+    results = sharded.execute(operations)
+    assert results[0] is True and results[2] is True and results[3] is True
+    assert results[1].data_packet == "PKT-a"
+    assert results[4] is None
+    assert (results[5].data_packet, results[5].name) == ("PKT-b", "v6")
+    with pytest.raises(ValueError):
+        sharded.execute([("update", "10.0.0.1", ())])
+    # IP tidak valid diperlakukan sama seperti search/delete/insert tunggal
+    results = sharded.execute([("search", "10.0.0.300", ()), ("delete", "x", ()), ("insert", "10.201.0.1", ())])
+    assert results == [None, False, True]
+    assert sharded.search("10.0.0.300") is None and sharded.delete("x") is False
+    with pytest.raises(IPParseError):
+        sharded.execute([("insert", "10.0.0.300", ()), ("insert", "10.201.0.2", ())])
+    # Operasi lain di batch tetap dijalankan sebelum error di-raise
+    assert sharded.search("10.201.0.2") is not None
+
+
+def test_worker_errors_reach_caller(pair) -> None:
+    sharded, reference = pair
+    # Error di proses shard dikirim balik utuh; shard tetap melayani
+    with pytest.raises(IPParseError) as caught:
+        sharded._call(0, "insert", "10.0.0.300")
+    assert caught.value.text == "10.0.0.300"
+    with pytest.raises(IPParseError):
+        sharded.insert("10.0.0.300")
+    assert sharded.size == reference.size
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+
+import pytest
+
+from src.datastructures.bounded_splay_tree import BoundedSplayTree
+from src.datastructures.splay_tree import SplayTree
+from src.datastructures.top_down_splay_tree import TopDownSplayTree
+from src.persistence.snapshot import (
+    SNAPSHOT_MAGIC,
+    SNAPSHOT_VERSION,
+    SnapshotError,
+    SnapshotReader,
+    _all_have,
+    save_snapshot,
+    tree_rows,
+)
+
+ROWS = [
+    ("10.0.0.1", "PKT-1", "Router"),
+    ("10.0.0.2", None, "Tanpa packet"),
+    ("10.0.1.7", "PKT-7", None),
+    ("192.168.1.1", "", ""),
+    ("2001:db8::1", "PKT-v6", "Ünïcode ✓"),
+    ("::1", None, None),
+]
+
+
+def _state(rows) -> list:
+    return [(row.ip_address, row.data_packet, row.name) for row in rows]
+
+
+@pytest.mark.parametrize("engine", (SplayTree, TopDownSplayTree, BoundedSplayTree), ids=lambda engine: engine.__name__)
+def test_round_trip_keeps_every_field(tmp_path: Path, engine) -> None:
+    path = str(tmp_path / "devices.ipsnap")
+    tree = engine()
+    for ip_address, packet, name in ROWS:
+        tree.insert(ip_address, packet, name)
+    assert save_snapshot(path, tree_rows(tree)) == len(ROWS)
+
+    with SnapshotReader(path) as snapshot:
+        assert len(snapshot) == len(ROWS)
+        assert _state(snapshot.records()) == _state(tree.iter_inorder())
+        loaded = engine()
+        snapshot.load_into(loaded)
+    assert _state(loaded.iter_inorder()) == _state(tree.iter_inorder())
+    assert [node.updated_at for node in loaded.iter_inorder()] == [node.updated_at for node in tree.iter_inorder()]
+    assert loaded.search("10.0.0.2").data_packet is None
+    assert loaded.search("192.168.1.1").name == ""
+
+
+def test_named_devices_load_through_fast_path(tmp_path: Path) -> None:
+    # Kasus GUI: setiap device punya nama dan packet (flag 3)
+    assert _all_have(b"\x03\x03\x01", 1)
+    assert not _all_have(b"\x03\x03\x01", 2)
+    assert not _all_have(b"\x02", 1)
+    assert _all_have(b"", 2)
+
+    path = str(tmp_path / "devices.ipsnap")
+    items = [(f"10.0.0.{index}", f"PKT-{index}", f"Device-{index}") for index in range(50)]
+    tree = SplayTree()
+    for ip_address, packet, name in items:
+        tree.insert(ip_address, packet, name)
+    save_snapshot(path, tree_rows(tree))
+    with SnapshotReader(path) as snapshot:
+        loaded = SplayTree()
+        snapshot.load_into(loaded)
+    assert sorted(_state(loaded.iter_inorder())) == sorted(items)
+
+
+def test_reader_serves_queries_before_load(tmp_path: Path) -> None:
+    path = str(tmp_path / "devices.ipsnap")
+    tree = SplayTree.from_iterable((f"10.0.{index // 256}.{index % 256}", f"PKT-{index}") for index in range(600))
+    save_snapshot(path, tree_rows(tree))
+
+    with SnapshotReader(path) as snapshot:
+        assert snapshot.search("10.0.1.44").data_packet == "PKT-300"
+        assert snapshot.search("10.0.9.9") is None
+        assert snapshot.search("bukan-ip") is None
+        assert [record.ip_address for record in snapshot.range("10.0.0.254", "10.0.1.1")] == [
+            "10.0.0.254",
+            "10.0.0.255",
+            "10.0.1.0",
+            "10.0.1.1",
+        ]
+        assert snapshot.count_subnet("10.0.1.0/24") == 256
+        assert snapshot.count_range("10.0.2.0", "10.0.9.0") == 88
+        assert snapshot.count_range("10.0.1.0", "10.0.0.0") == 0
+        assert len(list(snapshot.in_subnet("10.0.2.0/29"))) == 8
+        assert snapshot.search_count == 3
+        loaded = SplayTree()
+        snapshot.load_into(loaded)
+    # Pencarian sebelum tree dibangun ikut terhitung
+    assert loaded.search_count == 3
+    assert loaded.size == 600
+
+
+def test_empty_snapshot(tmp_path: Path) -> None:
+    path = str(tmp_path / "empty.ipsnap")
+    assert save_snapshot(path, []) == 0
+    with SnapshotReader(path) as snapshot:
+        assert len(snapshot) == 0
+        assert snapshot.search("10.0.0.1") is None
+        loaded = SplayTree()
+        snapshot.load_into(loaded)
+    assert loaded.size == 0
+
+
+def test_rejects_bad_files_and_non_empty_tree(tmp_path: Path) -> None:
+    path = tmp_path / "devices.ipsnap"
+    save_snapshot(str(path), tree_rows(SplayTree.from_iterable([("10.0.0.1", "PKT")])))
+    with SnapshotReader(str(path)) as snapshot:
+        with pytest.raises(SnapshotError):
+            snapshot.load_into(SplayTree.from_iterable([("10.0.0.9", "PKT")]))
+
+    data = path.read_bytes()
+    truncated = tmp_path / "truncated.ipsnap"
+    truncated.write_bytes(data[:-1])
+    foreign = tmp_path / "foreign.ipsnap"
+    foreign.write_bytes(b"NOTSNAP!" + data[8:])
+    for bad in (truncated, foreign):
+        with pytest.raises(SnapshotError):
+            SnapshotReader(str(bad))
+
+
+def test_rejects_other_versions(tmp_path: Path) -> None:
+    path = tmp_path / "devices.ipsnap"
+    save_snapshot(str(path), tree_rows(SplayTree.from_iterable([("10.0.0.1", "PKT")])))
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<H", data, len(SNAPSHOT_MAGIC), SNAPSHOT_VERSION - 1)
+    path.write_bytes(bytes(data))
+    with pytest.raises(SnapshotError, match="Versi snapshot"):
+        SnapshotReader(str(path))
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import gc
+import os
+from pathlib import Path
+
+import pytest
+
+from src.datastructures.keys import ip_to_key
+from src.datastructures.splay_tree import SplayTree
+from src.persistence.wal import DurableStore, read_log
+from src.pipeline.transfer import BulkLoader, import_devices
+
+import ip_address_finder
+
+
+def _rows(tree: SplayTree) -> list:
+    return [(node.ip_address, node.data_packet, node.name, node.updated_at) for node in tree.iter_inorder()]
+
+
+def _keys(*addresses: str):
+    return [ip_to_key(address) for address in addresses]
+
+
+def test_bulk_loader_merges_chunks_last_row_wins() -> None:
+    tree = SplayTree()
+    loader = BulkLoader(tree)
+    loader.add(_keys("10.0.0.3", "10.0.0.1", "10.0.0.3"), ["a", "b", "c"], [None, "one", None])
+    loader.add(_keys("10.0.0.2"), ["d"], [None])
+    loader.add(_keys("10.0.0.1", "10.0.0.4"), ["e", "f"], ["uno", None])
+    assert len(loader) == 6
+    assert loader.finish() == (4, 0)
+    rows = [(node.ip_address, node.data_packet, node.name) for node in tree.iter_inorder()]
+    assert rows == [
+        ("10.0.0.1", "e", "uno"),
+        ("10.0.0.2", "d", None),
+        ("10.0.0.3", "c", None),
+        ("10.0.0.4", "f", None),
+    ]
+
+
+@pytest.mark.parametrize("existing", (0, 3, 200, 3000))
+def test_import_into_existing_tree(tmp_path: Path, existing: int) -> None:
+    path = tmp_path / "devices.csv"
+    lines = ["name,ip,packet"]
+    lines += [f"dev-{index},10.0.{index % 3}.{index % 250},PKT-{index}" for index in range(1000)]
+    lines += ["rusak,999.0.0.1,x"]
+    path.write_text("\n".join(lines) + "\n")
+    # Sebagian device lama (10.0.0.x) juga ada di file
+    old = [f"10.{1 + index // 256}.0.{index % 256}" for index in range(existing)] + ["10.0.0.0", "10.0.0.1"]
+    tree = SplayTree.from_iterable((ip_address, "old") for ip_address in old)
+    reference = dict.fromkeys(old, "old")
+    for index in range(1000):
+        reference[f"10.0.{index % 3}.{index % 250}"] = f"PKT-{index}"
+    unique = 3 * 250
+
+    report = import_devices(str(path), tree, chunk_size=97)
+    assert (report.rows, report.rejected) == (1001, 1)
+    assert (report.added, report.updated, report.duplicates) == (unique - 2, 2, 1000 - unique)
+    assert {node.ip_address: node.data_packet for node in tree.iter_inorder()} == reference
+
+
+@pytest.mark.parametrize("existing", (0, 5, 5000))
+def test_import_is_durable(tmp_path: Path, existing: int) -> None:
+    path = tmp_path / "devices.csv"
+    rows = "".join(f"dev-{index},10.0.{index // 256}.{index % 256},PKT-{index}\n" for index in range(600))
+    path.write_text("name,ip,packet\n" + rows)
+    snapshot_path = str(tmp_path / "devices.ipsnap")
+
+    # Tanpa store: setiap device dicatat lewat journal tree, apapun jalur finish()-nya
+    store = DurableStore(snapshot_path)
+    tree = SplayTree()
+    store.recover(tree)
+    for index in range(existing):
+        tree.insert(f"10.9.{index // 256}.{index % 256}", "old")
+    import_devices(str(path), tree)
+    store.close()
+    recovered = SplayTree()
+    DurableStore(snapshot_path).recover(recovered)
+    assert _rows(recovered) == _rows(tree)
+
+    # Dengan store: import langsung di-compact ke snapshot, log kosong
+    store = DurableStore(snapshot_path)
+    tree = SplayTree()
+    store.recover(tree)
+    path.write_text("name,ip,packet\ndev,10.8.0.1,PKT-new\n")
+    import_devices(str(path), tree, store=store)
+    assert list(read_log(store.wal_path)) == []
+    store.close()
+    recovered = SplayTree()
+    DurableStore(snapshot_path).recover(recovered)
+    assert recovered.search("10.8.0.1").data_packet == "PKT-new"
+    assert recovered.size == existing + 601
+
+
+def test_jsonl_rejects_lines_that_only_parse_together(tmp_path: Path) -> None:
+    # Digabung jadi satu array, tiga baris ini memberi tepat tiga object
+    path = tmp_path / "devices.jsonl"
+    path.write_text(
+        '{"ip": "10.0.0.1", "x": [{}\n'
+        "{}]}\n"
+        '{"ip": "10.0.0.2"}, {"ip": "10.0.0.3"}\n'
+        '{"ip": "10.0.0.4"}\n'
+    )
+    tree = SplayTree()
+    report = import_devices(str(path), tree)
+    assert [line for line, _ in report.errors] == [1, 2, 3]
+    assert [node.ip_address for node in tree.iter_inorder()] == ["10.0.0.4"]
+
+
+def test_cancelled_import_leaves_tree_untouched(tmp_path: Path) -> None:
+    path = tmp_path / "devices.jsonl"
+    path.write_text("".join(f'{{"ip": "10.0.0.{index}"}}\n' for index in range(100)))
+    tree = SplayTree.from_iterable([("10.9.9.9", "keep")])
+
+    def cancel(position: int) -> None:
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        import_devices(str(path), tree, chunk_size=10, on_progress=cancel)
+    assert [node.ip_address for node in tree.iter_inorder()] == ["10.9.9.9"]
+
+
+def test_gc_stays_enabled_while_streaming(tmp_path: Path) -> None:
+    path = tmp_path / "devices.jsonl"
+    path.write_text("".join(f'{{"ip": "10.0.0.{index}"}}\n' for index in range(100)))
+    seen = []
+    import_devices(str(path), SplayTree(), chunk_size=10, on_progress=lambda position: seen.append(gc.isenabled()))
+    assert seen and all(seen)
+    assert gc.isenabled()
+
+
+@pytest.mark.parametrize("with_log", [False, True])
+def test_export_leaves_snapshot_files_untouched(tmp_path: Path, with_log: bool) -> None:
+    snapshot_path = str(tmp_path / "devices.ipsnap")
+    store = DurableStore(snapshot_path)
+    tree = SplayTree()
+    store.recover(tree)
+    tree.insert("10.0.0.1", "PKT-1")
+    store.compact(tree)
+    if with_log:
+        tree.insert("10.0.0.2", "PKT-2")
+        store.commit()
+    store.close()
+    if not with_log:
+        os.remove(store.wal_path)
+    before = sorted(os.listdir(tmp_path))
+
+    export_path = str(tmp_path / "devices.csv")
+    ip_address_finder.main(["--snapshot", snapshot_path, "--export", export_path])
+    assert sorted(os.listdir(tmp_path)) == sorted(before + ["devices.csv"])
+    lines = Path(export_path).read_text().splitlines()
+    assert len(lines) == (3 if with_log else 2)
+
+
+def test_import_requires_snapshot(capsys: pytest.CaptureFixture) -> None:
+    with pytest.raises(SystemExit):
+        ip_address_finder.parse_args(["--import", "devices.csv"])
+    assert "--snapshot" in capsys.readouterr().err
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import random
+import sys
+from typing import Dict, List
+
+import pytest
+
+from src.datastructures.array_splay_tree import ArraySplayTree
+from src.datastructures.bounded_splay_tree import BoundedSplayTree
+from src.datastructures.bulk import NIL
+from src.datastructures.keys import ip_to_key
+from src.datastructures.splay_tree import SplayTree
+from src.datastructures.top_down_splay_tree import TopDownSplayTree
+
+ENGINES = (SplayTree, TopDownSplayTree, BoundedSplayTree, ArraySplayTree)
+
+
+@pytest.fixture(params=ENGINES, ids=lambda engine: engine.__name__)
+def tree(request: pytest.FixtureRequest) -> SplayTree:
+    return request.param()
+
+
+def _array_keys(tree: ArraySplayTree) -> List[int]:
+    # Link parent harus cocok dengan link anak di array paralel
+    left, right, parent = tree._left, tree._right, tree._parent
+    if tree.root != NIL:
+        assert parent[tree.root] == NIL
+    keys: List[int] = []
+    stack: List[int] = []
+    current = tree.root
+    while stack or current != NIL:
+        while current != NIL:
+            for child in (left[current], right[current]):
+                if child != NIL:
+                    assert parent[child] == current
+            stack.append(current)
+            current = left[current]
+        current = stack.pop()
+        keys.append(tree._key(current))
+        current = right[current]
+    return keys
+
+
+def check_structure(tree: SplayTree) -> List[int]:
+    """
+    Cek urutan BST, ukuran subtree dan pointer parent, lalu kembalikan key
+    in-order. Ukuran dicek lokal per node; bersama size root, itu cukup
+    untuk seluruh tree.
+    """
+    if isinstance(tree, ArraySplayTree):
+        keys = _array_keys(tree)
+    else:
+        tracks_parent = tree.tracks_parent
+        if tracks_parent and tree.root is not None:
+            assert tree.root.parent is None
+        keys = []
+        stack = []
+        current = tree.root
+        while stack or current is not None:
+            while current is not None:
+                left_size = current.left.size if current.left is not None else 0
+                right_size = current.right.size if current.right is not None else 0
+                assert current.size == 1 + left_size + right_size
+                if tracks_parent:
+                    for child in (current.left, current.right):
+                        if child is not None:
+                            assert child.parent is current
+                stack.append(current)
+                current = current.left
+            current = stack.pop()
+            keys.append(current.key)
+            current = current.right
+        if tree.root is not None:
+            assert tree.root.size == tree.size
+    assert keys == sorted(set(keys))
+    assert len(keys) == tree.size
+    return keys
+
+
+def test_insert_new_and_existing_ip(tree: SplayTree) -> None:
+    assert tree.insert("10.0.0.1", "PKT-1") is True
+    assert tree.insert("10.0.0.1", "PKT-2") is False
+    assert tree.size == 1
+    assert tree.search("10.0.0.1").data_packet == "PKT-2"
+
+
+def test_search_missing_and_invalid_ip(tree: SplayTree) -> None:
+    tree.insert("10.0.0.1", "PKT-1")
+    assert tree.search("10.0.0.2") is None
+    assert tree.search("999.1.1.1") is None
+    assert tree.search("bukan-ip") is None
+
+
+def test_delete(tree: SplayTree) -> None:
+    for index in range(10):
+        tree.insert(f"10.0.0.{index}", f"PKT-{index}")
+    assert tree.delete("10.0.0.4") is True
+    assert tree.delete("10.0.0.4") is False
+    assert tree.delete("bukan-ip") is False
+    assert tree.size == 9
+    assert tree.search("10.0.0.4") is None
+    assert [tree.search(f"10.0.0.{index}") is not None for index in range(10)].count(True) == 9
+    check_structure(tree)
+
+
+def test_update_packet_keeps_ip(tree: SplayTree) -> None:
+    tree.insert("10.0.0.1", "PKT-1")
+    assert tree.update("10.0.0.1", None, "PKT-2") == (True, None, "PKT-1")
+    assert tree.search("10.0.0.1").data_packet == "PKT-2"
+
+
+def test_update_moves_device_to_new_ip(tree: SplayTree) -> None:
+    tree.insert("10.0.0.1", "PKT-1")
+    tree.insert("10.0.0.5", "PKT-5")
+    assert tree.update("10.0.0.1", "10.0.0.9") == (True, "10.0.0.1", "PKT-1")
+    assert tree.search("10.0.0.1") is None
+    assert tree.search("10.0.0.9").data_packet == "PKT-1"
+    assert tree.size == 2
+    check_structure(tree)
+
+
+def test_update_missing_ip(tree: SplayTree) -> None:
+    assert tree.update("10.0.0.1", "10.0.0.2", "PKT") == (False, None, None)
+
+
+def test_inorder_follows_numeric_key_order(tree: SplayTree) -> None:
+    addresses = ["10.0.0.10", "2001:db8::1", "10.0.0.9", "::1", "9.255.255.255"]
+    for address in addresses:
+        tree.insert(address, None)
+    expected = sorted(addresses, key=ip_to_key)
+    assert [node.ip_address for node in tree.inorder_traversal()] == expected
+    assert check_structure(tree) == sorted(map(ip_to_key, addresses))
+
+
+def test_rotations_keep_sizes_and_parents(tree: SplayTree) -> None:
+    # Insert menaik membuat tree miring; search ke ujung memicu zig-zig panjang
+    for index in range(200):
+        tree.insert(f"10.0.{index // 256}.{index % 256}", None)
+    check_structure(tree)
+    for index in (0, 199, 1, 100, 57, 0):
+        assert tree.search(f"10.0.0.{index}") is not None
+        check_structure(tree)
+
+
+def _left_spine(tree: SplayTree) -> int:
+    # Panjang rantai anak kiri dari root, tanpa rekursi
+    length = 0
+    if isinstance(tree, ArraySplayTree):
+        current = tree.root
+        while current != NIL:
+            length += 1
+            current = tree._left[current]
+        return length
+    current = tree.root
+    while current is not None:
+        length += 1
+        current = current.left
+    return length
+
+
+def test_chain_deeper_than_recursion_limit(tree: SplayTree) -> None:
+    # Insert menaik membuat rantai kiri sepanjang jumlah device
+    count = sys.getrecursionlimit() + 500
+    for index in range(count):
+        tree.insert(f"10.0.{index // 256}.{index % 256}", None)
+    assert _left_spine(tree) == count
+
+    expected = [f"10.0.{index // 256}.{index % 256}" for index in range(count)]
+    assert [node.ip_address for node in tree.iter_inorder()] == expected
+    assert [node.ip_address for node in tree.inorder_traversal()] == expected
+    assert len(tree.get_tree_structure().splitlines()) >= count
+
+
+def test_random_operations_match_reference(tree: SplayTree) -> None:
+    rng = random.Random(7)
+    reference: Dict[str, str] = {}
+    for step in range(3000):
+        ip_address = f"10.0.{rng.randrange(2)}.{rng.randrange(150)}"
+        action = rng.random()
+        if action < 0.4:
+            assert tree.insert(ip_address, f"PKT-{step}") == (ip_address not in reference)
+            reference[ip_address] = f"PKT-{step}"
+        elif action < 0.6:
+            assert tree.delete(ip_address) == (ip_address in reference)
+            reference.pop(ip_address, None)
+        elif action < 0.7:
+            target = f"10.0.2.{rng.randrange(150)}"
+            success, _, _ = tree.update(ip_address, target)
+            assert success == (ip_address in reference)
+            if success and target != ip_address:
+                reference[target] = reference.pop(ip_address)
+        else:
+            node = tree.search(ip_address)
+            assert (node.data_packet if node is not None else None) == reference.get(ip_address)
+        if step % 100 == 0:
+            check_structure(tree)
+    assert check_structure(tree) == sorted(map(ip_to_key, reference))
+
+
+def test_from_iterable_keeps_last_duplicate(tree: SplayTree) -> None:
+    items = [("10.0.0.3", "A"), ("10.0.0.1", "B"), ("10.0.0.3", "C"), ("10.0.0.2", None)]
+    built = type(tree).from_iterable(items)
+    assert built.size == 3
+    assert built.search("10.0.0.3").data_packet == "C"
+    check_structure(built)
+
+
+def test_tree_structure_lists_every_node(tree: SplayTree) -> None:
+    assert tree.get_tree_structure() == "Tree is empty\n"
+    for index in range(20):
+        tree.insert(f"10.0.0.{index}", f"PKT-{index}")
+    lines = tree.get_tree_structure().splitlines()
+    assert len(lines) == 20
+    assert all("(Packet: PKT-" in line for line in lines)
+
+
+def test_search_many_and_range_match_splay_tree(tree: SplayTree) -> None:
+    rng = random.Random(3)
+    items = [(f"10.0.{rng.randrange(4)}.{rng.randrange(256)}", f"PKT-{index}") for index in range(300)]
+    built = type(tree).from_iterable(items)
+    reference = SplayTree.from_iterable(items)
+    probes = [f"10.0.{rng.randrange(4)}.{rng.randrange(256)}" for _ in range(40)] + ["bukan-ip"]
+    found = [node and node.data_packet for node in built.search_many(probes)]
+    assert found == [node and node.data_packet for node in reference.search_many(probes)]
+    check_structure(built)
+
+    def addresses(nodes) -> List[str]:
+        return [node.ip_address for node in nodes]
+
+    assert addresses(built.range("10.0.1.5", "10.0.2.9")) == addresses(reference.range("10.0.1.5", "10.0.2.9"))
+    assert addresses(built.in_subnet("10.0.3.0/25")) == addresses(reference.in_subnet("10.0.3.0/25"))
+
+
+@pytest.mark.parametrize("engine", ENGINES[:3], ids=lambda engine: engine.__name__)
+def test_peek_does_not_splay_or_count(engine) -> None:
+    tree = engine.from_iterable((f"10.0.0.{index}", f"PKT-{index}") for index in range(50))
+    root = tree.root
+    assert tree.peek("10.0.0.3").data_packet == "PKT-3"
+    assert tree.peek_key(ip_to_key("10.0.0.4")).data_packet == "PKT-4"
+    assert tree.contains("10.0.0.49")
+    assert not tree.contains("10.0.0.50")
+    assert tree.peek("bukan-ip") is None
+    assert tree.root is root
+    assert tree.search_count == 0
+
+
+@pytest.mark.parametrize("engine", ENGINES[:3], ids=lambda engine: engine.__name__)
+def test_rank_select_page_follow_ip_order(engine) -> None:
+    rng = random.Random(10)
+    tree = engine()
+    for _ in range(400):
+        tree.insert(f"10.{rng.randrange(3)}.{rng.randrange(256)}.{rng.randrange(256)}", "PKT")
+    for _ in range(100):
+        tree.delete(f"10.{rng.randrange(3)}.{rng.randrange(256)}.{rng.randrange(256)}")
+        tree.search(f"10.{rng.randrange(3)}.{rng.randrange(256)}.{rng.randrange(256)}")
+    ordered = [node.ip_address for node in tree.inorder_traversal()]
+    check_structure(tree)
+
+    for index in (0, 1, len(ordered) // 2, len(ordered) - 1):
+        assert tree.select(index).ip_address == ordered[index]
+        assert tree.rank(ordered[index]) == index
+        check_structure(tree)
+    assert tree.select(-1).ip_address == ordered[-1]
+    # IP yang tidak ada: jumlah device yang lebih kecil
+    assert tree.rank("9.255.255.255") == 0
+    assert tree.rank("11.0.0.0") == len(ordered)
+    with pytest.raises(IndexError):
+        tree.select(len(ordered))
+
+    root = tree.root
+    assert [node.ip_address for node in tree.page(20, 15, splay=False)] == ordered[20:35]
+    assert tree.root is root
+    assert [node.ip_address for node in tree.page(len(ordered) - 3, 10)] == ordered[-3:]
+    assert tree.page(len(ordered), 10) == []
+    assert tree.page(0, 0) == []
+    check_structure(tree)
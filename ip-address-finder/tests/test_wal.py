@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from src.datastructures.records import DeviceRecord
+from src.datastructures.splay_tree import SplayTree
+from src.datastructures.top_down_splay_tree import TopDownSplayTree
+from src.persistence.wal import WAL_MAGIC, DurableStore, WalError, WriteAheadLog, log_end, read_log
+
+
+def _state(tree: SplayTree) -> list:
+    return [(node.ip_address, node.data_packet, node.name) for node in tree.iter_inorder()]
+
+
+@pytest.mark.parametrize("engine", (SplayTree, TopDownSplayTree), ids=lambda engine: engine.__name__)
+def test_recover_replays_snapshot_and_log(tmp_path: Path, engine) -> None:
+    path = str(tmp_path / "devices.ipsnap")
+    store = DurableStore(path, compact_bytes=400)
+    tree = engine()
+    store.recover(tree)
+    for index in range(40):
+        tree.insert(f"10.0.0.{index}", f"PKT-{index}", f"dev-{index}")
+        store.commit(tree)
+    tree.insert("2001:db8::1", "PKT-v6")
+    tree.delete("10.0.0.3")
+    tree.update("10.0.0.4", "10.0.1.4", "PKT-moved")
+    store.commit()
+    store.close()
+    assert os.path.exists(path)
+
+    recovered = engine()
+    DurableStore(path).recover(recovered)
+    assert _state(recovered) == _state(tree)
+    assert recovered.search_count == 0
+
+
+def test_torn_tail_is_dropped_and_truncated(tmp_path: Path) -> None:
+    path = str(tmp_path / "devices.ipsnap")
+    store = DurableStore(path)
+    tree = SplayTree()
+    store.recover(tree)
+    tree.insert("10.0.0.1", "PKT-1")
+    tree.insert("10.0.0.2", "PKT-2")
+    store.close()
+    valid_end = os.path.getsize(store.wal_path)
+    with open(store.wal_path, "ab") as handle:
+        # Crash di tengah menulis frame: header lengkap, payload terpotong
+        handle.write(b"\x20\x00\x00\x00\x00\x00\x00\x00\x03\x01")
+
+    assert log_end(store.wal_path) == valid_end
+    assert [key for _, key, _ in read_log(store.wal_path)] == [node.key for node in tree.iter_inorder()]
+    recovered = SplayTree()
+    reopened = DurableStore(path)
+    assert reopened.recover(recovered) == 2
+    assert os.path.getsize(store.wal_path) == valid_end
+    # Record baru ditulis tepat setelah frame valid terakhir, bukan setelah sampah
+    recovered.insert("10.0.0.3", "PKT-3")
+    reopened.close()
+    assert [node.ip_address for node in _recover(path)] == ["10.0.0.1", "10.0.0.2", "10.0.0.3"]
+
+
+def _recover(path: str) -> list:
+    tree = SplayTree()
+    DurableStore(path).recover(tree)
+    return tree.inorder_traversal()
+
+
+def test_corrupt_frame_stops_replay(tmp_path: Path) -> None:
+    path = str(tmp_path / "log.wal")
+    wal = WriteAheadLog(path)
+    for index in range(3):
+        wal.log_insert(index, DeviceRecord(None, f"PKT-{index}"))
+    wal.close()
+    data = bytearray(Path(path).read_bytes())
+    data[-1] ^= 0xFF
+    Path(path).write_bytes(bytes(data))
+    assert [key for _, key, _ in read_log(path)] == [0, 1]
+
+
+def test_rejects_foreign_file(tmp_path: Path) -> None:
+    path = tmp_path / "other.wal"
+    path.write_bytes(b"bukan log")
+    with pytest.raises(WalError):
+        list(read_log(str(path)))
+    with pytest.raises(WalError):
+        log_end(str(path))
+
+
+def test_group_commit_waits_for_commit(tmp_path: Path) -> None:
+    path = str(tmp_path / "log.wal")
+    wal = WriteAheadLog(path, group_size=3, group_delay=3600)
+    wal.log_delete(1)
+    wal.log_delete(2)
+    assert wal.pending == 2
+    assert os.path.getsize(path) == len(WAL_MAGIC)
+    wal.log_delete(3)
+    assert wal.pending == 0
+    wal.log_delete(4)
+    wal.commit()
+    assert [key for _, key, _ in read_log(path)] == [1, 2, 3, 4]
+    wal.close()
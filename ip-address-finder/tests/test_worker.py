@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, List
+
+from src.datastructures.splay_tree import SplayTree
+from src.gui.worker import JobContext, TreeWorker
+
+
+class _Root:
+    # Pengganti tk.Tk: poll tidak dijalankan, callback diambil langsung dari antrian
+
+    def after(self, delay: int, callback: Callable[[], None]) -> str:
+        return "poll"
+
+    def after_cancel(self, job: str) -> None:
+        pass
+
+
+def _deliver_all(worker: TreeWorker) -> None:
+    while not worker._results.empty():
+        worker._results.get_nowait()()
+
+
+def test_jobs_run_in_order_on_worker_thread() -> None:
+    worker = TreeWorker(_Root(), SplayTree(), 10)
+    results: List[Any] = []
+    threads: List[str] = []
+
+    def insert(tree: SplayTree, context: JobContext) -> bool:
+        threads.append(threading.current_thread().name)
+        return tree.insert("10.0.0.1", "PKT")
+
+    worker.submit(insert, results.append)
+    worker.submit(lambda tree, context: tree.search("10.0.0.1").data_packet, results.append)
+    worker.submit(lambda tree, context: 1 // 0, on_error=lambda exc: results.append(type(exc)))
+    worker.shutdown()
+    _deliver_all(worker)
+    assert results == [True, "PKT", ZeroDivisionError]
+    assert threads == ["tree-worker"]
+
+
+def test_shutdown_waits_for_long_job_before_final() -> None:
+    worker = TreeWorker(_Root(), SplayTree(), 10)
+    started = threading.Event()
+    release = threading.Event()
+    order: List[str] = []
+
+    def long_job(tree: SplayTree, context: JobContext) -> None:
+        started.set()
+        # Masih berjalan saat shutdown() dipanggil, seperti finish() import
+        release.wait(5)
+        order.append("job")
+
+    worker.submit(long_job)
+    started.wait(5)
+    threading.Timer(0.2, release.set).start()
+    worker.shutdown(lambda tree: order.append(f"final:{threading.current_thread().name}"))
+    assert order == ["job", "final:tree-worker"]
+    assert not worker._thread.is_alive()